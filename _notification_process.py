@@ -5,24 +5,40 @@ Doğrudan çalıştırılmak için tasarlanmıştır.
 """
 
 from PyQt6.QtWidgets import QApplication, QWidget, QLabel, QHBoxLayout, QFrame
-from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, QRect
+from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, QRect, QObject, pyqtSignal
 from PyQt6.QtGui import QFont
 import sys
+import threading
+
+from notification import decode_message
 
 
 class NotificationWidget(QWidget):
     """Bildirim penceresi widget'ı."""
     
-    def __init__(self, message: str, duration: float, dark_mode: bool, title: str = "Screenshot Taken"):
+    finished = pyqtSignal()
+    
+    def __init__(self, message: str, duration: float, dark_mode: bool, title: str = "Screenshot Taken",
+                 persistent: bool = False):
         super().__init__()
         self.message = message
         self.duration = duration
         self.dark_mode = dark_mode
         self.title_text = title
+        # persistent=True: kapanınca uygulamadan çıkma, gizlen ve tekrar kullanılmayı bekle
+        self.persistent = persistent
+        self._state = "idle"  # idle / showing / holding / hiding
+        self._stack_count = 1
+        self.anim_out = None
+        
+        self._hold_timer = QTimer(self)
+        self._hold_timer.setSingleShot(True)
+        self._hold_timer.timeout.connect(self._start_hide_animation)
         
         self._setup_window()
         self._create_widgets()
-        self._start_animation()
+        if not persistent:
+            self._start_animation()
     
     def _setup_window(self):
         """Pencere ayarları."""
@@ -47,37 +63,19 @@ class NotificationWidget(QWidget):
     
     def _create_widgets(self):
         """Widget'ları oluştur."""
-        # Tema renkleri
-        if self.dark_mode:
-            bg_color = "#1e1e1e"
-            fg_color = "#ffffff"
-            accent_color = "#0078d4"
-        else:
-            bg_color = "#ffffff"
-            fg_color = "#1e1e1e"
-            accent_color = "#0078d4"
-        
         # Ana container
-        container = QFrame(self)
-        container.setGeometry(0, 0, self.width_size, self.height_size)
-        container.setStyleSheet(f"""
-            QFrame {{
-                background-color: {bg_color};
-                border: 2px solid {accent_color};
-                border-radius: 10px;
-            }}
-        """)
+        self.container = QFrame(self)
+        self.container.setGeometry(0, 0, self.width_size, self.height_size)
         
         # Layout
-        layout = QHBoxLayout(container)
+        layout = QHBoxLayout(self.container)
         layout.setContentsMargins(15, 12, 15, 12)
         layout.setSpacing(15)
         
         # Kamera ikonu
-        icon_label = QLabel("📸")
-        icon_label.setFont(QFont("Segoe UI Emoji", 24))
-        icon_label.setStyleSheet(f"color: {fg_color}; background: transparent; border: none;")
-        layout.addWidget(icon_label)
+        self.icon_label = QLabel("📸")
+        self.icon_label.setFont(QFont("Segoe UI Emoji", 24))
+        layout.addWidget(self.icon_label)
         
         # Metin container
         text_widget = QWidget()
@@ -95,30 +93,91 @@ class NotificationWidget(QWidget):
         text_inner_layout.setSpacing(2)
         
         # Başlık
-        title_label = QLabel(self.title_text)
-        title_label.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
-        title_label.setStyleSheet(f"color: {fg_color}; background: transparent; border: none;")
-        text_inner_layout.addWidget(title_label)
+        self.title_label = QLabel()
+        self.title_label.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
+        text_inner_layout.addWidget(self.title_label)
         
         # Dosya adı
+        self.msg_label = QLabel()
+        self.msg_label.setFont(QFont("Segoe UI", 9))
+        self.msg_label.setStyleSheet("color: #888888; background: transparent; border: none;")
+        text_inner_layout.addWidget(self.msg_label)
+        
+        text_layout.addWidget(text_inner)
+        layout.addWidget(text_widget, 1)
+        
+        self._apply_theme()
+        self._update_texts()
+    
+    def _apply_theme(self):
+        """Tema renklerini uygula."""
+        if self.dark_mode:
+            bg_color = "#1e1e1e"
+            fg_color = "#ffffff"
+            accent_color = "#0078d4"
+        else:
+            bg_color = "#ffffff"
+            fg_color = "#1e1e1e"
+            accent_color = "#0078d4"
+        
+        self.container.setStyleSheet(f"""
+            QFrame {{
+                background-color: {bg_color};
+                border: 2px solid {accent_color};
+                border-radius: 10px;
+            }}
+        """)
+        self.icon_label.setStyleSheet(f"color: {fg_color}; background: transparent; border: none;")
+        self.title_label.setStyleSheet(f"color: {fg_color}; background: transparent; border: none;")
+    
+    def _update_texts(self):
+        """Başlık ve mesaj etiketlerini güncelle."""
+        title = self.title_text
+        if self._stack_count > 1:
+            title = f"{title} (×{self._stack_count})"
+        self.title_label.setText(title)
+        
         display_message = self.message
         if len(display_message) > 35:
             display_message = display_message[:32] + "..."
+        self.msg_label.setText(display_message)
+    
+    def show_message(self, message: str, duration: float, dark_mode: bool, title: str):
+        """
+        Aynı widget'ı yeni mesajla tekrar kullan (persistent mod).
+        Bildirim zaten ekrandaysa mesaj yerinde güncellenir ve sayaç artar
+        (seri çekimlerde bildirimler üst üste yığılır, kuyruk birikmez).
+        """
+        if self._state in ("showing", "holding"):
+            self._stack_count += 1
+        else:
+            self._stack_count = 1
         
-        msg_label = QLabel(display_message)
-        msg_label.setFont(QFont("Segoe UI", 9))
-        msg_label.setStyleSheet("color: #888888; background: transparent; border: none;")
-        text_inner_layout.addWidget(msg_label)
+        self.message = message
+        self.duration = duration
+        self.title_text = title
+        if dark_mode != self.dark_mode:
+            self.dark_mode = dark_mode
+            self._apply_theme()
+        self._update_texts()
         
-        text_layout.addWidget(text_inner)
-        layout.addWidget(text_widget, 1)
+        if self._state == "holding":
+            # Bekleme süresini baştan başlat
+            self._hold_timer.start(int(self.duration * 1000))
+        elif self._state in ("idle", "hiding"):
+            if self.anim_out is not None:
+                self.anim_out.stop()
+            self.show()
+            self._start_animation()
     
     def _start_animation(self):
         """Animasyonu başlat."""
         # Giriş animasyonu
+        self._state = "showing"
         self.anim_in = QPropertyAnimation(self, b"geometry")
         self.anim_in.setDuration(300)
-        self.anim_in.setStartValue(QRect(self.x_pos, self.start_y, self.width_size, self.height_size))
+        # Çıkış animasyonu yarıda kesildiyse bulunduğu yerden devam et
+        self.anim_in.setStartValue(self.geometry())
         self.anim_in.setEndValue(QRect(self.x_pos, self.end_y, self.width_size, self.height_size))
         self.anim_in.setEasingCurve(QEasingCurve.Type.OutCubic)
         self.anim_in.finished.connect(self._wait_and_hide)
@@ -126,10 +185,12 @@ class NotificationWidget(QWidget):
     
     def _wait_and_hide(self):
         """Bekle ve çıkış animasyonu başlat."""
-        QTimer.singleShot(int(self.duration * 1000), self._start_hide_animation)
+        self._state = "holding"
+        self._hold_timer.start(int(self.duration * 1000))
     
     def _start_hide_animation(self):
         """Çıkış animasyonu."""
+        self._state = "hiding"
         self.anim_out = QPropertyAnimation(self, b"geometry")
         self.anim_out.setDuration(300)
         self.anim_out.setStartValue(QRect(self.x_pos, self.end_y, self.width_size, self.height_size))
@@ -139,11 +200,73 @@ class NotificationWidget(QWidget):
         self.anim_out.start()
     
     def _close_app(self):
-        """Uygulamayı kapat."""
+        """Uygulamayı kapat (persistent modda sadece gizlen)."""
+        self._state = "idle"
+        if self.persistent:
+            self.hide()
+            self.finished.emit()
+        else:
+            QApplication.quit()
+
+
+class NotificationServer(QObject):
+    """
+    Kalıcı bildirim sunucusu.
+    
+    stdin'den satır satır JSON mesaj okur (bkz. notification.encode_message)
+    ve tek bir NotificationWidget'ı tekrar kullanır. stdin kapanınca (ana
+    uygulama kapandı veya öldü) sunucu da kapanır.
+    """
+    
+    message_received = pyqtSignal(dict)
+    input_closed = pyqtSignal()
+    
+    def __init__(self, stream):
+        super().__init__()
+        self._stream = stream
+        self.widget = None
+        self.received = 0
+        self.message_received.connect(self._on_message)
+        self.input_closed.connect(self._on_input_closed)
+    
+    def start(self):
+        """Okuyucu thread'i başlat."""
+        threading.Thread(target=self._read_loop, daemon=True).start()
+    
+    def _read_loop(self):
+        """stdin okuma döngüsü (arka plan thread'i). Sinyaller GUI thread'ine kuyruklanır."""
+        for line in iter(self._stream.readline, b""):
+            msg = decode_message(line)
+            if msg is not None:
+                self.message_received.emit(msg)
+        self.input_closed.emit()
+    
+    def _on_message(self, msg: dict):
+        self.received += 1
+        if self.widget is None:
+            self.widget = NotificationWidget(
+                msg["message"], msg["duration"], msg["dark_mode"], msg["title"], persistent=True
+            )
+        self.widget.show_message(msg["message"], msg["duration"], msg["dark_mode"], msg["title"])
+    
+    def _on_input_closed(self):
         QApplication.quit()
 
 
+def run_server():
+    """Kalıcı bildirim sunucusunu çalıştır (stdin IPC)."""
+    app = QApplication(sys.argv)
+    app.setQuitOnLastWindowClosed(False)
+    server = NotificationServer(sys.stdin.buffer)
+    server.start()
+    sys.exit(app.exec())
+
+
 def main():
+    if "--server" in sys.argv:
+        run_server()
+        return
+    
     if len(sys.argv) < 4:
         print("Usage: python _notification_process.py <message> <duration> <dark_mode> [title]")
         sys.exit(1)
@@ -0,0 +1,338 @@
+"""
+GameCapture - Atomik Dosya Yazımı
+Ekran görüntüleri önce aynı klasördeki geçici bir dosyaya yazılır, sonra
+tek bir rename ile son adına taşınır. Yazım sırasında çökme veya disk dolması
+yarım kalmış bir PNG bırakmaz: son ad ya boş rezervasyon dosyası ya da tam
+dosyadır. Başlangıçta artık geçici dosyalar ve boş rezervasyonlar temizlenir;
+yalnızca rezervasyon günlüğünde kayıtlı adlar silinir, kullanıcının veya
+başka programların boş dosyalarına dokunulmaz. Günlükler kayıt klasöründe
+değil, uygulama veri klasöründe (klasör yolu başına bir dosya) tutulur.
+
+fsync ilkeleri:
+    off       - fsync yok (en hızlı; güç kesintisinde dosya boş kalabilir)
+    on-close  - rename öncesi dosya verisi diske yazılır
+    durable   - ayrıca rename'in kendisi de kalıcı yapılır (klasör fsync /
+                MOVEFILE_WRITE_THROUGH)
+"""
+
+import hashlib
+import itertools
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from tracing import tracer
+
+FSYNC_POLICIES = ("off", "on-close", "durable")
+DEFAULT_FSYNC_POLICY = "on-close"
+
+# Geçici dosya adı: .bst-<son ad>.<pid>.<sayaç>.tmp
+TEMP_PREFIX = ".bst-"
+TEMP_SUFFIX = ".tmp"
+
+# Başlangıç temizliği bu yaştan genç dosyalara dokunmaz (saniye)
+ORPHAN_MIN_AGE = 60.0
+
+_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp")
+
+# Windows: hedef dosya kısa süreliğine açık olabilir (Explorer küçük resmi, antivirüs)
+REPLACE_RETRIES = 5
+REPLACE_RETRY_DELAY = 0.05
+
+_counter = itertools.count()
+
+# Günlük yolu -> açık dosya tanıtıcısı (her rezervasyonda yeniden açılmaz)
+_logs: Dict[str, int] = {}
+_log_lock = threading.Lock()
+
+
+def _temp_path(filepath: Path) -> Path:
+    return filepath.with_name(f"{TEMP_PREFIX}{filepath.name}.{os.getpid()}.{next(_counter)}{TEMP_SUFFIX}")
+
+
+def _fsync_directory(directory: Path):
+    """Klasör girdisini kalıcı yap (POSIX; Windows'ta rename write-through ile yapılır)."""
+    if sys.platform == "win32":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _replace(src: Path, dst: Path, durable: bool):
+    """src'yi dst'nin yerine atomik olarak taşı."""
+    for attempt in range(REPLACE_RETRIES):
+        try:
+            if durable and sys.platform == "win32":
+                import ctypes
+                # MOVEFILE_REPLACE_EXISTING | MOVEFILE_WRITE_THROUGH
+                if not ctypes.windll.kernel32.MoveFileExW(str(src), str(dst), 0x1 | 0x8):
+                    raise ctypes.WinError()
+            else:
+                os.replace(src, dst)
+            return
+        except PermissionError:
+            if attempt == REPLACE_RETRIES - 1:
+                raise
+            time.sleep(REPLACE_RETRY_DELAY)
+
+
+@contextmanager
+def atomic_write(filepath: Path, fsync: str = DEFAULT_FSYNC_POLICY):
+    """
+    Dosyayı atomik olarak yaz.
+
+    Kullanım:
+        with atomic_write(path, "on-close") as f:
+            image.save(f, format="PNG")
+
+    Blok hata ile biterse geçici dosya silinir ve son ad değişmez
+    (rezervasyon dosyası varsa boş olarak kalır).
+    """
+    filepath = Path(filepath)
+    tmp_path = _temp_path(filepath)
+    f = open(tmp_path, "wb")
+    try:
+        yield f
+        with tracer.span("write.commit"):
+            f.flush()
+            if fsync != "off":
+                os.fsync(f.fileno())
+            f.close()
+            _replace(tmp_path, filepath, durable=fsync == "durable")
+            if fsync == "durable":
+                _fsync_directory(filepath.parent)
+    except BaseException:
+        f.close()
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def is_temp_name(name: str) -> bool:
+    """Bu modülün geçici dosya adı mı?"""
+    return name.startswith(TEMP_PREFIX) and name.endswith(TEMP_SUFFIX)
+
+
+def reservation_log_path(folder: Path, log_dir: Path) -> Path:
+    """Kayıt klasörünün rezervasyon günlüğü: log_dir/<klasör yolu özeti>.log"""
+    key = os.path.normcase(os.path.abspath(folder))
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return Path(log_dir) / f"{digest}.log"
+
+
+def note_reservation(filepath: Path, log_dir: Path):
+    """
+    naming'in rezerve ettiği (boş oluşturduğu) adı klasörün günlüğüne ekle.
+    Satır tek write ile işletim sistemine yazılır; süreç çökse de kaybolmaz.
+    """
+    filepath = Path(filepath)
+    log_path = reservation_log_path(filepath.parent, log_dir)
+    key = str(log_path)
+    with _log_lock:
+        try:
+            fd = _logs.get(key)
+            if fd is None:
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+                flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+                fd = os.open(log_path, flags)
+                _logs[key] = fd
+            os.write(fd, (filepath.name + "\n").encode("utf-8"))
+        except OSError as e:
+            print(f"[AtomicWrite] Rezervasyon günlüğe yazılamadı: {e}")
+
+
+def close_reservation_logs():
+    """Açık günlük tanıtıcılarını kapat (uygulama kapanırken)."""
+    with _log_lock:
+        for fd in _logs.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        _logs.clear()
+
+
+def _cleanup_reservations(folder: Path, log_dir: Path, cutoff: float) -> int:
+    """
+    Günlükteki adlardan hâlâ boş ve eski olanları sil. Günlük, yalnızca henüz
+    genç (sürmekte olabilecek) boş rezervasyonlar kalacak şekilde kısaltılır.
+    """
+    removed = 0
+    with _log_lock:
+        try:
+            log = open(reservation_log_path(folder, log_dir), "r+", encoding="utf-8")
+        except OSError:
+            return 0
+        with log:
+            keep = []
+            for name in dict.fromkeys(log.read().splitlines()):
+                # Günlükte yalnızca düz dosya adları olmalı
+                if not name.lower().endswith(_IMAGE_EXTENSIONS) or os.path.basename(name) != name:
+                    continue
+                path = folder / name
+                try:
+                    stat = path.stat()
+                    if stat.st_size != 0:
+                        continue  # Kayıt tamamlanmış
+                    if stat.st_mtime > cutoff:
+                        keep.append(name)
+                        continue
+                    path.unlink()
+                except OSError:
+                    continue
+                removed += 1
+            log.seek(0)
+            log.truncate()
+            log.writelines(f"{name}\n" for name in keep)
+    return removed
+
+
+def cleanup_orphans(
+    folder: Path,
+    log_dir: Optional[Path] = None,
+    min_age: float = ORPHAN_MIN_AGE
+) -> Tuple[int, int]:
+    """
+    Çökmeden kalan geçici dosyaları ve boş rezervasyon dosyalarını sil.
+    Boş görüntü dosyaları yalnızca rezervasyon günlüğünde kayıtlıysa silinir.
+
+    Args:
+        log_dir: Rezervasyon günlüklerinin klasörü (None: yalnızca geçici dosyalar)
+        min_age: Bundan daha yeni dosyalar (sürmekte olan kayıtlar) atlanır
+
+    Returns:
+        (silinen_geçici, silinen_boş_rezervasyon)
+    """
+    folder = Path(folder)
+    temps = 0
+    cutoff = time.time() - min_age
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if not is_temp_name(entry.name):
+                    continue
+                try:
+                    if entry.stat().st_mtime > cutoff:
+                        continue
+                    os.unlink(entry.path)
+                except OSError:
+                    continue
+                temps += 1
+    except OSError:
+        pass
+    placeholders = _cleanup_reservations(folder, log_dir, cutoff) if log_dir is not None else 0
+    if temps or placeholders:
+        print(f"[AtomicWrite] Temizlendi: {temps} geçici dosya, {placeholders} boş rezervasyon")
+    return temps, placeholders
+
+
+if __name__ == "__main__":
+    # Hata enjeksiyonu - yazan süreç yazım ortasında öldürülür
+    import subprocess
+    import tempfile
+
+    CHUNK = 256 * 1024
+    CHUNKS = 200
+
+    if len(sys.argv) >= 4 and sys.argv[1] == "--child":
+        # Alt süreç: yavaş yazıcı. İlk parçadan sonra "started" bildirir.
+        target, mode = Path(sys.argv[2]), sys.argv[3]
+        chunk = os.urandom(CHUNK)
+
+        def slow_write(f):
+            for i in range(CHUNKS):
+                f.write(chunk)
+                f.flush()
+                if i == 0:
+                    print("started", flush=True)
+                time.sleep(0.01)
+
+        if mode == "direct":
+            with open(target, "wb") as f:
+                slow_write(f)
+        else:
+            with atomic_write(target, mode) as f:
+                slow_write(f)
+        sys.exit(0)
+
+    folder = Path(tempfile.mkdtemp(prefix="bst_atomic_"))
+    log_dir = Path(tempfile.mkdtemp(prefix="bst_reservations_"))
+
+    def kill_mid_write(name: str, mode: str) -> Path:
+        target = folder / name
+        target.touch()  # naming.get_unique_filepath rezervasyonu gibi
+        note_reservation(target, log_dir)
+        proc = subprocess.Popen([sys.executable, __file__, "--child", str(target), mode],
+                                stdout=subprocess.PIPE, text=True)
+        assert proc.stdout.readline().strip() == "started"
+        time.sleep(0.05)
+        proc.kill()
+        proc.wait()
+        return target
+
+    # Eski yol: doğrudan yazım yarım dosya bırakır
+    target = kill_mid_write("direct.png", "direct")
+    print(f"Doğrudan yazım öldürüldü: {target.stat().st_size} bayt yarım dosya")
+    assert 0 < target.stat().st_size < CHUNK * CHUNKS
+    target.unlink()
+
+    # Atomik yazım: son ad boş rezervasyon olarak kalır, veri geçici dosyada
+    for mode in FSYNC_POLICIES:
+        target = kill_mid_write(f"atomic_{mode}.png", mode)
+        assert target.stat().st_size == 0, f"{mode}: yarım veri son ada sızdı"
+        print(f"✓ {mode:<9} öldürüldü: son ad boş rezervasyon, yarım dosya yok")
+
+    temps = [p for p in folder.iterdir() if is_temp_name(p.name)]
+    assert len(temps) == len(FSYNC_POLICIES), temps
+
+    # Uygulamanın oluşturmadığı boş görüntü (kullanıcı/başka program) korunur
+    foreign = folder / "kullanici_bos.png"
+    foreign.touch()
+
+    # Genç dosyalara dokunulmaz, yaş sınırı geçince temizlenir
+    assert cleanup_orphans(folder, log_dir) == (0, 0)
+    assert cleanup_orphans(folder, log_dir, min_age=0) == (len(FSYNC_POLICIES), len(FSYNC_POLICIES))
+    assert [p.name for p in folder.iterdir()] == [foreign.name]
+    assert reservation_log_path(folder, log_dir).read_text(encoding="utf-8") == ""
+    print("✓ Başlangıç temizliği geçici dosyaları ve boş rezervasyonları sildi, yabancı boş dosya kaldı")
+    foreign.unlink()
+
+    # Başarılı yazım ve blok içi hata
+    target = folder / "ok.png"
+    target.touch()
+    with atomic_write(target) as f:
+        f.write(b"complete")
+    assert target.read_bytes() == b"complete"
+    try:
+        with atomic_write(target) as f:
+            f.write(b"partial")
+            raise IOError("disk dolu")
+    except IOError:
+        pass
+    assert target.read_bytes() == b"complete"
+    assert [p.name for p in folder.iterdir()] == ["ok.png"]
+    print("✓ Hata durumunda önceki içerik korundu, geçici dosya silindi")
+
+    # fsync ilkelerinin maliyeti
+    data = os.urandom(4 * 1024 * 1024)
+    for mode in FSYNC_POLICIES:
+        start = time.perf_counter()
+        for i in range(10):
+            with atomic_write(folder / f"bench_{i}.png", mode) as f:
+                f.write(data)
+        print(f"  {mode:<9} {(time.perf_counter() - start) / 10 * 1000:6.1f} ms / 4 MB dosya")
+    close_reservation_logs()
+    assert not _logs
+    for directory in (folder, log_dir):
+        for path in directory.iterdir():
+            path.unlink()
+        directory.rmdir()
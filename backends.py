@@ -0,0 +1,364 @@
+"""
+GameCapture - Yakalama Backend Kaydı
+Yakalama yöntemleri (DXcam, MSS, sentetik) için ortak arayüz ve uygulama
+bazlı karne: her uygulama için backend başına gecikme, başarı ve siyah kare
+oranı tutulur; sonraki yakalamalar doğrudan en iyi backend'e yönlendirilir.
+Karne çalıştırmalar arasında JSON dosyasında saklanır.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tracing import tracer
+
+# Eski kayıtların etkisi her yeni kayıtta bu oranla azalır (~20 kayıtlık pencere)
+SCORE_DECAY = 0.95
+# Bir backend'e güvenmek için gereken en az örnek sayısı
+MIN_SAMPLES = 3
+# "İyi" sayılmak için gereken başarı oranı
+GOOD_RATE = 0.8
+# Karne diske en fazla bu sıklıkla yazılır (saniye)
+SAVE_INTERVAL = 30.0
+
+
+class NoNewFrame(Exception):
+    """Backend yeni kare vermedi (DXcam: ekran değişmedi) - hata sayılmaz."""
+
+
+class CaptureBackend:
+    """Yakalama backend'i temel sınıfı."""
+
+    name = "base"
+    priority = 100  # Küçük = varsayılan sırada önce denenir
+
+    def is_available(self) -> bool:
+        return True
+
+    def supports(self, monitor: int) -> bool:
+        """Bu monitör ayarını destekliyor mu? (-1 = tüm monitörler)"""
+        return True
+
+    def grab(self, monitor: int):
+        """Kare yakala; başarısızsa None döndür, ekran değişmediyse NoNewFrame fırlat."""
+        raise NotImplementedError
+
+    def close(self):
+        """Kaynakları serbest bırak."""
+        pass
+
+
+class SyntheticBackend(CaptureBackend):
+    """Testler için sahte backend - sabit gecikme ve isteğe bağlı siyah kare."""
+
+    def __init__(self, name: str = "synthetic", priority: int = 100, latency: float = 0.0,
+                 black_for: tuple = (), fail_for: tuple = (), stale_for: tuple = (),
+                 size: tuple = (64, 36)):
+        self.name = name
+        self.priority = priority
+        self.latency = latency
+        self.black_for = set(black_for)
+        self.fail_for = set(fail_for)
+        self.stale_for = set(stale_for)
+        self.size = size
+        self.current_app = None
+        self.calls = 0
+
+    def grab(self, monitor: int):
+        from PIL import Image
+
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.current_app in self.fail_for:
+            return None
+        if self.current_app in self.stale_for:
+            raise NoNewFrame()
+        color = (0, 0, 0) if self.current_app in self.black_for else (90, 140, 200)
+        return Image.new("RGB", self.size, color)
+
+
+class BackendRegistry:
+    """Kayıtlı yakalama backend'leri."""
+
+    def __init__(self):
+        self._backends: Dict[str, CaptureBackend] = {}
+
+    def register(self, backend: CaptureBackend):
+        self._backends[backend.name] = backend
+
+    def unregister(self, name: str):
+        backend = self._backends.pop(name, None)
+        if backend is not None:
+            backend.close()
+
+    def get(self, name: str) -> Optional[CaptureBackend]:
+        return self._backends.get(name)
+
+    def candidates(self, monitor: int) -> List[CaptureBackend]:
+        """Bu monitör için kullanılabilir backend'ler (varsayılan sırada)."""
+        backends = [b for b in self._backends.values() if b.is_available() and b.supports(monitor)]
+        return sorted(backends, key=lambda b: b.priority)
+
+    def close_all(self):
+        for backend in self._backends.values():
+            backend.close()
+
+
+class Scorecard:
+    """
+    Uygulama bazlı backend karnesi.
+
+    Kayıt yapısı: {uygulama: {backend: {"n", "ok", "black", "fail", "latency_ms"}}}
+    Sayaçlar SCORE_DECAY ile sönümlenir, böylece karne değişen koşullara uyum sağlar.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._data: Dict[str, Dict[str, dict]] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._dirty = False
+        self._last_save = 0.0
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._data = data
+        except (json.JSONDecodeError, IOError):
+            pass
+
+    def record(self, app: str, backend: str, latency_ms: float, outcome: str):
+        """Yakalama sonucunu kaydet. outcome: "ok", "black" veya "fail"."""
+        with self._lock:
+            self._ensure_loaded()
+            stats = self._data.setdefault(app, {}).setdefault(
+                backend, {"n": 0.0, "ok": 0.0, "black": 0.0, "fail": 0.0, "latency_ms": 0.0}
+            )
+            for key in ("n", "ok", "black", "fail"):
+                stats[key] *= SCORE_DECAY
+            stats["n"] += 1
+            stats[outcome] += 1
+            if outcome == "ok":
+                # Üstel hareketli ortalama
+                if stats["latency_ms"] <= 0:
+                    stats["latency_ms"] = latency_ms
+                else:
+                    stats["latency_ms"] = stats["latency_ms"] * 0.8 + latency_ms * 0.2
+            self._dirty = True
+
+        if time.monotonic() - self._last_save > SAVE_INTERVAL:
+            self.save()
+
+    def stats(self, app: str) -> Dict[str, dict]:
+        with self._lock:
+            self._ensure_loaded()
+            return {name: dict(s) for name, s in self._data.get(app, {}).items()}
+
+    def rank(self, app: Optional[str], backends: List[CaptureBackend]) -> List[CaptureBackend]:
+        """
+        Backend'leri bu uygulama için sırala:
+        1) Yeterli örneği olan ve başarılı olanlar, gecikmeye göre
+        2) Henüz denenmemiş olanlar, varsayılan sırada
+        3) Bu uygulamada başarısız olanlar (son çare)
+        """
+        if not app:
+            return list(backends)
+
+        stats = self.stats(app)
+
+        def key(backend: CaptureBackend):
+            s = stats.get(backend.name)
+            if not s or s["n"] < MIN_SAMPLES:
+                return (1, backend.priority, 0.0)
+            rate = s["ok"] / s["n"]
+            if rate >= GOOD_RATE:
+                return (0, s["latency_ms"], 0.0)
+            return (2, -rate, backend.priority)
+
+        return sorted(backends, key=key)
+
+    def save(self):
+        """Karneyi diske yaz (değişiklik varsa)."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._data, indent=2, ensure_ascii=False)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        try:
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            tmp_path.replace(self.path)
+        except IOError as e:
+            print(f"[Backends] Karne kaydedilemedi: {e}")
+
+
+def _traced_is_black(is_black, frame):
+    with tracer.span("black_check"):
+        return is_black(frame)
+
+
+def capture_with_backends(
+    registry: BackendRegistry,
+    scorecard: Scorecard,
+    monitor: int,
+    app: Optional[str],
+    is_black
+):
+    """
+    Karneye göre sıralanmış backend'lerle yakala.
+
+    Son aday dışındaki backend'lerin sonucu siyah kare kontrolünden geçer;
+    siyah veya boş dönen backend kaydedilir ve sıradakine geçilir. is_black
+    "uniform" döndürürse (tek renk kare: beyaz belge, yükleme ekranı olabilir)
+    sıradaki yalnızca denenir, backend karnede geriletilmez. Yeni kare vermeyen
+    backend (NoNewFrame) da karneye işlenmez. Hiçbir backend kullanılabilir
+    kare vermezse ilk siyah/tek renk kare döndürülür (ekran görüntüsü kaybolmaz).
+
+    Args:
+        is_black: is_black(kare) -> True / "black" (başarısız), "uniform"
+            (yalnızca yeniden dene) veya False / None (normal kare)
+
+    Returns:
+        (kare, backend_adı)
+    """
+    candidates = scorecard.rank(app, registry.candidates(monitor))
+    if not candidates:
+        raise RuntimeError("Kullanılabilir yakalama backend'i yok")
+
+    black_frame = None
+    for i, backend in enumerate(candidates):
+        is_last = i == len(candidates) - 1
+        start = time.perf_counter_ns()
+        try:
+            frame = backend.grab(monitor)
+        except NoNewFrame:
+            tracer.record(f"grab.{backend.name}", start, time.perf_counter_ns())
+            continue
+        except Exception as e:
+            print(f"[Backends] {backend.name} hatası: {e}")
+            frame = None
+        end = time.perf_counter_ns()
+        tracer.record(f"grab.{backend.name}", start, end)
+        latency_ms = (end - start) / 1e6
+
+        if frame is None:
+            if app:
+                scorecard.record(app, backend.name, latency_ms, "fail")
+            continue
+
+        blank = _traced_is_black(is_black, frame) if not is_last else None
+        if blank:
+            if blank == "uniform":
+                print(f"[Backends] {backend.name} tek renk kare döndü, sıradaki deneniyor...")
+            else:
+                if app:
+                    scorecard.record(app, backend.name, latency_ms, "black")
+                print(f"[Backends] {backend.name} siyah ekran döndü, sıradakine geçiliyor...")
+            if black_frame is None:
+                black_frame = (frame, backend.name)
+            continue
+
+        if app:
+            scorecard.record(app, backend.name, latency_ms, "ok")
+        return frame, backend.name
+
+    if black_frame is not None:
+        print(f"[Backends] Başka kare alınamadı, {black_frame[1]} siyah karesi kullanılıyor")
+        return black_frame
+    raise RuntimeError("Hiçbir backend kare döndürmedi")
+
+
+if __name__ == "__main__":
+    # Test - sentetik backend'lerle yönlendirme ve karnenin kalıcılığı
+    import tempfile
+
+    def is_black(img) -> bool:
+        return img.getextrema()[0][1] < 10
+
+    fast = SyntheticBackend("dxcam-like", priority=0, latency=0.001, black_for=("game.exe",))
+    slow = SyntheticBackend("mss-like", priority=1, latency=0.01)
+    registry = BackendRegistry()
+    registry.register(fast)
+    registry.register(slow)
+
+    score_path = Path(tempfile.gettempdir()) / "bst_scorecard_test.json"
+    score_path.unlink(missing_ok=True)
+    scorecard = Scorecard(score_path)
+
+    # game.exe: hızlı backend siyah döner -> birkaç denemeden sonra doğrudan yavaşa gidilmeli
+    for backend in (fast, slow):
+        backend.current_app = "game.exe"
+    for _ in range(10):
+        _, used = capture_with_backends(registry, scorecard, 0, "game.exe", is_black)
+        assert used == "mss-like"
+    fast_calls = fast.calls
+    for _ in range(20):
+        capture_with_backends(registry, scorecard, 0, "game.exe", is_black)
+    assert fast.calls == fast_calls, "Siyah dönen backend tekrar denendi"
+    print(f"✓ game.exe -> mss-like (dxcam-like yalnızca {fast_calls} kez denendi)")
+
+    # desktop.exe: hızlı backend çalışır -> hep hızlı olan kullanılmalı
+    for backend in (fast, slow):
+        backend.current_app = "desktop.exe"
+    slow_calls = slow.calls
+    for _ in range(10):
+        _, used = capture_with_backends(registry, scorecard, 0, "desktop.exe", is_black)
+        assert used == "dxcam-like"
+    assert slow.calls == slow_calls
+    print("✓ desktop.exe -> dxcam-like (mss-like hiç çağrılmadı)")
+
+    # Durağan sahne (duraklatılmış tam ekran oyun): dxcam-like yeni kare vermez,
+    # mss-like siyah döner -> kare kaybolmamalı ve dxcam-like geriletilmemeli
+    fast.stale_for.add("paused.exe")
+    slow.black_for.add("paused.exe")
+    for backend in (fast, slow):
+        backend.current_app = "paused.exe"
+    for _ in range(10):
+        frame, used = capture_with_backends(registry, scorecard, 0, "paused.exe", is_black)
+        assert used == "mss-like" and frame is not None
+    assert "dxcam-like" not in scorecard.stats("paused.exe")
+    print("✓ paused.exe: yeni kare yok hata sayılmadı, siyah kare yine de kaydedildi")
+
+    # Düz ekran (beyaz belge): tek renk kare yalnızca yeniden denenir, dxcam-like geriletilmez
+    # Sentetik kareler düz renklidir; burada yalnızca beyaz kare "uniform" sayılır
+    def classify(img):
+        low, high = img.getextrema()[0]
+        return "black" if high < 10 else ("uniform" if low >= 240 else None)
+
+    class FlatBackend(SyntheticBackend):
+        def grab(self, monitor: int):
+            from PIL import Image
+            return Image.new("RGB", self.size, (250, 250, 250))
+
+    flat = FlatBackend("flat-like", priority=-1)
+    registry.register(flat)
+    for backend in (fast, slow):
+        backend.current_app = "editor.exe"
+    for _ in range(10):
+        _, used = capture_with_backends(registry, scorecard, 0, "editor.exe", classify)
+        assert used == "dxcam-like"
+    assert "flat-like" not in scorecard.stats("editor.exe")
+    registry.unregister("flat-like")
+    print("✓ editor.exe: tek renk kare karneye siyah olarak işlenmedi")
+
+    # Kalıcılık
+    scorecard.save()
+    reloaded = Scorecard(score_path)
+    ranked = [b.name for b in reloaded.rank("game.exe", registry.candidates(0))]
+    assert ranked[0] == "mss-like", ranked
+    print(f"✓ Karne diskten yüklendi: game.exe sırası {ranked}")
+    score_path.unlink(missing_ok=True)
@@ -0,0 +1,318 @@
+"""
+GameCapture - Kodlayıcı Benchmark'ı
+Tekrarlanabilir sentetik oyun benzeri kareler (gradyan, gürültü, arayüz
+metni, düz alanlar) üzerinde format/kalite ayarlarının maliyetini ölçer:
+kodlama süresi, en yüksek bellek ve dosya boyutu. Sonuçlar regresyon takibi
+için JSON rapor olarak yazılır.
+
+Süre ve bellek ayrı geçişlerde ölçülür: süre bu süreçte ölçüm aracı olmadan,
+bellek her varyant için ayrı bir alt süreçte tepe RSS artışı olarak
+(Pillow'un C tamponları dahil).
+
+Kullanım:
+    python main.py --bench-encode [--quick] [--repeat N] [--out rapor.json]
+    python bench.py --formats png,jpeg --resolutions 1080p
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import PIL
+from PIL import Image, ImageDraw
+
+from png_writer import write_png, PRESETS as PNG_PRESETS
+
+RESOLUTIONS = {
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4K": (3840, 2160),
+}
+
+SCENES = ["game", "gradient", "noise", "ui_text", "flat"]
+
+
+# --- Sentetik kareler ---
+
+def _gradient(rng: np.random.Generator, width: int, height: int) -> np.ndarray:
+    """Gökyüzü benzeri dikey/yatay gradyan + hafif renk bandı."""
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+    x = np.linspace(0, 1, width, dtype=np.float32)[None, :]
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:, :, 0] = (30 + 120 * y + 20 * x).astype(np.uint8)
+    frame[:, :, 1] = (60 + 100 * y).astype(np.uint8)
+    frame[:, :, 2] = (200 - 80 * y + 30 * x).astype(np.uint8)
+    return frame
+
+
+def _noise(rng: np.random.Generator, width: int, height: int) -> np.ndarray:
+    """Doku/çimen benzeri gürültü (sıkıştırılması en zor durum)."""
+    base = rng.integers(40, 120, (height, width, 3), dtype=np.uint8)
+    base[:, :, 1] += 40
+    return base
+
+
+def _flat(rng: np.random.Generator, width: int, height: int) -> np.ndarray:
+    """Menü/yükleme ekranı: büyük düz alanlar."""
+    frame = np.full((height, width, 3), (18, 20, 26), dtype=np.uint8)
+    frame[height // 3:2 * height // 3, width // 4:3 * width // 4] = (42, 46, 58)
+    frame[height // 2 - 4:height // 2 + 4, width // 4:width // 2] = (220, 180, 40)
+    return frame
+
+
+def _draw_ui(frame: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Kareye HUD panelleri ve metin satırları çiz."""
+    height, width = frame.shape[:2]
+    image = Image.fromarray(frame)
+    draw = ImageDraw.Draw(image)
+    panel_w, panel_h = width // 4, height // 3
+    for x0, y0 in ((20, 20), (width - panel_w - 20, height - panel_h - 20)):
+        draw.rectangle((x0, y0, x0 + panel_w, y0 + panel_h), fill=(12, 14, 18), outline=(200, 200, 200))
+        for line in range(panel_h // 14 - 1):
+            words = " ".join(f"item{rng.integers(0, 999)}" for _ in range(panel_w // 60))
+            draw.text((x0 + 8, y0 + 6 + line * 14), words, fill=(230, 230, 230))
+    return np.asarray(image).copy()
+
+
+def _ui_text(rng: np.random.Generator, width: int, height: int) -> np.ndarray:
+    return _draw_ui(_flat(rng, width, height), rng)
+
+
+def _game(rng: np.random.Generator, width: int, height: int) -> np.ndarray:
+    """Üst yarı gökyüzü gradyanı, alt yarı dokulu zemin, üstte HUD."""
+    frame = _gradient(rng, width, height)
+    frame[height // 2:] = _noise(rng, width, height - height // 2)
+    return _draw_ui(frame, rng)
+
+
+SCENE_BUILDERS: Dict[str, Callable[[np.random.Generator, int, int], np.ndarray]] = {
+    "game": _game,
+    "gradient": _gradient,
+    "noise": _noise,
+    "ui_text": _ui_text,
+    "flat": _flat,
+}
+
+
+def make_frame(scene: str, width: int, height: int, seed: int = 0) -> np.ndarray:
+    """Sahne + çözünürlük + tohum için her zaman aynı kare."""
+    rng = np.random.default_rng([seed, SCENES.index(scene), width, height])
+    return SCENE_BUILDERS[scene](rng, width, height)
+
+
+# --- Kodlayıcı varyantları ---
+
+def encoder_variants() -> List[Tuple[str, str, dict]]:
+    """(etiket, format, parametreler) listesi."""
+    variants = [("png optimize", "png", {"optimize": True})]
+    for level in (1, 6, 9):
+        variants.append((f"png level={level}", "png", {"compress_level": level}))
+    for preset in PNG_PRESETS:
+        variants.append((f"png_writer {preset}", "png", {"preset": preset}))
+    for quality in (75, 90, 95):
+        for optimize in (False, True):
+            for subsampling, label in ((2, "420"), (0, "444")):
+                variants.append((
+                    f"jpeg q={quality} opt={int(optimize)} {label}", "jpeg",
+                    {"quality": quality, "optimize": optimize, "subsampling": subsampling}
+                ))
+    for method in range(7):
+        variants.append((f"webp q=90 m={method}", "webp", {"quality": 90, "method": method}))
+    for method in (0, 4, 6):
+        variants.append((f"webp lossless m={method}", "webp", {"lossless": True, "method": method}))
+    variants.append(("bmp", "bmp", {}))
+    return variants
+
+
+def _encode(frame: np.ndarray, path: Path, format: str, params: dict):
+    if "preset" in params:
+        write_png(frame, path, params["preset"])
+    else:
+        Image.fromarray(frame).save(path, format=format.upper(), **params)
+
+
+def measure(frame: np.ndarray, path: Path, format: str, params: dict, repeat: int) -> dict:
+    """Bir varyantın kodlama süresini ölç (medyan + en iyi) ve dosya boyutunu döndür."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _encode(frame, path, format, params)
+        times.append((time.perf_counter() - start) * 1000)
+    size = path.stat().st_size
+    path.unlink()
+    height, width = frame.shape[:2]
+    return {
+        "time_ms": round(statistics.median(times), 2),
+        "time_min_ms": round(min(times), 2),
+        "size_bytes": size,
+        "bits_per_pixel": round(size * 8 / (width * height), 3),
+    }
+
+
+# --- Bellek ölçümü (varyant başına ayrı süreç) ---
+
+def _current_rss() -> int:
+    """Sürecin o anki RSS değeri (bayt)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _mem_child(res: str, scene: str, seed: int, index: int) -> float:
+    """
+    Temiz süreçte tek kodlamanın tepe RSS artışı (MB). Taban kare
+    oluşturulduktan sonra alınır; kodlama sırasında RSS 1 ms aralıkla örneklenir.
+    """
+    width, height = RESOLUTIONS[res]
+    frame = make_frame(scene, width, height, seed)
+    _, format, params = encoder_variants()[index]
+    path = Path(tempfile.gettempdir()) / f"bst_bench_mem_{os.getpid()}.{format}"
+
+    peak = [0]
+    done = threading.Event()
+
+    def sampler():
+        while not done.is_set():
+            peak[0] = max(peak[0], _current_rss())
+            time.sleep(0.001)
+
+    baseline = _current_rss()
+    thread = threading.Thread(target=sampler)
+    thread.start()
+    try:
+        _encode(frame, path, format, params)
+    finally:
+        done.set()
+        thread.join()
+        path.unlink(missing_ok=True)
+    peak[0] = max(peak[0], _current_rss())
+    return max(0, peak[0] - baseline) / (1024 * 1024)
+
+
+def _child_command(*args: str) -> list:
+    """Bellek ölçüm süreci için komut satırı (EXE'de --bench-encode üzerinden)."""
+    if getattr(sys, 'frozen', False):
+        return [sys.executable, "--bench-encode", "--mem-child", *args]
+    return [sys.executable, os.path.abspath(__file__), "--mem-child", *args]
+
+
+# glibc mmap eşiği sabitlenir: aksi halde kare oluşturulurken serbest bırakılan
+# büyük bloklar heap'te kalır ve kodlayıcının tamponları RSS artışı göstermez
+_CHILD_ENV = {**os.environ, "MALLOC_MMAP_THRESHOLD_": "131072"}
+
+
+def measure_memory(res: str, scene: str, seed: int, index: int) -> float:
+    """Varyantın tepe RSS artışını (MB) ayrı süreçte ölç; ölçülemezse -1."""
+    proc = subprocess.run(
+        _child_command(res, scene, str(seed), str(index)),
+        capture_output=True, text=True, env=_CHILD_ENV,
+    )
+    try:
+        return float(proc.stdout.split()[-1])
+    except (IndexError, ValueError):
+        print(f"[Bench] Bellek ölçülemedi: {proc.stderr.strip().splitlines()[-1:] or proc.returncode}")
+        return -1.0
+
+
+def run(
+    resolutions: List[str],
+    scenes: List[str],
+    formats: List[str],
+    repeat: int = 3,
+    seed: int = 0,
+    log: Callable[[str], None] = print
+) -> dict:
+    """Benchmark'ı çalıştır ve rapor sözlüğünü döndür."""
+    variants = [(i, *v) for i, v in enumerate(encoder_variants()) if v[1] in formats]
+    results = []
+    tmp_dir = Path(tempfile.mkdtemp(prefix="bst_bench_"))
+
+    try:
+        for res in resolutions:
+            width, height = RESOLUTIONS[res]
+            for scene in scenes:
+                frame = make_frame(scene, width, height, seed)
+                log(f"\n[{res} {scene}]")
+                for index, label, format, params in variants:
+                    path = tmp_dir / f"out.{format}"
+                    result = measure(frame, path, format, params, repeat)
+                    result["peak_mb"] = round(measure_memory(res, scene, seed, index), 2)
+                    results.append({
+                        "resolution": res, "width": width, "height": height,
+                        "scene": scene, "variant": label, "format": format,
+                        "params": params, **result,
+                    })
+                    log(f"  {label:<28}{result['time_ms']:>9.1f} ms{result['peak_mb']:>8.1f} MB"
+                        f"{result['size_bytes'] / 1024:>11.0f} KB")
+    finally:
+        for leftover in tmp_dir.iterdir():
+            leftover.unlink()
+        tmp_dir.rmdir()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pillow": PIL.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": seed,
+            "repeat": repeat,
+            "memory": "peak RSS delta, one subprocess per variant",
+        },
+        "results": results,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if "--mem-child" in argv:
+        res, scene, seed, index = argv[argv.index("--mem-child") + 1:][:4]
+        print(f"{_mem_child(res, scene, int(seed), int(index)):.2f}")
+        return 0
+
+    parser = argparse.ArgumentParser(description="Kodlayıcı benchmark'ı")
+    parser.add_argument("--quick", action="store_true", help="Yalnızca 1080p ve 'game' sahnesi")
+    parser.add_argument("--resolutions", default=",".join(RESOLUTIONS))
+    parser.add_argument("--scenes", default=",".join(SCENES))
+    parser.add_argument("--formats", default="png,jpeg,webp,bmp")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_encode.json", help="JSON rapor yolu")
+    args, _ = parser.parse_known_args(argv)
+
+    resolutions = ["1080p"] if args.quick else args.resolutions.split(",")
+    scenes = ["game"] if args.quick else args.scenes.split(",")
+    formats = args.formats.split(",")
+    for name, allowed in (("çözünürlük", RESOLUTIONS), ("sahne", SCENES)):
+        values = resolutions if allowed is RESOLUTIONS else scenes
+        unknown = [v for v in values if v not in allowed]
+        if unknown:
+            print(f"Bilinmeyen {name}: {', '.join(unknown)}")
+            return 2
+
+    report = run(resolutions, scenes, formats, max(1, args.repeat), args.seed)
+    out = Path(args.out)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n✓ {len(report['results'])} ölçüm yazıldı: {out.resolve()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -56,6 +56,24 @@ a = Analysis(
         'detector',
         'hotkeys',
         'naming',
+        'encoder',
+        'burst',
+        'replay',
+        'backends',
+        'mss_pool',
+        'frame',
+        'camera_pool',
+        'multimon',
+        'png_writer',
+        'bench',
+        'size_estimator',
+        'atomic_write',
+        'config_watcher',
+        'process_cache',
+        'foreground_tracker',
+        'dispatcher',
+        'tracing',
+        'tray_icon',
         'notification',
         '_notification_process',
     ],
@@ -0,0 +1,221 @@
+"""
+GameCapture - Seri Çekim (Burst) Modu
+Kısayol tuşu basılı tutulduğu sürece saniyede N kare yakalar.
+Kareler önceden ayrılmış numpy tamponlarından oluşan bir halkaya kopyalanır;
+kodlama daha sonra arka plan kodlayıcıda yapılır. Yakalama kaynağının (DXcam,
+MSS) her grab'de ayırdığı geçici dizi halkaya kopyalanır ve hemen serbest
+kalır; seri boyunca biriken bellek yalnızca halkadır.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+
+class FrameRing:
+    """
+    Önceden ayrılmış kare tamponlarından oluşan halka.
+
+    Slot sayısı hem `max_frames` hem de `max_bytes` bütçesi ile sınırlıdır.
+    Yakalama döngüsü boş bir slot alır (acquire), kareyi doğrudan o tampona
+    yazar ve commit eder; kodlayıcı işini bitirince slot release ile geri
+    verilir. Kararlı durumda halka kare başına yeni bellek ayırmaz (fill'in
+    kaynağı kendi geçici dizisini ayırabilir).
+    """
+
+    def __init__(self, shape: Tuple[int, ...], max_frames: int, max_bytes: int, dtype=np.uint8):
+        frame_bytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        count = max(1, min(max_frames, max_bytes // max(1, frame_bytes)))
+
+        self.shape = tuple(shape)
+        self.frame_bytes = frame_bytes
+        self._buffers = [np.empty(shape, dtype=dtype) for _ in range(count)]
+        self._timestamps = [0.0] * count
+        self._free = deque(range(count))
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buffers)
+
+    @property
+    def nbytes(self) -> int:
+        return self.capacity * self.frame_bytes
+
+    def free_slots(self) -> int:
+        with self._lock:
+            return len(self._free)
+
+    def acquire(self) -> int:
+        """Boş bir slot al. Boş slot yoksa kare düşürülür ve -1 döner."""
+        with self._lock:
+            if not self._free:
+                self.dropped += 1
+                return -1
+            return self._free.popleft()
+
+    def buffer(self, slot: int) -> np.ndarray:
+        """Slotun tamponunu döndür (kopyasız)."""
+        return self._buffers[slot]
+
+    def timestamp(self, slot: int) -> float:
+        return self._timestamps[slot]
+
+    def commit(self, slot: int, timestamp: float):
+        """Slota yazılan karenin yakalama zamanını kaydet (run_burst'ün saati)."""
+        self._timestamps[slot] = timestamp
+
+    def reset_dropped(self):
+        """Düşürülen kare sayacını sıfırla (her seri başında)."""
+        with self._lock:
+            self.dropped = 0
+
+    def release(self, slot: int):
+        """Kodlaması biten slotu halkaya geri ver."""
+        with self._lock:
+            self._free.append(slot)
+
+
+def run_burst(
+    ring: FrameRing,
+    fill: Callable[[np.ndarray], bool],
+    fps: float,
+    is_held: Callable[[], bool],
+    max_frames: int,
+    clock: Callable[[], float] = time.perf_counter,
+    sleep: Callable[[float], None] = time.sleep
+) -> List[int]:
+    """
+    Tuş basılı kaldığı sürece (veya max_frames dolana kadar) kare yakala.
+
+    Args:
+        fill: fill(tampon) kareyi verilen tampona yazar, başarılıysa True
+        is_held: Tuş hâlâ basılı mı?
+
+    Returns:
+        Yakalanan karelerin slot listesi (yakalama sırasıyla); ring.timestamp(slot)
+        karenin yakalandığı an (clock), ring.dropped yalnızca bu seride
+        düşürülen kareleri sayar
+    """
+    ring.reset_dropped()
+    interval = 1.0 / max(0.1, fps)
+    slots = []
+    next_tick = clock()
+
+    while len(slots) < max_frames:
+        slot = ring.acquire()
+        if slot >= 0:
+            captured_at = clock()
+            if fill(ring.buffer(slot)):
+                ring.commit(slot, captured_at)
+                slots.append(slot)
+            else:
+                ring.release(slot)
+
+        if not is_held():
+            break
+
+        # Sabit kare hızı - geride kalınırsa biriken tick'ler atlanır
+        next_tick += interval
+        delay = next_tick - clock()
+        if delay > 0:
+            sleep(delay)
+        else:
+            next_tick = clock()
+
+    return slots
+
+
+if __name__ == "__main__":
+    # Test - sentetik kare kaynağı ile halka; kararlı durumda halka kare başına ayırma yapmamalı
+    # (yerinde yazan sentetik fill; gerçek DXcam/MSS fill'i kendi geçici dizisini ayırır)
+    import tracemalloc
+
+    shape = (1080, 1920, 3)
+    ring = FrameRing(shape, max_frames=8, max_bytes=64 * 1024 * 1024)
+    print(f"Halka: {ring.capacity} slot, {ring.nbytes / (1024 * 1024):.1f} MB")
+
+    # Bütçe sınırı: 4K karede 64 MB'a en fazla 2 slot sığar
+    small = FrameRing((2160, 3840, 3), max_frames=30, max_bytes=64 * 1024 * 1024)
+    assert small.capacity == 2, small.capacity
+    print(f"✓ Bayt bütçesi uygulandı: 4K için {small.capacity} slot")
+
+    counter = [0]
+
+    def synthetic_fill(dst: np.ndarray) -> bool:
+        counter[0] += 1
+        dst[...] = counter[0] & 0xFF  # yerinde yaz, yeni dizi yok
+        return True
+
+    def burst_once(frames: int) -> List[int]:
+        held = [frames]
+
+        def is_held() -> bool:
+            held[0] -= 1
+            return held[0] > 0
+
+        return run_burst(ring, synthetic_fill, fps=1000, is_held=is_held,
+                         max_frames=frames, sleep=lambda s: None)
+
+    # Isınma
+    for slot in burst_once(ring.capacity):
+        ring.release(slot)
+
+    tracemalloc.start()
+    base_current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    total = 0
+    for _ in range(50):
+        slots = burst_once(ring.capacity)
+        total += len(slots)
+        for slot in slots:
+            # Kodlayıcı taklidi: tampon yerinde okunur, sonra geri verilir
+            assert ring.buffer(slot)[0, 0, 0] == ring.buffer(slot)[-1, -1, -1]
+            ring.release(slot)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    growth = peak - base_current
+    assert growth < ring.frame_bytes // 100, growth
+    print(f"✓ {total} kare, ek bellek tepe değeri {growth} bayt (tek kare {ring.frame_bytes:,} bayt)")
+
+    # Dolu halka: slot geri verilmezse kareler düşürülmeli
+    slots = burst_once(ring.capacity + 5)
+    assert len(slots) == ring.capacity and ring.dropped == 5, (len(slots), ring.dropped)
+    print(f"✓ Halka dolunca {ring.dropped} kare düşürüldü")
+
+    # Sayaç seri başına: sonraki seri önceki düşürmeleri saymaz
+    for slot in slots:
+        ring.release(slot)
+    for slot in burst_once(2):
+        ring.release(slot)
+    assert ring.dropped == 0, ring.dropped
+    print("✓ Düşürülen kare sayacı her seride sıfırlandı")
+
+    # Zaman damgası fill'den hemen önceki andır (dosya adı yakalama anından üretilir)
+    now = [100.0]
+
+    def slow_fill(dst: np.ndarray) -> bool:
+        now[0] += 0.05  # Kopyalama süresi
+        return True
+
+    def advance(seconds: float):
+        now[0] += seconds
+
+    held = [3]
+
+    def held_three() -> bool:
+        held[0] -= 1
+        return held[0] > 0
+
+    slots = run_burst(ring, slow_fill, fps=10, is_held=held_three, max_frames=3,
+                      clock=lambda: now[0], sleep=advance)
+    stamps = [round(ring.timestamp(slot), 3) for slot in slots]
+    assert stamps == [100.0, 100.1, 100.2], stamps
+    for slot in slots:
+        ring.release(slot)
+    print(f"✓ Kare zamanları yakalama anında kaydedildi: {stamps}")
@@ -0,0 +1,386 @@
+"""
+GameCapture - DXcam Kamera Havuzu
+Her (GPU, çıkış) çifti için ayrı DXcam kamerası tutar. Kameralar ilk
+kullanımda oluşturulur, uzun süre kullanılmayanlar serbest bırakılır ve üst
+üste başarısız olan kamera bir sonraki kullanımda yeniden oluşturulur.
+Böylece monitör değiştirmek veya birden fazla monitör yakalamak yakalama
+anında DXGI duplication nesnelerini yeniden oluşturmaz.
+
+Uygulamanın monitör indeksi (mss sırası) DXGI (GPU, çıkış) çiftine çözülür:
+iki GPU'lu sistemlerde (dahili + harici) ikinci GPU'ya bağlı monitörler
+0 numaralı GPU'nun çıkış indeksleri değildir.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+# Bu kadar süre kullanılmayan kamera serbest bırakılır (saniye)
+IDLE_TIMEOUT = 300.0
+# Üst üste bu kadar hatadan sonra kamera yeniden oluşturulur
+MAX_FAILURES = 3
+# Oluşturulamayan kamera bu süre boyunca tekrar denenmez (saniye)
+CREATE_RETRY_AFTER = 30.0
+
+PoolKey = Tuple[int, int]  # (device_idx, output_idx)
+
+
+# DXGI çıkışı: (device_idx, output_idx, (genişlik, yükseklik) veya None, birincil mi)
+# - dxcam.output_info() çıktısından okunur (masaüstü konumu yoktur)
+DxgiOutput = Tuple[int, int, Optional[Tuple[int, int]], bool]
+
+
+def map_monitors_to_outputs(monitors: Sequence[dict], outputs: Sequence[DxgiOutput]) -> Dict[int, PoolKey]:
+    """
+    Monitör indekslerini (mss sırası, {"left", "top", "width", "height"}) DXGI
+    çıkışlarına eşle.
+
+    Birincil çıkış masaüstünün (0, 0) köşesindeki monitöre atanır. Diğer
+    çıkışlar GPU/çıkış sırasıyla, aynı çözünürlükteki ilk boş monitöre;
+    çözünürlüğü bilinmeyen veya eşi bulunmayan çıkışlar kalan monitörlere
+    sırayla atanır. Çıkışı olmayan monitör sonuçta yer almaz.
+    """
+    mapping: Dict[int, PoolKey] = {}
+    free = list(range(len(monitors)))
+
+    def assign(index: int, device: int, output: int):
+        mapping[index] = (device, output)
+        free.remove(index)
+
+    leftover = []
+    for device, output, size, primary in sorted(outputs, key=lambda o: not o[3]):
+        if primary:
+            origin = [i for i in free if (monitors[i]["left"], monitors[i]["top"]) == (0, 0)]
+            if origin:
+                assign(origin[0], device, output)
+                continue
+        same_size = [
+            i for i in free
+            if size is not None and (monitors[i].get("width"), monitors[i].get("height")) == tuple(size)
+        ]
+        if same_size:
+            assign(same_size[0], device, output)
+        else:
+            leftover.append((device, output))
+
+    for device, output in leftover:
+        if not free:
+            break
+        assign(free[0], device, output)
+    return mapping
+
+
+class SharedCamera:
+    """
+    Birden fazla thread'in (anlık yakalama, seri çekim, anlık tekrar) aynı
+    kamerayı kullanması için sarmalayıcı.
+
+    DXGI duplication aynı anda birden fazla thread'den çağrılamaz; tüm grab
+    çağrıları tek kilitle sıralanır. DXcam, ekran kimin yaptığı son grab'den
+    beri değişmediyse None döndürür; son kare saklanır ve grab() bu durumda
+    onu döndürür (ekranın güncel içeriği budur). Böylece bir thread'in grab'i
+    diğerinin karesini "değişmedi" yapıp MSS'e (tam ekranda siyah) düşürmez.
+    """
+
+    def __init__(self, camera):
+        self.camera = camera
+        self._lock = threading.Lock()
+        self._last = None
+
+    def grab_new(self):
+        """Yalnızca yeni kare; ekran değişmediyse None (anlık tekrar için)."""
+        with self._lock:
+            frame = self.camera.grab()
+            if frame is not None:
+                self._last = frame
+            return frame
+
+    def grab(self):
+        """Güncel kare: yeni kare ya da değişmediyse son kare (hiç yoksa None)."""
+        with self._lock:
+            frame = self.camera.grab()
+            if frame is None:
+                return self._last
+            self._last = frame
+            return frame
+
+    def release(self):
+        with self._lock:
+            self._last = None
+            self.camera.release()
+
+
+class _PoolEntry:
+    __slots__ = ("camera", "last_used", "failures", "grabs")
+
+    def __init__(self, camera, now: float):
+        self.camera = camera
+        self.last_used = now
+        self.failures = 0
+        self.grabs = 0
+
+
+class CameraPool:
+    """
+    (device_idx, output_idx) anahtarlı kamera havuzu; çağıranlar monitör
+    indeksiyle çalışır.
+
+    Args:
+        factory: factory(device_idx, output_idx) -> kamera (hata fırlatabilir)
+        release: release(kamera) - kamera kaynaklarını serbest bırak
+        resolve: resolve(monitör) -> (device_idx, output_idx) veya None (DXGI
+            çıkışı yok); varsayılan (0, monitör)
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[int, int], object],
+        release: Optional[Callable[[object], None]] = None,
+        resolve: Optional[Callable[[int], Optional[PoolKey]]] = None,
+        idle_timeout: float = IDLE_TIMEOUT,
+        max_failures: int = MAX_FAILURES,
+        retry_after: float = CREATE_RETRY_AFTER,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._factory = factory
+        self._release = release
+        self._resolve = resolve or (lambda monitor: (0, monitor))
+        self._idle_timeout = idle_timeout
+        self._max_failures = max_failures
+        self._retry_after = retry_after
+        self._clock = clock
+        self._entries: Dict[PoolKey, _PoolEntry] = {}
+        self._create_failed: Dict[PoolKey, float] = {}
+        self._lock = threading.RLock()
+
+        # İstatistikler
+        self.created = 0
+        self.evicted = 0
+        self.recreated = 0
+
+    def get(self, monitor: int):
+        """Monitörün kamerasını al; yoksa oluştur. Oluşturulamıyorsa None."""
+        key = self._resolve(monitor)
+        if key is None:
+            return None
+        device_idx, output_idx = key
+        now = self._clock()
+
+        with self._lock:
+            self._evict_idle(now, keep=key)
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.last_used = now
+                return entry.camera
+
+            failed_at = self._create_failed.get(key)
+            if failed_at is not None and now - failed_at < self._retry_after:
+                return None
+
+            try:
+                camera = self._factory(device_idx, output_idx)
+            except Exception as e:
+                print(f"[CameraPool] Kamera oluşturulamadı {key}: {e}")
+                camera = None
+
+            if camera is None:
+                self._create_failed[key] = now
+                return None
+
+            self._create_failed.pop(key, None)
+            self._entries[key] = _PoolEntry(camera, now)
+            self.created += 1
+            return camera
+
+    def report_success(self, monitor: int):
+        """Başarılı yakalamayı kaydet (hata sayacını sıfırlar)."""
+        with self._lock:
+            entry = self._entries.get(self._resolve(monitor))
+            if entry is not None:
+                entry.failures = 0
+                entry.grabs += 1
+
+    def report_failure(self, monitor: int):
+        """Başarısız yakalamayı kaydet; sınır aşılırsa kamera bırakılır."""
+        key = self._resolve(monitor)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.failures += 1
+            if entry.failures >= self._max_failures:
+                print(f"[CameraPool] Kamera sağlıksız {key}, yeniden oluşturulacak")
+                self._drop(key)
+                self.recreated += 1
+
+    def warm(self, monitors):
+        """Kameraları önceden oluştur (ör. arka plan thread'inde, monitör ayarı değişince)."""
+        for monitor in monitors:
+            self.get(monitor)
+
+    def evict_idle(self):
+        """Uzun süredir kullanılmayan kameraları bırak."""
+        with self._lock:
+            self._evict_idle(self._clock())
+
+    def _evict_idle(self, now: float, keep: Optional[PoolKey] = None):
+        idle = [key for key, entry in self._entries.items()
+                if key != keep and now - entry.last_used > self._idle_timeout]
+        for key in idle:
+            self._drop(key)
+            self.evicted += 1
+
+    def _drop(self, key: PoolKey):
+        entry = self._entries.pop(key, None)
+        if entry is not None and self._release is not None:
+            try:
+                self._release(entry.camera)
+            except Exception as e:
+                print(f"[CameraPool] Kamera bırakılamadı {key}: {e}")
+
+    def close_all(self):
+        """Tüm kameraları bırak (uygulama kapanırken)."""
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+            self._create_failed.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "cameras": {f"{d}:{o}": {"failures": e.failures, "grabs": e.grabs}
+                            for (d, o), e in self._entries.items()},
+                "created": self.created,
+                "evicted": self.evicted,
+                "recreated": self.recreated,
+            }
+
+
+if __name__ == "__main__":
+    # Test - sahte kamera fabrikası ile (Linux'ta çalışır)
+    class FakeCamera:
+        def __init__(self, device_idx: int, output_idx: int):
+            self.key = (device_idx, output_idx)
+            self.released = False
+
+    created = []
+    released = []
+    now = [0.0]
+
+    def factory(device_idx: int, output_idx: int):
+        if output_idx == 9:
+            raise RuntimeError("Çıkış yok")
+        camera = FakeCamera(device_idx, output_idx)
+        created.append(camera)
+        return camera
+
+    def release(camera):
+        camera.released = True
+        released.append(camera)
+
+    pool = CameraPool(factory, release, idle_timeout=60, max_failures=3,
+                      retry_after=10, clock=lambda: now[0])
+
+    # Monitör başına ayrı kamera, tekrar kullanımda yeniden oluşturma yok
+    cam0 = pool.get(0)
+    cam1 = pool.get(1)
+    assert cam0.key == (0, 0) and cam1.key == (0, 1)
+    for _ in range(100):
+        assert pool.get(0) is cam0 and pool.get(1) is cam1
+    assert len(created) == 2
+    print("✓ Monitör başına kamera, 200 çağrıda 2 oluşturma")
+
+    # Sağlık: üst üste hatalar kamerayı yeniler, başarı sayacı sıfırlar
+    pool.report_failure(0)
+    pool.report_success(0)
+    pool.report_failure(0)
+    pool.report_failure(0)
+    assert pool.get(0) is cam0
+    pool.report_failure(0)
+    assert cam0.released and pool.get(0) is not cam0
+    print("✓ Sağlıksız kamera yeniden oluşturuldu")
+
+    # Oluşturulamayan çıkış retry_after süresince tekrar denenmez
+    assert pool.get(9) is None and pool.get(9) is None
+    now[0] += 11
+    assert pool.get(9) is None
+    print("✓ Başarısız oluşturma geri çekilme ile tekrar denendi")
+
+    # Boşta kalan kamera bırakılır
+    now[0] += 61
+    pool.get(0)
+    assert cam1.released and pool.stats()["evicted"] >= 1
+    print(f"✓ Boşta kalan kamera bırakıldı: {pool.stats()}")
+
+    pool.close_all()
+    assert all(camera.released for camera in created)
+    print("✓ close_all tüm kameraları bıraktı")
+
+    # İki GPU: monitör 1 ikinci GPU'nun ilk çıkışında (birincil + çözünürlükle eşlenir)
+    monitors = [
+        {"left": 1920, "top": 0, "width": 2560, "height": 1440},
+        {"left": 0, "top": 0, "width": 1920, "height": 1080},
+        {"left": -1280, "top": 0, "width": 1280, "height": 1024},
+    ]
+    outputs = [(0, 0, (1920, 1080), True), (0, 1, (1280, 1024), False), (1, 0, (2560, 1440), False)]
+    mapping = map_monitors_to_outputs(monitors, outputs)
+    assert mapping == {0: (1, 0), 1: (0, 0), 2: (0, 1)}, mapping
+    # Çözünürlük bilinmiyorsa sırayla; fazla monitör eşlenmez
+    assert map_monitors_to_outputs(monitors, [(0, 0, None, False), (1, 0, None, False)]) == {0: (0, 0), 1: (1, 0)}
+    created.clear()
+    gpu_pool = CameraPool(factory, release, resolve=mapping.get)
+    assert gpu_pool.get(0).key == (1, 0) and gpu_pool.get(2).key == (0, 1)
+    assert gpu_pool.get(5) is None  # DXGI çıkışı olmayan monitör -> MSS'e düşülür
+    gpu_pool.report_success(5)
+    gpu_pool.report_failure(0)
+    assert gpu_pool.stats()["cameras"]["1:0"]["failures"] == 1
+    gpu_pool.close_all()
+    print("✓ Monitörler birincil/çözünürlükle doğru GPU/çıkış çiftine eşlendi")
+
+    # Paylaşılan kamera: DXcam gibi yalnızca değişen ekranda kare döndüren kaynak
+    class ChangeOnlyCamera:
+        def __init__(self):
+            self.screen = 0
+            self.seen = None
+            self.active = 0
+            self.overlap = False
+
+        def grab(self):
+            self.active += 1
+            self.overlap |= self.active > 1
+            time.sleep(0.0002)
+            self.active -= 1
+            if self.screen == self.seen:
+                return None
+            self.seen = self.screen
+            return self.screen
+
+        def release(self):
+            pass
+
+    camera = ChangeOnlyCamera()
+    shared = SharedCamera(camera)
+    camera.screen = 1
+    assert shared.grab_new() == 1      # Anlık tekrar karesi aldı
+    assert camera.grab() is None       # Ham kamera artık None verir...
+    assert shared.grab() == 1          # ...paylaşılan kamera güncel kareyi verir
+    assert shared.grab_new() is None   # Anlık tekrar için "değişmedi"
+
+    def replay_loop():
+        for _ in range(300):
+            shared.grab_new()
+
+    def capture_loop(results):
+        for _ in range(300):
+            results.append(shared.grab())
+
+    results = []
+    threads = [threading.Thread(target=replay_loop), threading.Thread(target=capture_loop, args=(results,))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not camera.overlap, "grab çağrıları üst üste bindi"
+    assert None not in results
+    print("✓ Paylaşılan kamera: grab'ler sıralandı, yakalama hiç boş kare almadı")
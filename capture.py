@@ -4,13 +4,30 @@ Hızlı ekran yakalama ve çoklu format desteği.
 DXcam ile tam ekran oyun desteği + MSS fallback.
 """
 
-import mss
+import os
+import re
+import threading
+import time
+from datetime import datetime
+import numpy as np
 from PIL import Image
 from pathlib import Path
-from typing import Optional, Tuple
-from config import load_config
-from detector import get_foreground_app
-from naming import get_screenshot_path
+from typing import Callable, Optional, Tuple
+from config import load_config, get_app_dir
+from foreground_tracker import foreground_tracker
+from process_cache import UNKNOWN_PROCESS
+from naming import get_screenshot_path, release_filepath, note_replaced
+from atomic_write import atomic_write, DEFAULT_FSYNC_POLICY
+from encoder import EncoderQueue, pil_save_args
+from burst import FrameRing, run_burst
+from replay import ReplayBuffer
+from mss_pool import get_mss, get_monitor_geometry
+from frame import Frame, as_image, detect_blank
+from backends import CaptureBackend, BackendRegistry, Scorecard, NoNewFrame, capture_with_backends
+from camera_pool import CameraPool, SharedCamera, map_monitors_to_outputs
+from png_writer import write_png, DEFAULT_PRESET
+from multimon import capture_monitors, capture_stitched, shutdown_executor
+from tracing import tracer
 
 # DXcam için (tam ekran DirectX oyunları)
 try:
@@ -20,132 +37,287 @@ except ImportError:
     DXCAM_AVAILABLE = False
     print("[Capture] DXcam yüklenemedi, sadece MSS kullanılacak")
 
-# Global dxcam instance (performans için)
-_dxcam_camera = None
+# Arka plan kodlayıcı (lazy başlatılır)
+ENCODER_WORKERS = 2
+ENCODER_MAX_PENDING = 4
+_encoder: Optional[EncoderQueue] = None
+
+# Seri çekim halkası (aynı çözünürlükte seriler arasında tekrar kullanılır)
+_burst_ring: Optional[FrameRing] = None
+# Seri bitince karelerin kodlayıcıya tesliminde dispatcher thread'inin toplam
+# bekleyebileceği süre (saniye); kalanlar arka plan thread'inde teslim edilir
+BURST_DRAIN_TIMEOUT = 2.0
+
+# Anlık tekrar tamponu (replay_enabled ise başlatılır)
+_replay_buffer: Optional[ReplayBuffer] = None
+
+
+def _create_dxcam_camera(device_idx: int, output_idx: int):
+    """Havuz için DXcam kamerası oluştur (yakalama, seri çekim ve anlık tekrar paylaşır)."""
+    return SharedCamera(dxcam.create(device_idx=device_idx, output_idx=output_idx, output_color="RGB"))
+
+
+def _release_dxcam_camera(camera):
+    """DXcam kamerasını bırak (DXGI duplication nesneleri serbest kalır)."""
+    camera.release()
+
+
+# dxcam.output_info() satırı: "Device[0] Output[1]: Res:(1920, 1080) Rot:0 Primary:True"
+_OUTPUT_INFO_RE = re.compile(
+    r"Device\[(\d+)\] Output\[(\d+)\]:(?:.*?Res:\((\d+), (\d+)\))?(?:.*?Primary:(\w+))?"
+)
+
+
+def _read_dxgi_outputs() -> list:
+    """
+    DXcam'in gördüğü çıkışlar: [(device_idx, output_idx, (genişlik, yükseklik) veya None, birincil)].
+    Yalnızca genel API (dxcam.output_info) kullanılır; DXcam sürümü değişince eşleme bozulmaz.
+    """
+    outputs = []
+    for match in _OUTPUT_INFO_RE.finditer(dxcam.output_info()):
+        device, output, width, height, primary = match.groups()
+        size = (int(width), int(height)) if width else None
+        outputs.append((int(device), int(output), size, primary == "True"))
+    return outputs
+
+
+# Monitör indeksi -> (GPU, çıkış); None = henüz okunmadı
+_dxgi_output_map = None
+
+
+def refresh_dxgi_outputs():
+    """Monitör -> DXGI çıkışı eşlemesini yeniden oku (monitör yapılandırması değişince)."""
+    global _dxgi_output_map
+    _dxgi_output_map = None
+
+
+def _resolve_dxgi_output(monitor: int):
+    """Monitör indeksinin (mss sırası) DXGI (GPU, çıkış) çifti; çıkış yoksa None."""
+    global _dxgi_output_map
+    mapping = _dxgi_output_map
+    if mapping is None:
+        try:
+            mapping = map_monitors_to_outputs(get_monitor_geometry(), _read_dxgi_outputs())
+        except Exception as e:
+            print(f"[Capture] DXGI çıkışları okunamadı, tek GPU varsayılıyor: {e}")
+            mapping = {}
+        _dxgi_output_map = mapping
+    if not mapping:
+        return (0, monitor)  # Eşleme yok: eski davranış (tek GPU)
+    return mapping.get(monitor)
+
+
+# Monitör başına DXcam kameraları (performans için, ilk kullanımda oluşturulur)
+dxcam_pool = CameraPool(_create_dxcam_camera, _release_dxcam_camera, resolve=_resolve_dxgi_output)
 
 
 def _get_dxcam_camera(monitor: int = 0):
-    """DXcam kamerasını al veya oluştur."""
-    global _dxcam_camera
-    
-    if not DXCAM_AVAILABLE:
-        return None
-    
-    try:
-        if _dxcam_camera is None:
-            # DXcam'i başlat
-            _dxcam_camera = dxcam.create(output_idx=monitor, output_color="RGB")
-        return _dxcam_camera
-    except Exception as e:
-        print(f"[Capture] DXcam başlatılamadı: {e}")
+    """Monitörün DXcam kamerasını havuzdan al."""
+    if not DXCAM_AVAILABLE or monitor < 0:
         return None
+    return dxcam_pool.get(monitor)
 
 
-def capture_screen_dxcam(monitor: int = 0) -> Optional[Image.Image]:
+def warm_dxcam_cameras(monitors=None):
     """
-    DXcam ile ekran yakala (DirectX tam ekran oyunları için).
+    Kameraları arka planda önceden oluştur (ilk yakalama DXGI kurulumunu beklemesin).
     
     Args:
-        monitor: Monitör indeksi (0 = birincil)
-    
-    Returns:
-        PIL Image veya None (başarısız olursa)
+        monitors: Monitör indeksleri (None = ayarlardaki monitör)
+    """
+    if not DXCAM_AVAILABLE:
+        return
+    # Monitör ayarı/yapılandırması değişmiş olabilir: eşleme ilk kullanımda yeniden okunur
+    refresh_dxgi_outputs()
+    if monitors is None:
+        monitors = [load_config().get("monitor", 0)]
+    outputs = [m for m in monitors if m >= 0]
+    if outputs:
+        threading.Thread(target=dxcam_pool.warm, args=(outputs,), name="DXcamWarm", daemon=True).start()
+
+
+def _grab_dxcam_frame(monitor: int) -> Optional[Frame]:
+    """
+    DXcam ile kare al. Kamera yoksa veya hata olursa None; kamera henüz hiç
+    kare almadıysa (ekran değişmedi) NoNewFrame fırlatır - bu hata sayılmaz.
     """
     try:
         camera = _get_dxcam_camera(monitor)
         if camera is None:
             return None
         
-        # Tek frame yakala
+        # Ekran değişmediyse son kare döner (anlık tekrar aynı kamerayı kullanabilir)
         frame = camera.grab()
         
         if frame is None:
-            # Bazen ilk grab None döner, tekrar dene
-            import time
+            # Kamera yeni oluşturulduysa ilk grab None dönebilir, tekrar dene
             time.sleep(0.05)
             frame = camera.grab()
-        
-        if frame is not None:
-            # numpy array'i PIL Image'a dönüştür
-            img = Image.fromarray(frame)
-            return img
-        
-        return None
     except Exception as e:
         print(f"[Capture] DXcam yakalama hatası: {e}")
+        # Üst üste hatalarda kamera havuzda yeniden oluşturulur
+        dxcam_pool.report_failure(monitor)
+        return None
+    
+    dxcam_pool.report_success(monitor)
+    if frame is None:
+        raise NoNewFrame()
+    # numpy array'i kopyalamadan sar (PIL dönüşümü kodlayıcıda)
+    return Frame.from_rgb(frame)
+
+
+def capture_screen_dxcam(monitor: int = 0) -> Optional[Frame]:
+    """
+    DXcam ile ekran yakala (DirectX tam ekran oyunları için).
+    
+    Args:
+        monitor: Monitör indeksi (0 = birincil)
+    
+    Returns:
+        RGB Frame veya None (başarısız olursa ya da henüz kare yoksa)
+    """
+    try:
+        return _grab_dxcam_frame(monitor)
+    except NoNewFrame:
         return None
 
 
-def capture_screen_mss(monitor: int = 0) -> Image.Image:
+def _mss_region(sct, monitor: int) -> dict:
+    """Monitör ayarını mss bölgesine çevir."""
+    if monitor == -1:
+        # Tüm monitörler
+        return sct.monitors[0]
+    # Belirli monitör (0 = birincil = monitors[1])
+    monitor_index = monitor + 1 if monitor >= 0 else 1
+    if monitor_index >= len(sct.monitors):
+        monitor_index = 1
+    return sct.monitors[monitor_index]
+
+
+def capture_screen_mss(monitor: int = 0) -> Frame:
     """
     MSS ile ekran yakala (geleneksel yöntem, fallback).
     
+    Ham BGRA tamponu kopyalanmadan Frame olarak döner; kanal dönüşümü
+    yalnızca kodlayıcı ihtiyaç duyduğunda yapılır.
+    
     Args:
         monitor: 0 = birincil monitör, -1 = tüm monitörler, 1+ = belirli monitör
     """
-    with mss.mss() as sct:
-        if monitor == -1:
-            # Tüm monitörleri yakala
-            screenshot = sct.grab(sct.monitors[0])
-        else:
-            # Belirli monitörü yakala (0 = birincil = monitors[1])
-            monitor_index = monitor + 1 if monitor >= 0 else 1
-            if monitor_index >= len(sct.monitors):
-                monitor_index = 1
-            screenshot = sct.grab(sct.monitors[monitor_index])
-        
-        # mss görüntüsünü PIL Image'a dönüştür
-        img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
-        return img
+    # Thread'e ait paylaşılan oturum - her yakalamada monitörler yeniden listelenmez
+    sct = get_mss()
+    screenshot = sct.grab(_mss_region(sct, monitor))
+    return Frame.from_mss(screenshot)
+
+
+class DXcamBackend(CaptureBackend):
+    """DXcam (DXGI Desktop Duplication) - tam ekran DirectX oyunları için."""
+    
+    name = "dxcam"
+    priority = 0
+    
+    def is_available(self) -> bool:
+        return DXCAM_AVAILABLE
+    
+    def supports(self, monitor: int) -> bool:
+        return monitor >= 0  # DXcam -1 (tüm monitörler) desteklemez
+    
+    def grab(self, monitor: int):
+        return _grab_dxcam_frame(monitor)
+    
+    def close(self):
+        dxcam_pool.close_all()
+
+
+class MSSBackend(CaptureBackend):
+    """MSS (GDI BitBlt) - geleneksel yöntem, her zaman kullanılabilir."""
+    
+    name = "mss"
+    priority = 1
+    
+    def grab(self, monitor: int):
+        return capture_screen_mss(monitor)
 
 
-def capture_screen(monitor: int = 0) -> Image.Image:
+# Backend kaydı ve uygulama bazlı karne
+backend_registry = BackendRegistry()
+backend_registry.register(DXcamBackend())
+backend_registry.register(MSSBackend())
+backend_scorecard = Scorecard(get_app_dir() / "capture_scores.json")
+
+
+def scorecard_key(app_info: dict) -> Optional[str]:
+    """
+    Ön plan bilgisinden karne anahtarı: exe dosya adı (yoksa işlem adı).
+    Kimliği bilinmeyen işlemler (masaüstü, erişim reddedilen korumalı oyunlar)
+    için None - hepsi tek bir "Unknown" karnesini paylaşıp birbirini etkilemesin.
     """
-    Ekranı yakala ve PIL Image olarak döndür.
-    Önce DXcam dener (tam ekran oyunlar için), başarısız olursa MSS kullanır.
+    name = app_info.get("process_name")
+    if not app_info.get("pid") or not name or name == UNKNOWN_PROCESS["name"]:
+        return None
+    exe_path = app_info.get("exe_path")
+    if exe_path:
+        return os.path.normcase(os.path.basename(exe_path))
+    return name
+
+
+def capture_screen(monitor: int = 0, app_key: Optional[str] = None) -> Frame:
+    """
+    Ekranı yakala ve Frame olarak döndür (PIL için frame.to_image()).
+    
+    Backend'ler uygulamanın karnesine göre sıralanır: bu uygulamada
+    çalıştığı bilinen en hızlı backend doğrudan kullanılır. Karne yoksa
+    önce DXcam (tam ekran oyunlar için), siyah/boş dönerse MSS denenir.
     
     Args:
         monitor: 0 = birincil monitör, -1 = tüm monitörler, 1+ = belirli monitör
+        app_key: Karne anahtarı (bkz. scorecard_key), None ise karne kullanılmaz
     """
-    # Önce DXcam dene (tam ekran oyunlar için daha iyi)
-    if DXCAM_AVAILABLE and monitor >= 0:  # DXcam -1 (tüm monitörler) desteklemez
-        img = capture_screen_dxcam(monitor)
-        if img is not None:
-            # Siyah ekran kontrolü - eğer tamamen siyahsa MSS'e geç
-            if not _is_black_image(img):
-                return img
-            else:
-                print("[Capture] DXcam siyah ekran döndü, MSS'e geçiliyor...")
-    
-    # Fallback: MSS kullan
-    return capture_screen_mss(monitor)
+    if monitor == -1:
+        return capture_all_monitors(app_key)
+    image, _ = capture_with_backends(
+        backend_registry, backend_scorecard, monitor, app_key, _blank_kind
+    )
+    return image
+
+
+def capture_all_monitors(app_key: Optional[str] = None) -> Frame:
+    """
+    Tüm monitörleri paralel yakala (her biri kendi backend'iyle) ve
+    monitör geometrisine göre tek kareye birleştir.
+    Hiçbir monitör yakalanamazsa eski tek parça MSS yakalamasına düşülür.
+    """
+    canvas = capture_stitched(lambda i: capture_screen(i, app_key), get_monitor_geometry())
+    if canvas is None:
+        return capture_screen_mss(-1)
+    return Frame.from_rgb(canvas)
 
 
-def _is_black_image(img: Image.Image, threshold: int = 10) -> bool:
+def capture_each_monitor(app_key: Optional[str] = None) -> list:
+    """Tüm monitörleri paralel yakala; monitör sırasında kareler (başarısızsa None)."""
+    count = len(get_monitor_geometry())
+    return capture_monitors(lambda i: capture_screen(i, app_key), range(count))
+
+
+def _blank_kind(img, threshold: int = 10) -> Optional[str]:
     """
-    Görüntünün tamamen siyah olup olmadığını kontrol et.
+    Görüntünün başarısız bir yakalama olup olmadığını kontrol et.
+    
+    Tüm kareyi küçültmek yerine ham tampondan seyrek bir ızgara okunur ve
+    normal bir piksel bulunur bulunmaz durulur (bkz. frame.detect_blank).
     
     Args:
-        img: PIL Image
+        img: Frame, numpy dizisi veya PIL Image
         threshold: Piksel değeri eşiği (altındaki değerler siyah sayılır)
     
     Returns:
-        True eğer görüntü tamamen siyahsa
+        "black" (tamamen siyah), "uniform" (tek renk: bayat gri DXcam karesi
+        veya gerçekten düz bir ekran) veya None
     """
     try:
-        # Küçük bir örnek al (performans için)
-        small = img.resize((100, 100))
-        
-        # Piksel verilerini al (Pillow 14+ uyumlu)
-        import numpy as np
-        pixels = np.array(small)
-        
-        # Ortalama parlaklık hesapla
-        avg = pixels[:, :, :3].mean()
-        
-        return avg < threshold
-    except:
-        return False
+        return detect_blank(img, threshold=threshold)
+    except Exception:
+        return None
 
 
 def save_screenshot(
@@ -158,50 +330,78 @@ def save_screenshot(
     Görüntüyü belirtilen formatta kaydet.
     
     Args:
-        image: PIL Image nesnesi
+        image: Frame, PIL Image veya RGB numpy dizisi (seri çekim tamponu)
         filepath: Kayıt yolu
         format: "png", "jpg", "bmp", "webp"
         quality: JPG/WEBP kalitesi (1-100)
     """
+    config = load_config()
+    fsync = config.get("fsync_policy", DEFAULT_FSYNC_POLICY)
     try:
-        # Format parametrelerini ayarla
-        save_kwargs = {}
+        # PNG: çok çekirdekli şerit yazıcı, kanal dönüşümü şerit başına yapılır
+        if format.lower() == "png":
+            try:
+                with atomic_write(filepath, fsync) as f:
+                    write_png(image, f, config.get("png_preset", DEFAULT_PRESET))
+                note_replaced(filepath)
+                return True
+            except Exception as e:
+                print(f"[Capture] Paralel PNG yazılamadı, Pillow kullanılıyor: {e}")
         
-        if format.lower() in ["jpg", "jpeg"]:
-            save_kwargs["quality"] = quality
-            save_kwargs["optimize"] = True
-            pil_format = "JPEG"
-        elif format.lower() == "webp":
-            save_kwargs["quality"] = quality
-            save_kwargs["method"] = 4  # Daha iyi sıkıştırma
-            pil_format = "WEBP"
-        elif format.lower() == "png":
-            save_kwargs["optimize"] = True
-            pil_format = "PNG"
-        elif format.lower() == "bmp":
-            pil_format = "BMP"
-        else:
-            pil_format = format.upper()
+        # Kanal dönüşümü burada, kodlayıcı thread'inde yapılır
+        image = as_image(image)
         
-        # Kaydet
-        image.save(filepath, format=pil_format, **save_kwargs)
+        # Format parametrelerini ayarla
+        pil_format, save_kwargs = pil_save_args(format, quality)
+        
+        # Geçici dosyaya kaydet, sonra atomik olarak son adına taşı
+        with atomic_write(filepath, fsync) as f:
+            image.save(f, format=pil_format, **save_kwargs)
+        note_replaced(filepath)
         return True
     except Exception as e:
         print(f"Kayıt hatası: {e}")
         return False
 
 
+def get_encoder() -> EncoderQueue:
+    """Arka plan kodlayıcıyı al veya oluştur."""
+    global _encoder
+    if _encoder is None:
+        _encoder = EncoderQueue(
+            save_screenshot,
+            workers=ENCODER_WORKERS,
+            max_pending=ENCODER_MAX_PENDING
+        )
+    return _encoder
+
+
+def shutdown_encoder(wait: bool = True):
+    """Kodlayıcıyı durdur (uygulama kapanırken bekleyen kayıtları tamamlar)."""
+    global _encoder
+    if _encoder is not None:
+        _encoder.shutdown(wait=wait)
+        _encoder = None
+
+
 def take_screenshot(
     format: str = None,
     quality: int = None,
     monitor: int = None,
-    save_path: Path = None
+    save_path: Path = None,
+    on_saved: Optional[Callable[[bool, Path], None]] = None
 ) -> Tuple[bool, Optional[Path], str]:
     """
     Tam ekran görüntüsü al ve kaydet.
     
+    Args:
+        on_saved: Verilirse kodlama arka planda yapılır; fonksiyon kare
+            bellekteyken döner ve dosya yazılınca on_saved(başarılı, yol)
+            çağrılır. Verilmezse kayıt senkron yapılır.
+    
     Returns:
-        (başarılı, dosya_yolu, uygulama_adı)
+        (başarılı, dosya_yolu, uygulama_adı) - asenkron modda "başarılı"
+        karenin yakalandığını belirtir
     """
     config = load_config()
     
@@ -215,16 +415,41 @@ def take_screenshot(
     if monitor is None:
         monitor = config.get("monitor", 0)
     
+    filepath = None
     try:
-        # Aktif uygulamayı algıla
-        app_info = get_foreground_app()
+        # Aktif uygulama (arka planda hazırlanan görüntü - algılama gecikmesi yok)
+        with tracer.span("foreground"):
+            app_info = foreground_tracker.snapshot()
         app_name = app_info["clean_name"]
+        app_key = scorecard_key(app_info)
         
-        # Dosya yolunu oluştur
+        # Tüm monitörler, ayrı dosyalar
+        if monitor == -1 and config.get("all_monitors_mode", "stitched") == "separate":
+            return _take_separate_screenshots(app_name, app_key, format, quality, save_path, on_saved)
+        
+        # Dosya yolunu oluştur (ad atomik olarak rezerve edilir)
         filepath = get_screenshot_path(app_name, format, save_path)
         
-        # Ekranı yakala (DXcam + MSS fallback)
-        image = capture_screen(monitor)
+        # Anlık tekrar açıksa geçmiş kareyi kullan, yoksa ekranı yakala (DXcam + MSS fallback)
+        with tracer.span("grab"):
+            image = _get_replay_frame(config)
+            if image is None:
+                image = capture_screen(monitor, app_key)
+        
+        # Asenkron mod: kareyi kodlayıcı kuyruğuna bırak ve hemen dön
+        if on_saved is not None:
+            def _on_encoded(saved: bool, path: Path):
+                if not saved:
+                    release_filepath(path)
+                on_saved(saved, path)
+            
+            if get_encoder().submit(image, filepath, format, quality, _on_encoded):
+                return True, filepath, app_name
+            # Kuyruk dolu kaldı - kareyi kaybetmemek için senkron kaydet
+            print("[Capture] Kodlayıcı kuyruğu dolu, senkron kaydediliyor...")
+            success = save_screenshot(image, filepath, format, quality)
+            _on_encoded(success, filepath)
+            return success, filepath if success else None, app_name
         
         # Kaydet
         success = save_screenshot(image, filepath, format, quality)
@@ -232,22 +457,287 @@ def take_screenshot(
         if success:
             return True, filepath, app_name
         else:
+            release_filepath(filepath)
             return False, None, app_name
             
     except Exception as e:
         print(f"Ekran görüntüsü hatası: {e}")
+        if filepath is not None:
+            release_filepath(filepath)
         return False, None, ""
 
 
+def _take_separate_screenshots(
+    app_name: str,
+    app_key: Optional[str],
+    format: str,
+    quality: int,
+    save_path: Path,
+    on_saved: Optional[Callable[[bool, Path], None]]
+) -> Tuple[bool, Optional[Path], str]:
+    """
+    Her monitörü paralel yakala ve ayrı dosyaya kaydet (ör. Oyun_M2_...png).
+    
+    Returns:
+        (en az biri başarılı, ilk dosya_yolu, uygulama_adı)
+    """
+    first_path = None
+    any_success = False
+    
+    for index, image in enumerate(capture_each_monitor(app_key)):
+        if image is None:
+            continue
+        filepath = get_screenshot_path(f"{app_name}_M{index + 1}", format, save_path)
+        
+        if on_saved is not None:
+            def _on_encoded(saved: bool, path: Path):
+                if not saved:
+                    release_filepath(path)
+                on_saved(saved, path)
+            
+            if get_encoder().submit(image, filepath, format, quality, _on_encoded):
+                success = True
+            else:
+                success = save_screenshot(image, filepath, format, quality)
+                _on_encoded(success, filepath)
+        else:
+            success = save_screenshot(image, filepath, format, quality)
+            if not success:
+                release_filepath(filepath)
+        
+        if success:
+            any_success = True
+            if first_path is None:
+                first_path = filepath
+    
+    return any_success, first_path, app_name
+
+
+def _get_burst_ring(shape: tuple, max_frames: int, max_bytes: int) -> FrameRing:
+    """Seri çekim halkasını al; çözünürlük veya bütçe değiştiyse yeniden oluştur."""
+    global _burst_ring
+    ring = _burst_ring
+    if ring is not None and ring.shape == shape:
+        wanted = max(1, min(max_frames, max_bytes // ring.frame_bytes))
+        # Bütçe aynıysa ya da önceki seri hâlâ kodlanıyorsa mevcut halkayı kullan
+        if ring.capacity == wanted or ring.free_slots() < ring.capacity:
+            return ring
+    ring = FrameRing(shape, max_frames, max_bytes)
+    _burst_ring = ring
+    return ring
+
+
+def take_burst(
+    is_held: Callable[[], bool],
+    on_saved: Optional[Callable[[bool, Path], None]] = None,
+    monitor: int = None
+) -> Tuple[int, str]:
+    """
+    Seri çekim: tuş basılı kaldığı sürece burst_fps hızında kare yakala.
+    
+    Kareler önceden ayrılmış halka tamponlarına yazılır, seri bitince
+    arka plan kodlayıcıya sırayla gönderilir.
+    
+    Returns:
+        (yakalanan_kare_sayısı, uygulama_adı)
+    """
+    config = load_config()
+    format = config.get("format", "png")
+    quality = config.get("quality", 95)
+    save_path = Path(config.get("save_path", Path.home() / "Pictures" / "GameCapture"))
+    if monitor is None:
+        monitor = config.get("monitor", 0)
+    fps = float(config.get("burst_fps", 10))
+    max_frames = int(config.get("burst_max_frames", 30))
+    max_bytes = int(config.get("burst_max_mb", 512)) * 1024 * 1024
+    
+    app_name = foreground_tracker.snapshot()["clean_name"]
+    camera = _get_dxcam_camera(monitor)
+    
+    sct = get_mss()
+    region = _mss_region(sct, monitor)
+    shape = (region["height"], region["width"], 3)
+    ring = _get_burst_ring(shape, max_frames, max_bytes)
+    
+    def fill(dst: np.ndarray) -> bool:
+        """
+        Kareyi halka tamponuna kopyala (yeni PIL Image yok). DXcam/MSS her grab'de
+        kendi geçici dizisini ayırır; yalnızca halka tarafı ayırmasızdır.
+        """
+        if camera is not None:
+            frame = camera.grab()
+            if frame is not None and frame.shape == dst.shape:
+                np.copyto(dst, frame)
+                return True
+        shot = sct.grab(region)
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        if bgra.shape[:2] != dst.shape[:2]:
+            return False
+        # BGRA -> RGB dönüşümü kopyalama sırasında tek geçişte
+        np.copyto(dst, bgra[:, :, 2::-1])
+        return True
+    
+    slots = run_burst(ring, fill, fps, is_held, max_frames)
+    
+    if ring.dropped:
+        print(f"[Burst] {ring.dropped} kare atlandı (tampon dolu)")
+    
+    encoder = get_encoder()
+    # Dosya adları teslim anından değil her karenin yakalama anından üretilir
+    # (ring.timestamp perf_counter saatidir, duvar saatine çevrilir)
+    wall_offset = time.time() - time.perf_counter()
+    jobs = [
+        (slot, get_screenshot_path(
+            app_name, format, save_path,
+            when=datetime.fromtimestamp(ring.timestamp(slot) + wall_offset)
+        ))
+        for slot in slots
+    ]
+    
+    def on_encoded_for(slot: int):
+        def _on_encoded(saved: bool, path: Path):
+            ring.release(slot)
+            if not saved:
+                release_filepath(path)
+            if on_saved is not None:
+                on_saved(saved, path)
+        return _on_encoded
+    
+    def submit(job, timeout: float = None) -> bool:
+        slot, filepath = job
+        return encoder.submit(ring.buffer(slot), filepath, format, quality, on_encoded_for(slot), timeout=timeout)
+    
+    def drain(pending: list):
+        """Kalan kareleri sırayla teslim et; kuyruk açılmazsa senkron kaydet."""
+        for job in pending:
+            if not submit(job):
+                slot, filepath = job
+                on_encoded_for(slot)(save_screenshot(ring.buffer(slot), filepath, format, quality), filepath)
+    
+    # Dispatcher thread'i tüm teslim için en fazla BURST_DRAIN_TIMEOUT bekler
+    deadline = time.monotonic() + BURST_DRAIN_TIMEOUT
+    submitted = 0
+    for job in jobs:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not submit(job, timeout=remaining):
+            break
+        submitted += 1
+    
+    pending = jobs[submitted:]
+    if pending:
+        print(f"[Burst] Kodlayıcı meşgul, {len(pending)} kare arka planda teslim edilecek")
+        threading.Thread(target=drain, args=(pending,), name="BurstDrain", daemon=True).start()
+    
+    return len(slots), app_name
+
+
+class _ReplaySource:
+    """
+    Anlık tekrar thread'inin kare kaynağı: DXcam, yoksa MSS.
+    DXcam kamerası anlık yakalama ve seri çekimle paylaşılır (SharedCamera:
+    grab'ler kilitle sıralanır, son kare saklanır).
+    MSS oturumu get_mss() ile yakalama thread'inin kendi oturumundan alınır.
+    """
+    
+    def __init__(self, monitor: int):
+        self.monitor = monitor
+    
+    def __call__(self, dst: np.ndarray) -> Optional[bool]:
+        camera = _get_dxcam_camera(self.monitor)
+        if camera is not None:
+            frame = camera.grab_new()
+            if frame is None:
+                return None  # DXcam: ekran değişmedi
+            if frame.shape == dst.shape:
+                np.copyto(dst, frame)
+                return True
+        
+        sct = get_mss()
+        shot = sct.grab(_mss_region(sct, self.monitor))
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        if bgra.shape[:2] != dst.shape[:2]:
+            return False
+        np.copyto(dst, bgra[:, :, 2::-1])
+        return True
+
+
+def _foreground_is_fullscreen() -> bool:
+    return foreground_tracker.snapshot().get("is_fullscreen", False)
+
+
+def start_replay_buffer() -> bool:
+    """Ayarlarda açıksa anlık tekrar tamponunu başlat."""
+    global _replay_buffer
+    
+    config = load_config()
+    if not config.get("replay_enabled", False):
+        return False
+    
+    monitor = config.get("monitor", 0)
+    if monitor < 0:
+        print("[Replay] Tüm monitörler modunda anlık tekrar desteklenmiyor")
+        return False
+    
+    stop_replay_buffer()
+    region = _mss_region(get_mss(), monitor)
+    
+    _replay_buffer = ReplayBuffer(
+        _ReplaySource(monitor),
+        (region["height"], region["width"], 3),
+        fps=float(config.get("replay_fps", 30)),
+        seconds=float(config.get("replay_seconds", 2)),
+        max_bytes=int(config.get("replay_max_mb", 256)) * 1024 * 1024,
+        downscale=int(config.get("replay_downscale", 1)),
+        should_run=_foreground_is_fullscreen
+    )
+    _replay_buffer.start()
+    print(f"[Replay] Başlatıldı: {_replay_buffer.capacity} kare, "
+          f"{_replay_buffer.nbytes / (1024 * 1024):.0f} MB")
+    return True
+
+
+def stop_replay_buffer():
+    """Anlık tekrar tamponunu durdur."""
+    global _replay_buffer
+    if _replay_buffer is not None:
+        _replay_buffer.stop()
+        _replay_buffer = None
+
+
+def get_replay_stats() -> Optional[dict]:
+    """Anlık tekrar istatistikleri (düşürülen kareler vb.), kapalıysa None."""
+    return _replay_buffer.stats() if _replay_buffer is not None else None
+
+
+def _get_replay_frame(config: dict) -> Optional[np.ndarray]:
+    """Ayara göre tampondan kare seç; tampon duraklatılmış veya boşsa None."""
+    buffer = _replay_buffer
+    if buffer is None or not buffer.is_running() or buffer.paused:
+        return None
+    
+    if config.get("replay_mode", "offset") == "best":
+        result = buffer.best_of(config.get("replay_window_ms", 1000))
+    else:
+        result = buffer.frame_at(config.get("replay_offset_ms", 300))
+    
+    if result is None:
+        return None
+    frame, age_ms = result
+    # Duraklatma öncesinden kalmış bayat kareyi kullanma
+    if age_ms > config.get("replay_seconds", 2) * 1000:
+        return None
+    return frame
+
+
+def save_backend_scores():
+    """Backend karnesini diske yaz (uygulama kapanırken çağır)."""
+    backend_scorecard.save()
+
+
 def cleanup_dxcam():
-    """DXcam kaynakları temizle (uygulama kapanırken çağır)."""
-    global _dxcam_camera
-    if _dxcam_camera is not None:
-        try:
-            del _dxcam_camera
-            _dxcam_camera = None
-        except:
-            pass
+    """DXcam kaynakları ve çoklu monitör thread'lerini temizle (uygulama kapanırken çağır)."""
+    shutdown_executor()
+    dxcam_pool.close_all()
 
 
 if __name__ == "__main__":
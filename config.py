@@ -6,7 +6,11 @@ Kullanıcı ayarlarını JSON dosyasından yükler ve kaydeder.
 import json
 import os
 import sys
+import threading
 from pathlib import Path
+from typing import Optional, Tuple
+
+from atomic_write import atomic_write
 
 
 def get_resource_dir() -> Path:
@@ -38,6 +42,8 @@ DEFAULT_CONFIG = {
     "hotkey": "F12",
     "format": "png",
     "quality": 95,
+    "png_preset": "balanced",  # PNG sıkıştırma: fast, balanced, smallest
+    "fsync_policy": "on-close",  # Diske yazma güvencesi: off, on-close, durable
     "save_path": str(Path.home() / "Pictures" / "BerksScreenshots"),
     "naming_pattern": "{app}_{date}_{time}",
     "show_notification": True,
@@ -45,7 +51,24 @@ DEFAULT_CONFIG = {
     "sound_file": "none",
     "dark_mode": True,
     "monitor": 0,  # 0 = birincil, -1 = tüm monitörler
-    "language": "tr"  # tr = Türkçe, en = English
+    "all_monitors_mode": "stitched",  # Tüm monitörler: stitched = tek resim, separate = monitör başına dosya
+    "language": "tr",  # tr = Türkçe, en = English
+    "hotkey_mode": "drop",  # Tuş tekrarı: drop = at, queue = sırala (cooldown ile)
+    "hotkey_cooldown_ms": 1000,  # İki çekim arasındaki en kısa süre
+    "hotkey_queue_size": 4,  # queue modunda bekleyebilecek en fazla basış
+    "burst_mode": False,  # Tuş basılı tutulunca seri çekim
+    "burst_fps": 10,  # Seri çekimde saniyedeki kare sayısı
+    "burst_max_frames": 30,  # Tek seride en fazla kare
+    "burst_max_mb": 512,  # Seri çekim tamponu bellek bütçesi (MB)
+    "replay_enabled": False,  # Anlık tekrar tamponu (geçmiş kareleri tut)
+    "replay_mode": "offset",  # offset = N ms önceki kare, best = en net kare
+    "replay_offset_ms": 300,  # offset modunda kaç ms önceki kare
+    "replay_window_ms": 1000,  # best modunda aranacak pencere
+    "replay_seconds": 2,  # Tamponda tutulacak süre
+    "replay_fps": 30,  # Arka plan yakalama hızı
+    "replay_max_mb": 256,  # Tampon bellek bütçesi (MB)
+    "replay_downscale": 1,  # 1 = ham kare, 2 = yarı çözünürlük
+    "tracing": False  # Aşama gecikmelerini kaydet (çıkışta trace.jsonl, bkz. --stats)
 }
 
 
@@ -59,8 +82,25 @@ CONFIG_FILE = CONFIG_DIR / "config.json"
 
 
 
-def load_config() -> dict:
-    """Ayarları dosyadan yükle, yoksa varsayılanları kullan."""
+# Bellek içi config önbelleği - dosya yalnızca mtime/boyut değişince yeniden okunur
+_cache_lock = threading.Lock()
+# Yazımları sıralar; disk yazımı/fsync sürerken load_config() beklemez
+_write_lock = threading.Lock()
+_cached_config: Optional[dict] = None
+_cached_stamp: Optional[Tuple[int, int]] = None
+
+
+def _config_stamp() -> Optional[Tuple[int, int]]:
+    """Config dosyasının (mtime_ns, boyut) damgasını al, dosya yoksa None."""
+    try:
+        st = os.stat(CONFIG_FILE)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def _read_config_file() -> dict:
+    """Ayarları diskten oku ve eksikleri varsayılanlarla doldur."""
     if CONFIG_FILE.exists():
         try:
             with open(CONFIG_FILE, "r", encoding="utf-8") as f:
@@ -75,16 +115,84 @@ def load_config() -> dict:
     return DEFAULT_CONFIG.copy()
 
 
+def load_config() -> dict:
+    """Ayarları yükle (önbellekli).
+    
+    Dosya yalnızca mtime veya boyutu değiştiyse yeniden parse edilir; aksi
+    halde tek bir stat çağrısı ile önbellekteki kopya döndürülür. Çağıran
+    taraf dönen sözlüğü değiştirebilir, önbellek etkilenmez.
+    """
+    global _cached_config, _cached_stamp
+    
+    stamp = _config_stamp()
+    with _cache_lock:
+        if _cached_config is None or stamp != _cached_stamp:
+            _cached_config = _read_config_file()
+            _cached_stamp = stamp
+        return dict(_cached_config)
+
+
+def invalidate_config_cache():
+    """Önbelleği boşalt - bir sonraki load_config() dosyayı yeniden okur."""
+    global _cached_config, _cached_stamp
+    with _cache_lock:
+        _cached_config = None
+        _cached_stamp = None
+
+
 def save_config(config: dict) -> bool:
     """Ayarları dosyaya kaydet."""
+    global _cached_config, _cached_stamp
     try:
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=4, ensure_ascii=False)
+        with _write_lock:
+            # Atomik yazım: izleyici (config_watcher) yarım dosya görmez
+            data = json.dumps(config, indent=4, ensure_ascii=False).encode("utf-8")
+            with atomic_write(CONFIG_FILE, "on-close") as f:
+                f.write(data)
+            
+            # Yazılan içeriği önbelleğe al (tekrar parse etmeye gerek yok);
+            # önbellek kilidi yalnızca değiş tokuş için alınır
+            cached = dict(config)
+            for key, value in DEFAULT_CONFIG.items():
+                cached.setdefault(key, value)
+            stamp = _config_stamp()
+            with _cache_lock:
+                _cached_config = cached
+                _cached_stamp = stamp
         return True
     except IOError:
+        invalidate_config_cache()
         return False
 
 
+def reload_config() -> Optional[dict]:
+    """
+    Ayar dosyasını zorla yeniden oku (config_watcher için).
+    
+    load_config()'dan farklı olarak bozuk/yarım yazılmış dosyada varsayılanlara
+    dönmez: None döndürür ve önbellek değişmez.
+    """
+    global _cached_config, _cached_stamp
+    
+    stamp = _config_stamp()
+    try:
+        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        if not isinstance(config, dict):
+            return None
+    except FileNotFoundError:
+        config = {}
+    except (json.JSONDecodeError, UnicodeDecodeError, IOError):
+        return None
+    
+    for key, value in DEFAULT_CONFIG.items():
+        config.setdefault(key, value)
+    with _cache_lock:
+        _cached_config = config
+        _cached_stamp = stamp
+        return dict(config)
+
+
 def get_save_path() -> Path:
     """Ekran görüntüsü kayıt klasörünü al ve oluştur."""
     config = load_config()
@@ -100,5 +208,51 @@ def update_config(key: str, value) -> bool:
     return save_config(config)
 
 
-# Modül yüklendiğinde kayıt klasörünü oluştur
-get_save_path()
+if __name__ == "__main__":
+    # Mikro benchmark - önbelleksiz parse vs önbellekli yükleme
+    # Kullanıcının gerçek config.json'u yerine geçici dosya kullanılır
+    import shutil
+    import tempfile
+    import time
+    
+    _bench_dir = Path(tempfile.mkdtemp(prefix="bst_config_"))
+    CONFIG_FILE = _bench_dir / "config.json"
+    
+    def _calls_per_second(func, duration: float = 1.0) -> float:
+        calls = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            for _ in range(100):
+                func()
+            calls += 100
+        return calls / (time.perf_counter() - start)
+    
+    save_config(DEFAULT_CONFIG.copy())
+    
+    before = _calls_per_second(_read_config_file)
+    after = _calls_per_second(load_config)
+    print(f"Config dosyası: {CONFIG_FILE}")
+    print(f"  Önbelleksiz (open + json.load): {before:>12,.0f} çağrı/sn")
+    print(f"  Önbellekli  (stat + dict kopya): {after:>12,.0f} çağrı/sn")
+    print(f"  Hızlanma: {after / before:.1f}x")
+    
+    # Yavaş disk: kayıt fsync'te beklerken load_config() önbellekten dönmeli
+    _real_fsync = os.fsync
+    
+    def _slow_fsync(fd):
+        time.sleep(0.3)
+        _real_fsync(fd)
+    
+    os.fsync = _slow_fsync
+    writer = threading.Thread(target=save_config, args=(DEFAULT_CONFIG.copy(),))
+    writer.start()
+    time.sleep(0.05)
+    start = time.perf_counter()
+    load_config()
+    blocked_ms = (time.perf_counter() - start) * 1000
+    writer.join()
+    os.fsync = _real_fsync
+    assert blocked_ms < 50, f"load_config kayıt sırasında {blocked_ms:.0f} ms bekledi"
+    print(f"  Kayıt fsync'i sürerken load_config: {blocked_ms:.2f} ms")
+    
+    shutil.rmtree(_bench_dir, ignore_errors=True)
@@ -0,0 +1,363 @@
+"""
+GameCapture - Ayar Dosyası İzleyici
+config.json değişince (ayarlar penceresi veya elle düzenleme) ana süreçteki
+abonelere türlü değişiklik olayları yayınlar: hotkey, language, format,
+monitor (ve diğer anahtarlar için other).
+
+Windows'ta klasör değişiklik bildirimi (FindFirstChangeNotification)
+beklenir; boştayken hiçbir şey çalışmaz. Bildirim yoksa düşük maliyetli
+stat yoklamasına düşülür. Her uyanışta tek bir stat ile dosyanın gerçekten
+değişip değişmediğine bakılır.
+"""
+
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from config import CONFIG_FILE, load_config, reload_config, _config_stamp
+
+# Olay türleri ve onları tetikleyen ayar anahtarları
+EVENT_KINDS = ("hotkey", "language", "format", "monitor", "other")
+_KEY_KINDS = {
+    "hotkey": "hotkey",
+    "language": "language",
+    "format": "format",
+    "quality": "format",
+    "png_preset": "format",
+    "monitor": "monitor",
+    "all_monitors_mode": "monitor",
+}
+
+# Stat yoklaması aralığı (bildirim kullanılamıyorsa, saniye)
+POLL_INTERVAL = 1.0
+# Bildirimden sonra okumadan önce bekleme (editörler art arda yazabilir)
+DEBOUNCE = 0.1
+
+
+class ConfigChange:
+    """Tek bir ayar değişikliği olayı."""
+
+    __slots__ = ("kind", "key", "old", "new", "config")
+
+    def __init__(self, kind: str, key: str, old, new, config: dict):
+        self.kind = kind
+        self.key = key
+        self.old = old
+        self.new = new
+        self.config = config  # Değişiklik sonrası tam ayarlar
+
+    def __repr__(self) -> str:
+        return f"ConfigChange({self.kind}: {self.key} {self.old!r} -> {self.new!r})"
+
+
+class PollingSource:
+    """Yedek olay kaynağı: sabit aralıkla uyanır."""
+
+    def __init__(self, interval: float = POLL_INTERVAL):
+        self.interval = interval
+        self._stop = threading.Event()
+
+    def wait(self) -> bool:
+        """Değişiklik olabilir -> True, kapatıldı -> False."""
+        return not self._stop.wait(self.interval)
+
+    def close(self):
+        self._stop.set()
+
+    def release(self):
+        pass
+
+
+class WindowsChangeSource:
+    """Klasör değişiklik bildirimi (FindFirstChangeNotificationW)."""
+
+    FILE_NOTIFY_CHANGE_FILE_NAME = 0x01
+    FILE_NOTIFY_CHANGE_SIZE = 0x08
+    FILE_NOTIFY_CHANGE_LAST_WRITE = 0x10
+    INFINITE = 0xFFFFFFFF
+    WAIT_OBJECT_0 = 0
+
+    def __init__(self, directory: Path):
+        import ctypes
+        from ctypes import wintypes
+
+        self._ctypes = ctypes
+        self._k32 = ctypes.windll.kernel32
+        self._k32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+        self._k32.FindFirstChangeNotificationW.argtypes = [wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD]
+        self._k32.CreateEventW.restype = wintypes.HANDLE
+        self._k32.WaitForMultipleObjects.argtypes = [
+            wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE), wintypes.BOOL, wintypes.DWORD
+        ]
+        self._k32.FindNextChangeNotification.argtypes = [wintypes.HANDLE]
+        self._k32.FindCloseChangeNotification.argtypes = [wintypes.HANDLE]
+        self._k32.SetEvent.argtypes = [wintypes.HANDLE]
+        self._k32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+        flags = self.FILE_NOTIFY_CHANGE_FILE_NAME | self.FILE_NOTIFY_CHANGE_SIZE | self.FILE_NOTIFY_CHANGE_LAST_WRITE
+        change = self._k32.FindFirstChangeNotificationW(str(directory), False, flags)
+        if not change or change == wintypes.HANDLE(-1).value:
+            raise ctypes.WinError()
+        self._change = change
+        self._stop = self._k32.CreateEventW(None, True, False, None)
+        self._handles = (wintypes.HANDLE * 2)(self._change, self._stop)
+
+    def wait(self) -> bool:
+        result = self._k32.WaitForMultipleObjects(2, self._handles, False, self.INFINITE)
+        if result != self.WAIT_OBJECT_0:
+            return False
+        self._k32.FindNextChangeNotification(self._change)
+        return True
+
+    def close(self):
+        self._k32.SetEvent(self._stop)
+
+    def release(self):
+        """Tanıtıcıları kapat (izleyici thread'i bittikten sonra)."""
+        self._k32.FindCloseChangeNotification(self._change)
+        self._k32.CloseHandle(self._stop)
+
+
+def default_source(directory: Path):
+    """Windows'ta bildirim kaynağı, yoksa stat yoklaması."""
+    if sys.platform == "win32":
+        try:
+            return WindowsChangeSource(directory)
+        except Exception as e:
+            print(f"[ConfigWatcher] Klasör bildirimi kullanılamıyor, yoklamaya geçiliyor: {e}")
+    return PollingSource()
+
+
+class ConfigWatcher:
+    """
+    Ayar dosyası izleyici.
+
+    Args:
+        source_factory: source_factory() -> wait()/close()/release() olan olay kaynağı
+        reload: Dosyayı zorla oku; bozuksa None (varsayılan config.reload_config)
+        stamp: Dosya damgası (varsayılan config._config_stamp)
+    """
+
+    def __init__(
+        self,
+        source_factory: Optional[Callable[[], object]] = None,
+        reload: Callable[[], Optional[dict]] = reload_config,
+        stamp: Callable[[], object] = _config_stamp,
+        debounce: float = DEBOUNCE
+    ):
+        self._source_factory = source_factory or (lambda: default_source(CONFIG_FILE.parent))
+        self._reload = reload
+        self._stamp = stamp
+        self._debounce = debounce
+        self._subscribers: Dict[str, List[Callable[[ConfigChange], None]]] = {}
+        self._lock = threading.Lock()
+        self._source = None
+        self._thread = None
+        self._stopping = threading.Event()
+        self._snapshot: Optional[dict] = None
+        self._last_stamp = None
+
+        # İstatistikler
+        self.wakeups = 0
+        self.reloads = 0
+        self.events = 0
+
+    def subscribe(self, kind: str, callback: Callable[[ConfigChange], None]):
+        """Olay türüne abone ol ("*" = tüm değişiklikler)."""
+        if kind != "*" and kind not in EVENT_KINDS:
+            raise ValueError(f"Bilinmeyen olay türü: {kind}")
+        with self._lock:
+            self._subscribers.setdefault(kind, []).append(callback)
+
+    def unsubscribe(self, kind: str, callback: Callable[[ConfigChange], None]):
+        with self._lock:
+            callbacks = self._subscribers.get(kind, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def start(self, initial: Optional[dict] = None):
+        """İzlemeyi başlat. initial: karşılaştırma için başlangıç ayarları."""
+        if self._thread is not None:
+            return
+        self._snapshot = dict(initial) if initial is not None else load_config()
+        self._last_stamp = self._stamp()
+        self._stopping.clear()
+        self._source = self._source_factory()
+        self._thread = threading.Thread(target=self._run, name="ConfigWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """İzlemeyi durdur."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping.set()
+        self._source.close()
+        thread.join(timeout=timeout)
+        if not thread.is_alive():
+            self._source.release()
+        self._thread = None
+
+    def _run(self):
+        while self._source.wait():
+            self.wakeups += 1
+            # Art arda yazımları tek okumada topla
+            if self._stopping.wait(self._debounce):
+                break
+            self.check()
+
+    def check(self) -> List[ConfigChange]:
+        """Dosya değiştiyse yeniden oku ve olayları yayınla."""
+        stamp = self._stamp()
+        if stamp == self._last_stamp:
+            return []
+
+        config = self._reload()
+        if config is None:
+            # Yarım yazılmış / bozuk dosya - sonraki bildirimde tekrar denenir
+            return []
+        self._last_stamp = stamp
+        self.reloads += 1
+
+        old = self._snapshot or {}
+        self._snapshot = config
+        changes = [
+            ConfigChange(_KEY_KINDS.get(key, "other"), key, old.get(key), config.get(key), config)
+            for key in sorted(set(old) | set(config))
+            if old.get(key) != config.get(key)
+        ]
+        for change in changes:
+            self._publish(change)
+        return changes
+
+    def _publish(self, change: ConfigChange):
+        self.events += 1
+        with self._lock:
+            # "*" aboneleri önce: türe özel aboneler güncel ayarları görür
+            callbacks = list(self._subscribers.get("*", [])) + list(self._subscribers.get(change.kind, []))
+        for callback in callbacks:
+            try:
+                callback(change)
+            except Exception as e:
+                print(f"[ConfigWatcher] Abone hatası ({change.kind}): {e}")
+
+
+# Global instance
+config_watcher = ConfigWatcher()
+
+
+if __name__ == "__main__":
+    # Test - geçici ayar dosyası ve enjekte edilen olay kaynağı
+    import json
+    import os
+    import queue
+    import tempfile
+    import time
+
+    from config import DEFAULT_CONFIG
+
+    folder = Path(tempfile.mkdtemp(prefix="bst_watch_"))
+    path = folder / "config.json"
+
+    def write(config: dict):
+        path.write_text(json.dumps(config), encoding="utf-8")
+
+    def stamp():
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def reload():
+        try:
+            config = json.loads(path.read_text(encoding="utf-8"))
+        except (ValueError, OSError):
+            return None
+        return {**DEFAULT_CONFIG, **config}
+
+    class ManualSource:
+        """Test olay kaynağı: bildirimler elle tetiklenir."""
+
+        def __init__(self):
+            self._events = queue.Queue()
+
+        def notify(self):
+            self._events.put(True)
+
+        def wait(self) -> bool:
+            return self._events.get()
+
+        def close(self):
+            self._events.put(False)
+
+        def release(self):
+            pass
+
+    source = ManualSource()
+    received = []
+    got = threading.Event()
+
+    def on_event(change: ConfigChange):
+        received.append(change)
+        got.set()
+
+    write(dict(DEFAULT_CONFIG))
+    watcher = ConfigWatcher(lambda: source, reload=reload, stamp=stamp, debounce=0.01)
+    for kind in ("hotkey", "language", "format", "monitor"):
+        watcher.subscribe(kind, on_event)
+    watcher.start(initial=reload())
+
+    def expect(update: dict, kinds: list, label: str):
+        received.clear()
+        got.clear()
+        write({**DEFAULT_CONFIG, **update})
+        start = time.perf_counter()
+        source.notify()
+        if kinds:
+            assert got.wait(1.0), label
+            time.sleep(0.05)
+        else:
+            time.sleep(0.1)
+        assert sorted(c.kind for c in received) == sorted(kinds), (label, received)
+        print(f"✓ {label}: {received} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    expect({"hotkey": "F10"}, ["hotkey"], "Kısayol değişti")
+    expect({"hotkey": "F10", "language": "en", "quality": 80}, ["language", "format"], "Dil + kalite")
+    expect({"hotkey": "F10", "language": "en", "quality": 80, "monitor": 1}, ["monitor"], "Monitör")
+
+    # Başka dosyanın değişmesi (aynı klasör) olay üretmez
+    received.clear()
+    (folder / "capture_scores.json").write_text("{}")
+    source.notify()
+    time.sleep(0.1)
+    assert not received
+    print("✓ Klasördeki başka dosya olay üretmedi")
+
+    # Yarım yazılmış dosya yok sayılır, tamamlanınca olay gelir
+    received.clear()
+    path.write_text('{"hotkey": "F9", "langu', encoding="utf-8")
+    source.notify()
+    time.sleep(0.1)
+    assert not received
+    expect({"hotkey": "F9", "language": "en", "quality": 80, "monitor": 1}, ["hotkey"], "Yarım yazım sonrası")
+
+    watcher.stop()
+    print(f"İstatistik: {watcher.wakeups} uyanış, {watcher.reloads} okuma, {watcher.events} olay")
+
+    # Yoklama kaynağı ile uçtan uca
+    polled = ConfigWatcher(lambda: PollingSource(0.05), reload=reload, stamp=stamp, debounce=0.01)
+    polled.subscribe("hotkey", on_event)
+    polled.start(initial=reload())
+    received.clear()
+    got.clear()
+    time.sleep(0.02)
+    write({**DEFAULT_CONFIG, "hotkey": "F8"})
+    assert got.wait(1.0) and received[0].new == "F8"
+    polled.stop()
+    print("✓ Yoklama kaynağı değişikliği yakaladı")
+
+    for leftover in folder.iterdir():
+        leftover.unlink()
+    folder.rmdir()
@@ -10,10 +10,24 @@ import win32process
 import win32api
 import win32con
 import psutil
-from pathlib import Path
+
+from process_cache import ProcessCache, ProcessGone, ProcessAccessDenied
+from tracing import tracer
 
 # Windows API sabitleri
 user32 = ctypes.windll.user32
+kernel32 = ctypes.windll.kernel32
+
+SYNCHRONIZE = 0x00100000
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+WAIT_TIMEOUT = 0x102
+
+kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+kernel32.OpenProcess.restype = wintypes.HANDLE
+kernel32.WaitForSingleObject.argtypes = (wintypes.HANDLE, wintypes.DWORD)
+kernel32.WaitForSingleObject.restype = wintypes.DWORD
+kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+kernel32.CloseHandle.restype = wintypes.BOOL
 
 
 def get_foreground_window_handle() -> int:
@@ -30,21 +44,8 @@ def get_window_title(hwnd: int) -> str:
 
 
 def get_process_from_window(hwnd: int) -> dict:
-    """Pencereden işlem bilgilerini al."""
-    try:
-        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-        process = psutil.Process(pid)
-        return {
-            "pid": pid,
-            "name": process.name(),
-            "exe": process.exe()
-        }
-    except (psutil.NoSuchProcess, psutil.AccessDenied, Exception):
-        return {
-            "pid": 0,
-            "name": "Unknown",
-            "exe": ""
-        }
+    """Pencereden işlem bilgilerini al (PID önbelleği ile)."""
+    return process_cache.process_info(hwnd)
 
 
 def get_monitor_info(hwnd: int) -> dict:
@@ -72,24 +73,70 @@ def is_fullscreen(hwnd: int = None) -> bool:
     if not hwnd:
         return False
     
-    try:
-        # Pencere boyutlarını al
-        rect = win32gui.GetWindowRect(hwnd)
-        window_width = rect[2] - rect[0]
-        window_height = rect[3] - rect[1]
-        
-        # Monitör boyutlarını al
-        monitor_info = get_monitor_info(hwnd)
-        monitor_rect = monitor_info["monitor_area"]
-        monitor_width = monitor_rect[2] - monitor_rect[0]
-        monitor_height = monitor_rect[3] - monitor_rect[1]
-        
-        # Pencere monitörü tamamen kaplıyor mu?
-        is_full = (window_width >= monitor_width and window_height >= monitor_height)
-        
-        return is_full
-    except:
+    geometry = process_cache.geometry(hwnd)
+    if geometry is None:
         return False
+    
+    # Pencere boyutları
+    rect = geometry["window_rect"]
+    window_width = rect[2] - rect[0]
+    window_height = rect[3] - rect[1]
+    
+    # Monitör boyutları
+    monitor_rect = geometry["monitor_area"]
+    monitor_width = monitor_rect[2] - monitor_rect[0]
+    monitor_height = monitor_rect[3] - monitor_rect[1]
+    
+    # Pencere monitörü tamamen kaplıyor mu?
+    return window_width >= monitor_width and window_height >= monitor_height
+
+
+class Win32ProcessProvider:
+    """process_cache için Windows/psutil sorguları."""
+    
+    def window_pid(self, hwnd: int) -> int:
+        return win32process.GetWindowThreadProcessId(hwnd)[1]
+    
+    def create_time(self, pid: int) -> float:
+        try:
+            return psutil.Process(pid).create_time()
+        except psutil.NoSuchProcess:
+            raise ProcessGone(pid)
+        except psutil.AccessDenied:
+            raise ProcessAccessDenied(pid)
+    
+    def open_process(self, pid: int):
+        """Yalnızca bekleme hakkıyla handle aç (korumalı işlemlerde genelde izinli); olmazsa None."""
+        handle = kernel32.OpenProcess(SYNCHRONIZE | PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            handle = kernel32.OpenProcess(SYNCHRONIZE, False, pid)
+        return handle or None
+    
+    def process_exited(self, handle) -> bool:
+        # 0 ms bekleme: yeni handle açmaz; WAIT_FAILED da çıkmış sayılır
+        return kernel32.WaitForSingleObject(handle, 0) != WAIT_TIMEOUT
+    
+    def close_process(self, handle):
+        kernel32.CloseHandle(handle)
+    
+    def process_details(self, pid: int) -> tuple:
+        try:
+            process = psutil.Process(pid)
+            return process.name(), process.exe()
+        except psutil.NoSuchProcess:
+            raise ProcessGone(pid)
+        except psutil.AccessDenied:
+            raise ProcessAccessDenied(pid)
+    
+    def window_rect(self, hwnd: int) -> tuple:
+        return win32gui.GetWindowRect(hwnd)
+    
+    def monitor_info(self, hwnd: int) -> dict:
+        return get_monitor_info(hwnd)
+
+
+# Global instance
+process_cache = ProcessCache(Win32ProcessProvider())
 
 
 def clean_app_name(process_name: str, window_title: str) -> str:
@@ -118,6 +165,11 @@ def clean_app_name(process_name: str, window_title: str) -> str:
 
 def get_foreground_app() -> dict:
     """Aktif uygulamanın tüm bilgilerini al."""
+    with tracer.span("detect"):
+        return _detect_foreground_app()
+
+
+def _detect_foreground_app() -> dict:
     hwnd = get_foreground_window_handle()
     
     if not hwnd:
@@ -126,12 +178,16 @@ def get_foreground_app() -> dict:
             "window_title": "Desktop",
             "clean_name": "Desktop",
             "is_fullscreen": False,
-            "hwnd": 0
+            "hwnd": 0,
+            "pid": 0,
+            "exe_path": "",
+            "monitor_area": None
         }
     
     window_title = get_window_title(hwnd)
     process_info = get_process_from_window(hwnd)
     fullscreen = is_fullscreen(hwnd)
+    geometry = process_cache.geometry(hwnd)
     clean_name = clean_app_name(process_info["name"], window_title)
     
     return {
@@ -141,13 +197,35 @@ def get_foreground_app() -> dict:
         "is_fullscreen": fullscreen,
         "hwnd": hwnd,
         "pid": process_info["pid"],
-        "exe_path": process_info["exe"]
+        "exe_path": process_info["exe"],
+        "monitor_area": geometry["monitor_area"] if geometry else None
     }
 
 
 if __name__ == "__main__":
-    # Test
+    import sys
     import time
+    
+    if "--bench" in sys.argv:
+        # Benchmark - gerçek sağlayıcıyla sıcak önbellek maliyeti (ön plan penceresi)
+        hwnd = get_foreground_window_handle()
+        pid = process_cache._provider.window_pid(hwnd)
+        N = 10_000
+        process_cache.process_info(hwnd)
+        start = time.perf_counter()
+        for _ in range(N):
+            process_cache.process_info(hwnd)
+        cached_us = (time.perf_counter() - start) / N * 1e6
+        start = time.perf_counter()
+        for _ in range(N // 10):
+            psutil.Process(pid).create_time()
+        create_us = (time.perf_counter() - start) / (N // 10) * 1e6
+        print(f"  Önbellek isabeti (handle):          {cached_us:8.1f} µs")
+        print(f"  psutil create_time (eski isabet):   {create_us:8.1f} µs")
+        print(f"  {process_cache.stats()}")
+        sys.exit(0)
+    
+    # Test
     print("5 saniye içinde bir pencereye tıklayın...")
     time.sleep(5)
     info = get_foreground_app()
@@ -0,0 +1,313 @@
+"""
+GameCapture - Kısayol Eylem Dağıtıcısı
+Kısayol basışlarını tek bir uzun ömürlü yakalama thread'ine iletir. Her
+basış için yeni thread açılmaz; tuş tekrarı fırtınaları sınırlı bir kuyrukta
+birleştirilir (coalesce).
+
+Modlar:
+    drop   - Eylem sürerken veya cooldown dolmadan gelen basışlar atılır
+    queue  - Basışlar sınırlı kuyrukta sıralanır, aralarında cooldown beklenir;
+             kuyruk doluysa yenileri atılır
+    burst  - Seri çekim: eylem sürerken gelen basışlar (tuş tekrarı) çalışan
+             seriye katılır, cooldown uygulanmaz
+
+Cooldown hesabı yalnızca işçi thread'inde yapılır (tek yazan), bu yüzden
+basışlar arasında yarış olmaz.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from tracing import tracer
+
+MODES = ("drop", "queue", "burst")
+DEFAULT_MODE = "drop"
+DEFAULT_COOLDOWN = 1.0  # saniye
+DEFAULT_QUEUE_SIZE = 4
+
+
+class Dispatcher:
+    """
+    Tek işçili eylem dağıtıcısı.
+
+    Args:
+        action: Her kabul edilen basışta işçi thread'inde çağrılır
+        mode: "drop", "queue" veya "burst"
+        cooldown: İki eylem başlangıcı arasındaki en kısa süre (saniye)
+        queue_size: queue modunda bekleyebilecek en fazla basış
+    """
+
+    def __init__(
+        self,
+        action: Optional[Callable[[], None]] = None,
+        mode: str = DEFAULT_MODE,
+        cooldown: float = DEFAULT_COOLDOWN,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._action = action
+        self._clock = clock
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self.configure(mode, cooldown, queue_size)
+
+        # Yalnızca işçi thread'i yazar
+        self._last_start = float("-inf")
+        self._last_end = float("-inf")
+
+        # Sayaçlar
+        self.received = 0
+        self.coalesced = 0
+        self.executed = 0
+        self.failed = 0
+
+    def set_action(self, action: Callable[[], None]):
+        self._action = action
+
+    def configure(self, mode: str = DEFAULT_MODE, cooldown: float = DEFAULT_COOLDOWN,
+                  queue_size: int = DEFAULT_QUEUE_SIZE):
+        """Modu değiştir (çalışırken çağrılabilir)."""
+        if mode not in MODES:
+            print(f"[Dispatch] Bilinmeyen mod '{mode}', '{DEFAULT_MODE}' kullanılıyor")
+            mode = DEFAULT_MODE
+        with self._cond:
+            self.mode = mode
+            self.cooldown = 0.0 if mode == "burst" else max(0.0, float(cooldown))
+            self._limit = max(1, int(queue_size)) if mode == "queue" else 1
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        """
+        İşçi thread'ini başlat. stop() zaman aşımına uğradıysa eski işçi hâlâ
+        eylemini bitiriyordur: ikinci işçi açılmaz, eskisi çalışmaya devam eder.
+        """
+        with self._cond:
+            self._stopping = False
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="CaptureDispatch", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Bekleyen basışları at ve işçiyi durdur (sürmekte olan eylem bitirilir)."""
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+            self.coalesced += len(self._pending)
+            self._pending.clear()
+            self._cond.notify()
+        # _thread'i işçi çıkarken kendisi temizler; eylem zaman aşımını
+        # geçerse işçi hâlâ canlıdır ve start() yenisini açmaz
+        thread.join(timeout=timeout)
+
+    def press(self) -> bool:
+        """
+        Basışı bildir (kısayol/tepsi thread'inden). Hiç beklemez.
+
+        Returns:
+            Kuyruğa alındıysa True, birleştirildiyse False
+        """
+        now = self._clock()
+        with self._cond:
+            self.received += 1
+            if self._stopping or len(self._pending) >= self._limit:
+                self.coalesced += 1
+                return False
+            self._pending.append((now, time.perf_counter_ns()))
+            self._cond.notify()
+            return True
+
+    def _exit(self):
+        """İşçi çıkıyor (_cond altında çağrılır): start() yeni işçi açabilir."""
+        self._thread = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    self._exit()
+                    return
+                pressed_at, pressed_ns = self._pending.popleft()
+                mode, cooldown = self.mode, self.cooldown
+
+            if mode != "queue":
+                # Eylem sürerken veya cooldown içinde basılmış -> birleştir
+                if pressed_at < self._last_end or pressed_at - self._last_start < cooldown:
+                    with self._cond:
+                        self.coalesced += 1
+                    continue
+            else:
+                delay = self._last_start + cooldown - self._clock()
+                if delay > 0:
+                    with self._cond:
+                        if self._cond.wait_for(lambda: self._stopping, timeout=delay):
+                            self._exit()
+                            return
+
+            self._last_start = self._clock()
+            # Yakalama izi tuşa basış anından başlar (kuyrukta bekleme dahil)
+            tracer.begin_trace()
+            tracer.record("dispatch.wait", pressed_ns, time.perf_counter_ns())
+            try:
+                if self._action is not None:
+                    with tracer.span("dispatch.action"):
+                        self._action()
+                with self._cond:
+                    self.executed += 1
+            except Exception as e:
+                with self._cond:
+                    self.failed += 1
+                print(f"[Dispatch] Eylem hatası: {e}")
+            self._last_end = self._clock()
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """Kuyruk boşalıp eylem bitene kadar bekle (test/kapanış için)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._cond:
+                settled = self.executed + self.failed + self.coalesced
+                if not self._pending and settled == self.received:
+                    return True
+            time.sleep(0.001)
+        return False
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "mode": self.mode,
+                "received": self.received,
+                "coalesced": self.coalesced,
+                "executed": self.executed,
+                "failed": self.failed,
+                "pending": len(self._pending),
+            }
+
+
+# Global instance - kısayol ve tepsi menüsü basışları
+capture_dispatcher = Dispatcher()
+
+
+if __name__ == "__main__":
+    # Stres testi - 1000 sentetik basış, thread sayısı sabit kalmalı
+    PRESSES = 1000
+
+    def fire(dispatcher_press: Callable[[], object], senders: int = 4):
+        """Birkaç thread'den art arda basış gönder (tuş tekrarı + tepsi menüsü gibi)."""
+        per_sender = PRESSES // senders
+
+        def send():
+            for _ in range(per_sender):
+                dispatcher_press()
+                time.sleep(0.0001)
+
+        threads = [threading.Thread(target=send) for _ in range(senders)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def sample_threads(stop: threading.Event, peak: list):
+        while not stop.is_set():
+            peak[0] = max(peak[0], threading.active_count())
+            time.sleep(0.0005)
+
+    def run_case(label: str, press: Callable[[], object], settle: Callable[[], None]) -> int:
+        baseline = threading.active_count()
+        stop, peak = threading.Event(), [baseline]
+        sampler = threading.Thread(target=sample_threads, args=(stop, peak))
+        sampler.start()
+        start = time.perf_counter()
+        for thread in fire(press):
+            thread.join()
+        settle()
+        elapsed = (time.perf_counter() - start) * 1000
+        stop.set()
+        sampler.join()
+        # Örnekleyici + 4 gönderici thread'i tabandan düşülür
+        extra = peak[0] - baseline - 1 - 4
+        print(f"  {label:<26} ek thread (tepe): {extra:>3}   süre: {elapsed:6.0f} ms")
+        return extra
+
+    def capture():
+        time.sleep(0.002)  # Yakalama + kuyruğa bırakma
+
+    print(f"{PRESSES} basış:")
+
+    # Eski yol: basış başına yeni thread
+    old_threads = []
+
+    def old_press():
+        thread = threading.Thread(target=capture, daemon=True)
+        thread.start()
+        old_threads.append(thread)
+
+    run_case("eski (thread / basış)", old_press, lambda: [t.join() for t in old_threads])
+
+    for mode in MODES:
+        dispatcher = Dispatcher(capture, mode=mode, cooldown=0.01, queue_size=8)
+        dispatcher.start()
+        extra = run_case(f"dispatcher {mode}", dispatcher.press, dispatcher.wait_idle)
+        stats = dispatcher.stats()
+        dispatcher.stop()
+        assert extra <= 1, f"{mode}: thread sayısı arttı ({extra})"
+        assert stats["received"] == PRESSES
+        assert stats["received"] == stats["coalesced"] + stats["executed"], stats
+        print(f"    {stats}")
+
+    # Cooldown: drop modunda 1 s içindeki basışlar tek eyleme iner
+    now = [0.0]
+    runs = []
+    dispatcher = Dispatcher(lambda: runs.append(now[0]), mode="drop", cooldown=1.0, clock=lambda: now[0])
+    dispatcher.start()
+    for step in range(30):  # 3 saniye boyunca 100 ms'de bir basış
+        now[0] = step * 0.1
+        dispatcher.press()
+        dispatcher.wait_idle()
+    dispatcher.stop()
+    assert len(runs) == 3, runs
+    print(f"✓ Cooldown: 30 basış / 3 s -> {len(runs)} eylem")
+
+    # Eylem hatası işçiyi durdurmaz
+    def flaky():
+        raise RuntimeError("test")
+
+    dispatcher = Dispatcher(flaky, cooldown=0)
+    dispatcher.start()
+    dispatcher.press()
+    dispatcher.wait_idle()
+    dispatcher.set_action(lambda: None)
+    time.sleep(0.01)
+    dispatcher.press()
+    dispatcher.wait_idle()
+    assert dispatcher.failed == 1 and dispatcher.executed == 1
+    dispatcher.stop()
+    print("✓ Eylem hatası sonrası işçi çalışmaya devam etti")
+
+    # stop() eylem sürerken zaman aşımına uğrar, hemen start(): tek işçi kalmalı
+    release = threading.Event()
+    dispatcher = Dispatcher(lambda: release.wait(), cooldown=0)
+    dispatcher.start()
+    dispatcher.press()
+    time.sleep(0.02)
+    dispatcher.stop(timeout=0.05)
+    assert dispatcher.running
+    dispatcher.start()
+    workers = [t for t in threading.enumerate() if t.name == "CaptureDispatch"]
+    assert len(workers) == 1, workers
+    release.set()
+    assert dispatcher.wait_idle()
+    dispatcher.press()
+    assert dispatcher.wait_idle() and dispatcher.executed == 2
+    dispatcher.stop()
+    assert not dispatcher.running and not workers[0].is_alive()
+    print("✓ Zaman aşımlı stop() sonrası start() ikinci işçi açmadı")
@@ -0,0 +1,242 @@
+"""
+GameCapture - Arka Plan Kodlayıcı
+Yakalanan kareleri hotkey thread'ini bloklamadan diske yazar.
+Sınırlı kuyruk + işçi thread havuzu (backpressure destekli).
+"""
+
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+from tracing import tracer
+
+
+def pil_save_args(format: str, quality: int) -> Tuple[str, dict]:
+    """
+    Pillow format adı ve kayıt parametreleri.
+    Kayıt ve boyut tahmini aynı parametreleri kullansın diye tek yerde tutulur.
+    """
+    format = format.lower()
+    if format in ["jpg", "jpeg"]:
+        return "JPEG", {"quality": quality, "optimize": True}
+    if format == "webp":
+        return "WEBP", {"quality": quality, "method": 4}  # Daha iyi sıkıştırma
+    if format == "png":
+        return "PNG", {"optimize": True}
+    return format.upper(), {}
+
+
+class EncodeJob:
+    """Kodlanmayı bekleyen tek bir kare."""
+
+    __slots__ = ("seq", "image", "filepath", "format", "quality", "on_done", "enqueued_at", "trace", "enqueued_ns")
+
+    def __init__(self, seq: int, image: Any, filepath: Path, format: str, quality: int,
+                 on_done: Optional[Callable] = None):
+        self.seq = seq
+        self.image = image
+        self.filepath = filepath
+        self.format = format
+        self.quality = quality
+        self.on_done = on_done
+        self.enqueued_at = time.perf_counter()
+        self.enqueued_ns = time.perf_counter_ns()
+        self.trace = tracer.current_trace()  # İz, kodlayıcı thread'ine taşınır
+
+
+class EncoderQueue:
+    """
+    Sınırlı kodlayıcı kuyruğu.
+
+    Kuyruk doluysa submit() en fazla `block_timeout` saniye bekler, yine yer
+    açılmazsa False döner (backpressure). Böylece bellekte en fazla
+    `max_pending + workers` ham kare tutulur.
+    """
+
+    def __init__(self, save_func: Callable, workers: int = 2, max_pending: int = 4,
+                 block_timeout: float = 2.0):
+        self._save_func = save_func
+        self._workers = max(1, workers)
+        self._queue = queue.Queue(maxsize=max(1, max_pending))
+        self._block_timeout = block_timeout
+        self._threads = []
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._running = False
+
+        # İstatistikler
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def start(self):
+        """İşçi thread'lerini başlat (idempotent)."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            for i in range(self._workers):
+                thread = threading.Thread(target=self._worker, name=f"Encoder-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, image: Any, filepath: Path, format: str, quality: int,
+               on_done: Optional[Callable] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Kareyi kodlama kuyruğuna ekle.
+
+        Args:
+            on_done: Dosya yazıldığında çağrılır -> on_done(başarılı, dosya_yolu)
+            timeout: Kuyruk doluysa en fazla bekleme (None: block_timeout)
+
+        Returns:
+            True eğer kare kuyruğa alındıysa, False eğer kuyruk dolu kaldıysa
+        """
+        self.start()
+
+        with self._lock:
+            self._seq += 1
+            job = EncodeJob(self._seq, image, filepath, format, quality, on_done)
+
+        try:
+            self._queue.put(job, timeout=self._block_timeout if timeout is None else max(0.0, timeout))
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            print(f"[Encoder] Kuyruk dolu, kare kabul edilmedi: {filepath.name}")
+            return False
+
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    def _worker(self):
+        """Kuyruktan iş alıp kaydet."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                self._queue.task_done()
+                break
+
+            tracer.set_trace(job.trace)
+            tracer.record("encode.wait", job.enqueued_ns, time.perf_counter_ns())
+            try:
+                with tracer.span("save"):
+                    success = bool(self._save_func(job.image, job.filepath, job.format, job.quality))
+            except Exception as e:
+                print(f"[Encoder] Kayıt hatası: {e}")
+                success = False
+
+            # Ham kareyi hemen bırak (bellek)
+            job.image = None
+
+            with self._lock:
+                if success:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+            if job.on_done:
+                try:
+                    job.on_done(success, job.filepath)
+                except Exception as e:
+                    print(f"[Encoder] Callback hatası: {e}")
+
+            self._queue.task_done()
+
+    def pending(self) -> int:
+        """Kuyrukta bekleyen iş sayısı."""
+        return self._queue.qsize()
+
+    def wait(self):
+        """Kuyruktaki tüm işler bitene kadar bekle."""
+        self._queue.join()
+
+    def shutdown(self, wait: bool = True):
+        """İşçileri durdur. wait=True ise bekleyen işler önce tamamlanır."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            threads = self._threads
+            self._threads = []
+
+        for _ in threads:
+            self._queue.put(None)
+
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def stats(self) -> dict:
+        """Kuyruk istatistiklerini döndür."""
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "pending": self._queue.qsize(),
+            }
+
+
+if __name__ == "__main__":
+    # Test - sentetik karelerle kuyruk, sıralama ve backpressure kontrolü
+    import tempfile
+
+    written = []
+    written_lock = threading.Lock()
+
+    def fake_save(image, filepath, format, quality):
+        time.sleep(0.05)  # Yavaş kodlayıcıyı taklit et
+        if image == "bad":
+            raise ValueError("bozuk kare")
+        return True
+
+    def on_done(success, filepath):
+        with written_lock:
+            written.append((filepath.name, success))
+
+    tmp = Path(tempfile.gettempdir())
+
+    # 1) Sıralama: tek işçi ile FIFO korunmalı
+    enc = EncoderQueue(fake_save, workers=1, max_pending=16)
+    for i in range(10):
+        assert enc.submit(f"frame{i}", tmp / f"frame_{i:02d}.png", "png", 95, on_done)
+    enc.wait()
+    names = [name for name, _ in written]
+    assert names == sorted(names), names
+    print(f"✓ Sıralama korundu: {len(names)} kare")
+    enc.shutdown()
+
+    # 2) Backpressure: dolu kuyruk submit'i sınırlı süre bekletir, sonra reddeder
+    enc = EncoderQueue(fake_save, workers=1, max_pending=2, block_timeout=0.01)
+    accepted = sum(enc.submit("x", tmp / f"bp_{i}.png", "png", 95) for i in range(20))
+    enc.wait()
+    stats = enc.stats()
+    assert stats["rejected"] > 0 and accepted + stats["rejected"] == 20, stats
+    print(f"✓ Backpressure: {accepted} kabul, {stats['rejected']} red")
+    enc.shutdown()
+
+    # 3) Hata izolasyonu: bozuk kare diğerlerini etkilememeli
+    written.clear()
+    enc = EncoderQueue(fake_save, workers=2, max_pending=8)
+    for i, payload in enumerate(["ok", "bad", "ok"]):
+        enc.submit(payload, tmp / f"err_{i}.png", "png", 95, on_done)
+    enc.wait()
+    assert sorted(s for _, s in written) == [False, True, True], written
+    print(f"✓ Hata izolasyonu: {enc.stats()}")
+    enc.shutdown()
+
+    # 4) Gecikme: submit, kodlamadan bağımsız olarak hemen dönmeli
+    enc = EncoderQueue(fake_save, workers=2, max_pending=8)
+    start = time.perf_counter()
+    enc.submit("x", tmp / "lat.png", "png", 95)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    enc.wait()
+    assert elapsed_ms < 50, elapsed_ms
+    print(f"✓ submit gecikmesi: {elapsed_ms:.2f} ms")
+    enc.shutdown()
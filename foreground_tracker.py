@@ -0,0 +1,318 @@
+"""
+GameCapture - Ön Plan Penceresi İzleyici
+Ön plandaki uygulamayı arka planda takip eder ve hazır bir anlık görüntü
+(uygulama adı, PID, tam ekran durumu, monitör) tutar. Yakalama yolu
+algılama yapmaz; yalnızca bu görüntünün referansını okur.
+
+Windows'ta SetWinEventHook(EVENT_SYSTEM_FOREGROUND) olayları beklenir;
+hook kurulamazsa kısa aralıklı yoklamaya düşülür. Her iki durumda da
+başlık ve tam ekran değişiklikleri için düşük frekanslı yenileme yapılır.
+
+Olay kaynağı ve algılama fonksiyonu dışarıdan verilebilir (Linux'ta test).
+"""
+
+import queue
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+# Olay kaynağında yenileme aralığı (başlık / tam ekran değişiklikleri, saniye)
+REFRESH_INTERVAL = 1.0
+# Yoklama kaynağında kontrol aralığı (saniye)
+POLL_INTERVAL = 0.25
+
+
+class PollingSource:
+    """Yedek kaynak: sabit aralıkla uyanır."""
+
+    def __init__(self, interval: float = POLL_INTERVAL):
+        self.interval = interval
+        self._stop = threading.Event()
+
+    def wait(self) -> bool:
+        """Yenile -> True, kapatıldı -> False."""
+        return not self._stop.wait(self.interval)
+
+    def close(self):
+        self._stop.set()
+
+
+class WinEventSource:
+    """SetWinEventHook ile ön plan değişikliği olayları (kendi mesaj döngüsü thread'inde)."""
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WM_QUIT = 0x0012
+
+    def __init__(self, refresh: float = REFRESH_INTERVAL):
+        import ctypes
+        from ctypes import wintypes
+
+        self._ctypes = ctypes
+        self._wintypes = wintypes
+        self._user32 = ctypes.windll.user32
+        self._refresh = refresh
+        self._events = queue.Queue()
+        self._closed = False
+        self._thread_id = None
+        self._ready = threading.Event()
+        self._error = None
+
+        # Geri çağrı referansı canlı tutulmalı (GC edilirse hook çöker)
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+        self._proc = WinEventProc(self._on_event)
+        self._user32.SetWinEventHook.restype = wintypes.HANDLE
+
+        self._thread = threading.Thread(target=self._message_loop, name="ForegroundHook", daemon=True)
+        self._thread.start()
+        self._ready.wait(2.0)
+        if self._error is not None:
+            raise self._error
+
+    def _on_event(self, hook, event, hwnd, id_object, id_child, thread, timestamp):
+        self._events.put(hwnd)
+
+    def _message_loop(self):
+        ctypes, wintypes = self._ctypes, self._wintypes
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        hook = self._user32.SetWinEventHook(
+            self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND,
+            None, self._proc, 0, 0, self.WINEVENT_OUTOFCONTEXT
+        )
+        if not hook:
+            self._error = ctypes.WinError()
+            self._ready.set()
+            return
+        self._ready.set()
+
+        msg = wintypes.MSG()
+        try:
+            while self._user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                self._user32.TranslateMessage(ctypes.byref(msg))
+                self._user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            self._user32.UnhookWinEvent(hook)
+
+    def wait(self) -> bool:
+        try:
+            self._events.get(timeout=self._refresh)
+            # Alt-Tab art arda birkaç olay üretir - tek yenilemede topla
+            while True:
+                self._events.get_nowait()
+        except queue.Empty:
+            pass
+        return not self._closed
+
+    def close(self):
+        self._closed = True
+        self._events.put(None)
+        if self._thread_id is not None:
+            self._user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+
+
+def default_source():
+    """Windows'ta olay hook'u, yoksa yoklama."""
+    if sys.platform == "win32":
+        try:
+            return WinEventSource()
+        except Exception as e:
+            print(f"[Foreground] Olay hook'u kurulamadı, yoklamaya geçiliyor: {e}")
+    return PollingSource()
+
+
+def _default_detect() -> dict:
+    from detector import get_foreground_app
+    return get_foreground_app()
+
+
+def _default_current_hwnd() -> int:
+    from detector import get_foreground_window_handle
+    return get_foreground_window_handle()
+
+
+class ForegroundTracker:
+    """
+    Ön plan uygulaması anlık görüntüsü.
+
+    Görüntü her yenilemede yeni bir sözlük olarak oluşturulur ve tek
+    atamayla yayınlanır; okuyucular kilit almaz ve sözlüğü değiştirmemelidir.
+
+    Args:
+        source_factory: source_factory() -> wait()/close() olan olay kaynağı
+        detect: Ön plan uygulamasını algıla (detector.get_foreground_app biçiminde)
+        current_hwnd: Anlık ön plan hwnd'si (ucuz; görüntünün güncelliğini doğrular)
+    """
+
+    def __init__(
+        self,
+        source_factory: Optional[Callable[[], object]] = None,
+        detect: Callable[[], dict] = _default_detect,
+        current_hwnd: Callable[[], int] = _default_current_hwnd
+    ):
+        self._source_factory = source_factory or default_source
+        self._detect = detect
+        self._current_hwnd = current_hwnd
+        self._snapshot: Optional[dict] = None
+        self._source = None
+        self._thread = None
+
+        # İstatistikler
+        self.refreshes = 0
+        self.stale = 0
+        self.errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        """İzlemeyi başlat (ilk görüntü hemen alınır)."""
+        if self._thread is not None:
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"[Foreground] İlk algılama başarısız: {e}")
+        self._source = self._source_factory()
+        self._thread = threading.Thread(target=self._run, name="ForegroundTracker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        thread = self._thread
+        if thread is None:
+            return
+        self._source.close()
+        thread.join(timeout=timeout)
+        self._thread = None
+
+    def _run(self):
+        while self._source.wait():
+            try:
+                self.refresh()
+            except Exception as e:
+                self.errors += 1
+                print(f"[Foreground] Algılama hatası: {e}")
+
+    def refresh(self) -> dict:
+        """Algıla ve yeni görüntüyü yayınla."""
+        snapshot = dict(self._detect())
+        snapshot["updated"] = time.monotonic()
+        self._snapshot = snapshot
+        self.refreshes += 1
+        return snapshot
+
+    def snapshot(self) -> dict:
+        """
+        Güncel görüntü. İzleyici çalışmıyorsa veya ön plan penceresi görüntüden
+        farklıysa (olay henüz işlenmedi) senkron algılama yapılır.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or self._thread is None:
+            return self.refresh()
+        try:
+            hwnd = self._current_hwnd()
+        except Exception:
+            return snapshot
+        if hwnd != snapshot.get("hwnd"):
+            self.stale += 1
+            return self.refresh()
+        return snapshot
+
+    def stats(self) -> dict:
+        return {"refreshes": self.refreshes, "stale": self.stale, "errors": self.errors}
+
+
+# Global instance
+foreground_tracker = ForegroundTracker()
+
+
+if __name__ == "__main__":
+    # Test - sahte olay kaynağı ve algılama ile (Windows gerektirmez)
+    class ManualSource:
+        def __init__(self):
+            self._events = queue.Queue()
+
+        def fire(self):
+            self._events.put(True)
+
+        def wait(self) -> bool:
+            return self._events.get()
+
+        def close(self):
+            self._events.put(False)
+
+    class FakeDesktop:
+        def __init__(self):
+            self.hwnd = 1
+            self.apps = {1: ("explorer.exe", False), 2: ("game.exe", True)}
+            self.detections = 0
+
+        def detect(self) -> dict:
+            self.detections += 1
+            time.sleep(0.003)  # Gerçek Win32 + psutil sorgusu gibi yavaş
+            name, fullscreen = self.apps[self.hwnd]
+            return {
+                "process_name": name, "clean_name": name[:-4], "hwnd": self.hwnd,
+                "pid": 1000 + self.hwnd, "is_fullscreen": fullscreen,
+                "monitor_area": (0, 0, 1920, 1080),
+            }
+
+    desktop = FakeDesktop()
+    source = ManualSource()
+    tracker = ForegroundTracker(lambda: source, detect=desktop.detect, current_hwnd=lambda: desktop.hwnd)
+
+    # Çalışmıyorken senkron algılama
+    assert tracker.snapshot()["clean_name"] == "explorer"
+
+    tracker.start()
+
+    def wait_for(predicate, timeout: float = 1.0) -> bool:
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.001)
+        return False
+
+    # Olay gelince görüntü arka planda güncellenir
+    desktop.hwnd = 2
+    source.fire()
+    assert wait_for(lambda: tracker._snapshot["hwnd"] == 2)
+    before = desktop.detections
+    N = 10_000
+    start = time.perf_counter()
+    for _ in range(N):
+        snap = tracker.snapshot()
+    per_call = (time.perf_counter() - start) / N * 1e6
+    assert snap["clean_name"] == "game" and snap["is_fullscreen"] and desktop.detections == before
+    print(f"✓ Olay sonrası görüntü hazır: {per_call:.2f} µs / okuma (algılama: ~3 ms)")
+
+    # Olay işlenmeden yakalama: hwnd farklı -> senkron yenileme
+    desktop.hwnd = 1
+    assert tracker.snapshot()["clean_name"] == "explorer" and tracker.stale == 1
+    print("✓ Henüz işlenmemiş değişiklik hwnd kontrolüyle yakalandı")
+
+    # Algılama hatası izleyiciyi durdurmaz
+    desktop.apps[1] = None
+    source.fire()
+    assert wait_for(lambda: tracker.errors == 1)
+    desktop.apps[1] = ("explorer.exe", False)
+    source.fire()
+    assert wait_for(lambda: tracker.refreshes >= 5)
+
+    tracker.stop()
+    assert not tracker.running
+    print(f"✓ Durduruldu: {tracker.stats()}")
+
+    # Yoklama kaynağı ile uçtan uca
+    polled = ForegroundTracker(lambda: PollingSource(0.01), detect=desktop.detect,
+                               current_hwnd=lambda: desktop.hwnd)
+    polled.start()
+    desktop.hwnd = 2
+    assert wait_for(lambda: polled._snapshot["hwnd"] == 2)
+    polled.stop()
+    print("✓ Yoklama kaynağı değişikliği yakaladı")
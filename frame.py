@@ -0,0 +1,271 @@
+"""
+GameCapture - Kare (Frame) Soyutlaması
+Yakalama backend'lerinin ham piksel tamponunu kopyalamadan sarar.
+Kanal sırası (BGRA -> RGB) yalnızca kodlayıcı ihtiyaç duyduğunda ve bir kez
+dönüştürülür; siyah kare kontrolü ve küçük resimler aynı tampondan okur.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+# Pillow "raw" çözücü adları
+_RAW_MODES = {"RGB": "RGB", "BGRA": "BGRX", "BGRX": "BGRX"}
+
+# Boş kare algılama: ızgara satırları bu büyüklükte bloklar halinde işlenir
+_BLANK_BLOCK_ROWS = 8
+
+
+class Frame:
+    """
+    Ham piksel tamponu üzerinde kopyasız görünüm.
+
+    Args:
+        array: (yükseklik, genişlik, kanal) uint8 dizisi - kopyalanmaz
+        order: Kanal sırası: "RGB", "BGRA" veya "BGRX"
+        owner: Tamponun sahibi (ör. mss ScreenShot) - tampon yaşadıkça tutulur
+    """
+
+    __slots__ = ("_array", "order", "_owner", "_rgb")
+
+    def __init__(self, array: np.ndarray, order: str = "RGB", owner=None):
+        if order not in _RAW_MODES:
+            raise ValueError(f"Desteklenmeyen kanal sırası: {order}")
+        self._array = array
+        self.order = order
+        self._owner = owner
+        self._rgb: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_mss(cls, shot) -> "Frame":
+        """mss ScreenShot'ın ham BGRA tamponunu kopyalamadan sar."""
+        array = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return cls(array, "BGRA", owner=shot)
+
+    @classmethod
+    def from_rgb(cls, array: np.ndarray) -> "Frame":
+        """RGB numpy dizisini (DXcam, tamponlar) sar."""
+        return cls(array, "RGB")
+
+    @property
+    def width(self) -> int:
+        return self._array.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self._array.shape[0]
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return (self.width, self.height)
+
+    @property
+    def array(self) -> np.ndarray:
+        """Ham tampon (kanal sırası `order`)."""
+        return self._array
+
+    @property
+    def nbytes(self) -> int:
+        return self._array.nbytes
+
+    def rgb(self) -> np.ndarray:
+        """RGB dizisi - gerekiyorsa tek seferlik kanal dönüşümü, sonuç önbelleğe alınır."""
+        if self.order == "RGB":
+            return self._array
+        if self._rgb is None:
+            self._rgb = np.ascontiguousarray(self._array[:, :, 2::-1])
+        return self._rgb
+
+    def to_image(self) -> Image.Image:
+        """
+        PIL Image'a çevir. Pillow'un raw çözücüsü kanal dönüşümünü doğrudan
+        ham tampondan yapar (ara bytes kopyası yok).
+        """
+        if self._rgb is not None:
+            return Image.fromarray(self._rgb)
+        array = self._array if self._array.flags.c_contiguous else np.ascontiguousarray(self._array)
+        return Image.frombuffer("RGB", self.size, array, "raw", _RAW_MODES[self.order], 0, 1)
+
+    def sample(self, step: int) -> np.ndarray:
+        """Her `step` pikselden birini içeren görünüm (kopya yok, renk kanalları)."""
+        return self._array[::step, ::step, :3]
+
+    def thumbnail(self, max_size: int = 256) -> Image.Image:
+        """Seyrek örneklemeyle küçük resim - yalnızca örneklenen pikseller kopyalanır."""
+        step = max(1, -(-max(self.width, self.height) // max_size))
+        small = self.sample(step)
+        if self.order != "RGB":
+            small = small[:, :, ::-1]
+        return Image.fromarray(np.ascontiguousarray(small))
+
+
+def _sample_grid(image, grid: int) -> np.ndarray:
+    """Kareden yaklaşık grid x grid'lik seyrek piksel ızgarası (mümkünse kopyasız)."""
+    if isinstance(image, Frame):
+        array = image.array
+    elif isinstance(image, np.ndarray):
+        array = image
+    else:
+        # PIL: NEAREST küçültme yalnızca örneklenen pikselleri okur
+        return np.asarray(image.convert("RGB").resize((grid, grid), Image.NEAREST))
+    height, width = array.shape[:2]
+    return array[::max(1, height // grid), ::max(1, width // grid), :3]
+
+
+def detect_blank(
+    image,
+    threshold: int = 10,
+    tolerance: int = 4,
+    grid: int = 64,
+    outlier_ratio: float = 0.002
+) -> Optional[str]:
+    """
+    Başarısız yakalama karelerini algıla.
+
+    Ham tampondan seyrek bir ızgara okunur ve bloklar halinde işlenir; hem
+    parlak hem de farklı renkte yeterince örnek bulunur bulunmaz (normal
+    karelerde genellikle ilk blokta) durulur.
+
+    Args:
+        image: Frame, numpy dizisi veya PIL Image
+        threshold: Bu değerin altındaki kanallar siyah sayılır
+        tolerance: Tek renk algılamada izin verilen kanal sapması
+        outlier_ratio: İzin verilen aykırı örnek oranı (ör. fare imleci)
+
+    Returns:
+        "black" (tamamen siyah), "uniform" (tek renk, ör. DXcam'in bayat gri
+        karesi) veya None (normal kare)
+    """
+    samples = _sample_grid(image, grid)
+    if samples.size == 0:
+        return "black"
+
+    allowed = int(samples.shape[0] * samples.shape[1] * outlier_ratio)
+    reference = np.median(samples[0], axis=0).astype(np.int16)
+    bright = 0
+    deviant = 0
+    black = True
+    uniform = True
+
+    for start in range(0, samples.shape[0], _BLANK_BLOCK_ROWS):
+        block = samples[start:start + _BLANK_BLOCK_ROWS]
+        if black:
+            bright += int(np.count_nonzero(block.max(axis=2) >= threshold))
+            black = bright <= allowed
+        if uniform:
+            diff = np.abs(block.astype(np.int16) - reference).max(axis=2)
+            deviant += int(np.count_nonzero(diff > tolerance))
+            uniform = deviant <= allowed
+        if not black and not uniform:
+            return None
+
+    return "black" if black else "uniform"
+
+
+def as_image(image) -> Image.Image:
+    """Frame, numpy dizisi veya PIL Image'ı PIL Image'a çevir."""
+    if isinstance(image, Frame):
+        return image.to_image()
+    if isinstance(image, np.ndarray):
+        return Image.fromarray(image)
+    return image
+
+
+if __name__ == "__main__":
+    # 4K yakalamada bellek ayırma ölçümü (tracemalloc) - eski yol vs Frame
+    import time
+    import tracemalloc
+
+    class _FakeShot:
+        """mss ScreenShot taklidi: raw = bytearray, bgra = bytes kopyası."""
+
+        def __init__(self, width: int, height: int):
+            self.width, self.height = width, height
+            self.size = (width, height)
+            self.raw = bytearray(np.random.default_rng(0).integers(0, 256, width * height * 4, dtype=np.uint8).tobytes())
+
+        @property
+        def bgra(self) -> bytes:
+            return bytes(self.raw)
+
+    shot = _FakeShot(3840, 2160)
+
+    def measure(label: str, func):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - start) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {label:<44}{peak / (1024 * 1024):>8.1f} MB {elapsed:>8.1f} ms")
+        return result
+
+    print("4K kare (Python tarafı ayırmalar; Pillow'un iç tamponları hariç):")
+    old_img = measure("Eski: frombytes(shot.bgra, BGRX)",
+                      lambda: Image.frombytes("RGB", shot.size, shot.bgra, "raw", "BGRX"))
+    frame = measure("Yeni: Frame.from_mss", lambda: Frame.from_mss(shot))
+    new_img = measure("Yeni: frame.to_image() (kodlayıcıda)", frame.to_image)
+    measure("Eski: siyah kontrolü resize(100x100)+np.array",
+            lambda: np.array(old_img.resize((100, 100)))[:, :, :3].mean())
+    measure("Yeni: siyah kontrolü frame.sample(38)", lambda: frame.sample(38).mean())
+    measure("Yeni: frame.thumbnail(256)", lambda: frame.thumbnail(256))
+
+    assert old_img.tobytes() == new_img.tobytes(), "Piksel uyuşmazlığı"
+    assert np.array_equal(np.asarray(new_img), frame.rgb())
+    print("✓ Eski ve yeni yol aynı pikselleri üretiyor")
+
+    # Boş kare algılama - doğruluk seti
+    rng = np.random.default_rng(1)
+    height, width = 2160, 3840
+
+    def make(fill) -> np.ndarray:
+        array = np.zeros((height, width, 3), dtype=np.uint8)
+        fill(array)
+        return array
+
+    def dark_scene(a):
+        a[...] = rng.integers(0, 9, a.shape, dtype=np.uint8)
+        a[height // 2:, :, :] += 6  # karanlık zemin
+        a[::97, ::89] = 220  # yıldızlar / HUD
+
+    def gradient(a):
+        a[...] = np.linspace(0, 255, width, dtype=np.uint8)[None, :, None]
+
+    def black_with_cursor(a):
+        a[100:132, 100:120] = 255
+
+    cases = [
+        ("siyah", make(lambda a: None), "black"),
+        ("neredeyse siyah", make(lambda a: a.__setitem__(..., rng.integers(0, 8, a.shape, dtype=np.uint8))), "black"),
+        ("siyah + imleç", make(black_with_cursor), "black"),
+        ("karanlık sahne", make(dark_scene), None),
+        ("tek renk gri (bayat DXcam)", make(lambda a: a.__setitem__(..., 128)), "uniform"),
+        ("gri + hafif gürültü", make(lambda a: a.__setitem__(..., 126 + rng.integers(0, 4, a.shape, dtype=np.uint8))), "uniform"),
+        ("gradyan", make(gradient), None),
+        ("gürültü", make(lambda a: a.__setitem__(..., rng.integers(0, 256, a.shape, dtype=np.uint8))), None),
+    ]
+    print("\nBoş kare algılama (4K):")
+    for label, array, expected in cases:
+        result = detect_blank(Frame.from_rgb(array))
+        assert result == expected, (label, result, expected)
+        assert detect_blank(Image.fromarray(array)) == expected, (label, "PIL")
+        print(f"  ✓ {label:<28} -> {result}")
+
+    # Benchmark - eski resize yöntemi vs seyrek ızgara
+    def old_is_black(img) -> bool:
+        return np.array(img.resize((100, 100)))[:, :, :3].mean() < 10
+
+    runs = 20
+    for label, array, _ in (cases[0], cases[6]):
+        img = Image.fromarray(array)
+        frame = Frame.from_rgb(array)
+        start = time.perf_counter()
+        for _ in range(runs):
+            old_is_black(img)
+        old_ms = (time.perf_counter() - start) / runs * 1000
+        start = time.perf_counter()
+        for _ in range(runs):
+            detect_blank(frame)
+        new_ms = (time.perf_counter() - start) / runs * 1000
+        print(f"  {label:<10} eski resize: {old_ms:7.2f} ms   seyrek ızgara: {new_ms:7.3f} ms")
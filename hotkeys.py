@@ -4,9 +4,9 @@ Oyunlarda bile çalışan sistem genelinde kısayol tuşları.
 """
 
 import keyboard
-import threading
 from typing import Callable, Optional
 from config import load_config
+from dispatcher import capture_dispatcher
 
 
 class HotkeyManager:
@@ -21,12 +21,13 @@ class HotkeyManager:
     def set_callback(self, callback: Callable):
         """Kısayol tuşuna basıldığında çağrılacak fonksiyonu ayarla."""
         self._callback = callback
+        capture_dispatcher.set_action(callback)
     
     def _on_hotkey(self):
         """Kısayol tuşu basıldığında çağrılır."""
         if self._callback:
-            # Callback'i ayrı thread'de çalıştır (UI donmasını önle)
-            threading.Thread(target=self._callback, daemon=True).start()
+            # Callback tek yakalama thread'inde çalışır (hook thread'i beklemez)
+            capture_dispatcher.press()
     
     def start(self, hotkey: str = None):
         """Kısayol dinleyiciyi başlat."""
@@ -86,6 +87,15 @@ class HotkeyManager:
         print(f"[Hotkey] Yeni hotkey sonucu: {result}")
         return result
     
+    def is_pressed(self) -> bool:
+        """Kısayol tuşu şu an basılı mı? (seri çekim için)"""
+        if not self._hotkey:
+            return False
+        try:
+            return keyboard.is_pressed(self._hotkey)
+        except Exception:
+            return False
+    
     def is_running(self) -> bool:
         """Dinleyicinin çalışıp çalışmadığını kontrol et."""
         return self._running
@@ -98,12 +108,14 @@ hotkey_manager = HotkeyManager()
 def start_hotkey_listener(callback: Callable, hotkey: str = None) -> bool:
     """Kısayol dinleyiciyi başlat."""
     hotkey_manager.set_callback(callback)
+    capture_dispatcher.start()
     return hotkey_manager.start(hotkey)
 
 
 def stop_hotkey_listener():
     """Kısayol dinleyiciyi durdur."""
     hotkey_manager.stop()
+    capture_dispatcher.stop()
 
 
 if __name__ == "__main__":
@@ -3,7 +3,12 @@ Berk's Screenshot Tool - Internationalization (i18n)
 Türkçe ve İngilizce dil desteği.
 """
 
+import string
+import threading
+from typing import Dict, Optional
+
 from config import load_config, update_config
+from config_watcher import config_watcher
 
 # Desteklenen diller
 SUPPORTED_LANGUAGES = ["tr", "en"]
@@ -121,6 +126,10 @@ TRANSLATIONS = {
         "tr": "Tahmini boyut",
         "en": "Estimated size"
     },
+    "settings_estimate_tooltip": {
+        "tr": "Tahmini dosya boyutu ve kayıt süresi",
+        "en": "Estimated file size and save time"
+    },
     "settings_monitor": {
         "tr": "Monitör:",
         "en": "Monitor:"
@@ -217,6 +226,10 @@ TRANSLATIONS = {
         "tr": "Ekran Görüntüsü Alındı",
         "en": "Screenshot Taken"
     },
+    "notification_save_failed": {
+        "tr": "Ekran Görüntüsü Kaydedilemedi",
+        "en": "Screenshot Not Saved"
+    },
     
     # === Algılama ===
     "desktop": {
@@ -247,23 +260,105 @@ TRANSLATIONS = {
     },
 }
 
-# Aktif dil
+# --- Derlenmiş katalog ---
+# Her dil için TRANSLATIONS bir kez düz bir sözlüğe çözülür (anahtar -> metin
+# veya _Template). t() yalnızca aktif katalogda tek bir sözlük araması yapar;
+# dil değişince katalog referansı tek atamayla değiştirilir.
+
+
+class _Template:
+    """Önceden ayrıştırılmış format şablonu ("{count} görüntü" gibi)."""
+    
+    __slots__ = ("text", "parts")
+    
+    def __init__(self, text: str, parts: list):
+        self.text = text
+        self.parts = parts  # (sabit metin, alan adı, format_spec, dönüşüm)
+    
+    def render(self, kwargs: dict) -> str:
+        out = []
+        for literal, field, spec, conversion in self.parts:
+            out.append(literal)
+            if field is None:
+                continue
+            value = kwargs[field]
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "s":
+                value = str(value)
+            elif conversion == "a":
+                value = ascii(value)
+            out.append(format(value, spec))
+        return "".join(out)
+
+
+def _compile_entry(text: str):
+    """Alan içermeyen metin str olarak kalır, diğerleri _Template olur."""
+    try:
+        parts = list(_formatter.parse(text))
+    except ValueError:
+        return text
+    if all(field is None for _, field, _, _ in parts):
+        return text
+    # Yalnızca basit alan adları ({count}) önceden ayrıştırılır
+    if any(field is not None and not field.isidentifier() for _, field, _, _ in parts):
+        return text
+    return _Template(text, parts)
+
+
+def compile_catalog(lang: str) -> Dict[str, object]:
+    """Dil için düz katalog oluştur (eksik çeviriler İngilizceye düşer)."""
+    catalog = {}
+    for key, entry in TRANSLATIONS.items():
+        catalog[key] = _compile_entry(entry.get(lang, entry.get("en", key)))
+    return catalog
+
+
+_formatter = string.Formatter()
+_catalogs: Dict[str, Dict[str, object]] = {}
+_catalog_lock = threading.Lock()
+
+# Aktif dil ve katalog (None = ilk t() çağrısında config'den yüklenir)
 _current_language = "tr"
+_active_catalog: Optional[Dict[str, object]] = None
+
+
+def _activate(lang: str):
+    """Dili etkinleştir: katalog gerekirse derlenir, sonra tek atamayla değişir."""
+    global _current_language, _active_catalog
+    if lang not in SUPPORTED_LANGUAGES:
+        lang = "tr"
+    with _catalog_lock:
+        catalog = _catalogs.get(lang)
+        if catalog is None:
+            catalog = _catalogs[lang] = compile_catalog(lang)
+        _current_language = lang
+        _active_catalog = catalog
+
+
+def _get_catalog() -> Dict[str, object]:
+    catalog = _active_catalog
+    if catalog is None:
+        _activate(load_config().get("language", "tr"))
+        catalog = _active_catalog
+    return catalog
+
+
+def _on_language_changed(change):
+    """config_watcher olayı: ayarlar penceresi veya elle düzenleme sonrası."""
+    _activate(change.new)
 
 
 def get_language() -> str:
     """Mevcut dili döndür."""
-    global _current_language
-    config = load_config()
-    _current_language = config.get("language", "tr")
+    _get_catalog()
     return _current_language
 
 
 def set_language(lang: str) -> bool:
     """Dili değiştir."""
-    global _current_language
     if lang in SUPPORTED_LANGUAGES:
-        _current_language = lang
+        _activate(lang)
         update_config("language", lang)
         return True
     return False
@@ -280,21 +375,17 @@ def t(key: str, **kwargs) -> str:
     Returns:
         Çevrilmiş metin
     """
-    global _current_language
-    
-    # Dili config'den al
-    config = load_config()
-    _current_language = config.get("language", "tr")
-    
-    if key in TRANSLATIONS:
-        text = TRANSLATIONS[key].get(_current_language, TRANSLATIONS[key].get("en", key))
-        if kwargs:
-            try:
-                text = text.format(**kwargs)
-            except KeyError:
-                pass
-        return text
-    return key
+    text = (_active_catalog or _get_catalog()).get(key)
+    if text is None:
+        return key
+    if text.__class__ is _Template:
+        if not kwargs:
+            return text.text
+        try:
+            return text.render(kwargs)
+        except KeyError:
+            return text.text
+    return text
 
 
 def get_available_languages() -> list:
@@ -308,17 +399,70 @@ def get_available_languages() -> list:
 # Kısa alias
 _ = t
 
+# Dil değişikliği yeniden başlatmadan uygulanır (ana süreçte izleyici çalışır)
+config_watcher.subscribe("language", _on_language_changed)
+
 
 if __name__ == "__main__":
-    # Test
-    print("=== Türkçe ===")
-    set_language("tr")
-    print(t("app_name"))
-    print(t("console_title"))
-    print(t("menu_take_screenshot"))
+    # Test - katalog, benchmark ve dil değişikliğinin yayılması
+    # Kullanıcının gerçek config.json'u yerine geçici dosya kullanılır
+    import shutil
+    import tempfile
+    import time
+    from pathlib import Path
+    import config as config_module
+    import config_watcher as watcher_module
+    from config import save_config, invalidate_config_cache
     
-    print("\n=== English ===")
-    set_language("en")
-    print(t("app_name"))
-    print(t("console_title"))
-    print(t("menu_take_screenshot"))
+    _test_dir = Path(tempfile.mkdtemp(prefix="bst_i18n_"))
+    config_module.CONFIG_FILE = watcher_module.CONFIG_FILE = _test_dir / "config.json"
+    invalidate_config_cache()
+    try:
+        print("=== Türkçe ===")
+        set_language("tr")
+        print(t("app_name"))
+        print(t("console_title"))
+        print(t("menu_take_screenshot"))
+        
+        print("\n=== English ===")
+        set_language("en")
+        print(t("app_name"))
+        print(t("console_title"))
+        print(t("menu_take_screenshot"))
+        
+        # Şablonlar ve eksik anahtar
+        template = _compile_entry("{count} görüntü ({size:.1f} MB)")
+        assert template.render({"count": 3, "size": 2.25}) == "3 görüntü (2.2 MB)"
+        assert t("no_such_key") == "no_such_key"
+        
+        # Benchmark: 100k t() çağrısı (eski yol her çağrıda load_config yapardı)
+        N = 100_000
+        keys = ["menu_take_screenshot", "menu_open_folder", "menu_settings", "menu_exit"]
+        start = time.perf_counter()
+        for i in range(N):
+            t(keys[i & 3])
+        new_ms = (time.perf_counter() - start) * 1000
+        
+        start = time.perf_counter()
+        for i in range(N):
+            lang = load_config().get("language", "tr")
+            entry = TRANSLATIONS[keys[i & 3]]
+            entry.get(lang, entry.get("en"))
+        old_ms = (time.perf_counter() - start) * 1000
+        print(f"\n{N} t() çağrısı: {new_ms:.1f} ms (eski yol: {old_ms:.1f} ms, {old_ms / new_ms:.0f}x)")
+        
+        # Dil değişikliği yeniden başlatmadan yayılır (dosya başka süreçten yazılmış gibi)
+        config_watcher.start(initial=load_config())
+        before = t("menu_exit")
+        config = load_config()
+        config["language"] = "tr"
+        save_config(config)
+        start = time.perf_counter()
+        while t("menu_exit") == before and time.perf_counter() - start < 3:
+            time.sleep(0.01)
+        assert get_language() == "tr" and t("menu_exit") != before
+        print(f"✓ Dil değişikliği yayıldı: {before!r} -> {t('menu_exit')!r} "
+              f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+        config_watcher.stop()
+    finally:
+        shutil.rmtree(_test_dir, ignore_errors=True)
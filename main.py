@@ -6,21 +6,34 @@ Ana uygulama ve sistem tepsisi.
 import os
 import sys
 import threading
-import subprocess
 from pathlib import Path
 
-# PIL ve pystray import
-from PIL import Image, ImageDraw
-import pystray
-from pystray import MenuItem as Item
+# Yerel modüller - yalnızca hafif olanlar. Her giriş modu (--notification,
+# --settings, ...) bu dosyayı da yükler; ağır modüller (capture: numpy/mss/dxcam,
+# detector: pywin32/psutil, pystray, PIL, keyboard) ilk kullanımda veya tepsi
+# simgesi göründükten sonra arka planda yüklenir (bkz. startup_bench.py).
+from config import load_config, get_save_path, get_resource_dir, get_app_dir
+from dispatcher import capture_dispatcher
+from foreground_tracker import foreground_tracker
+from notification import show_notification, shutdown_notification_host
+from atomic_write import cleanup_orphans, close_reservation_logs
+from i18n import t
+from config_watcher import config_watcher
+from tracing import tracer, default_trace_path
 
-# Yerel modüller
-from config import load_config, get_save_path, update_config, get_resource_dir, get_app_dir
-from capture import take_screenshot, cleanup_dxcam
-from hotkeys import start_hotkey_listener, stop_hotkey_listener, hotkey_manager
-from detector import get_foreground_app
-from notification import show_notification
-from i18n import t, get_language
+
+def import_tray_modules():
+    """Tepsi simgesi görünmeden önce gereken modüller (startup_bench ile ölçülür)."""
+    import pystray
+    from PIL import Image, ImageDraw
+    import hotkeys
+    import tray_icon
+
+
+def import_capture_modules():
+    """Yakalama yolu modülleri - tepsi göründükten sonra arka planda yüklenir."""
+    import capture
+    import detector
 
 
 class BerksScreenshotTool:
@@ -31,39 +44,19 @@ class BerksScreenshotTool:
         self.icon = None
         self.running = False
         self._screenshot_count = 0
-        self._last_screenshot_time = 0  # Cooldown için son screenshot zamanı
-        self._screenshot_cooldown = 1.0  # Minimum 1 saniye bekleme
+        self._failure_notified = 0  # Kayıt hatası bildirilen son yakalama (seride tek bildirim)
         self._settings_proc = None  # Ayarlar subprocess
+        self.icon_frames = None     # Tepsi simgesi kareleri (tray_icon.IconFrames)
+        self.flash_animator = None  # Tek thread'li flash (tray_icon.FlashAnimator)
     
     def create_icon_image(self, color="green"):
-        """Sistem tepsisi simgesi oluştur."""
-        size = 64
-        image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(image)
-        
-        # Kamera simgesi çiz - Yeni mavi tema renkleri
-        if color == "green":
-            fill_color = (33, 150, 243)   # Mavi - aktif (#2196F3)
-        elif color == "red":
-            fill_color = (244, 67, 54)    # Kırmızı - yakalama anı
-        elif color == "white":
-            fill_color = (255, 255, 255)  # Beyaz - flash parlak
-        elif color == "yellow":
-            fill_color = (100, 181, 246)  # Açık mavi - flash geçiş (#64B5F6)
-        else:
-            fill_color = (25, 118, 210)   # Koyu mavi - pasif (#1976D2)
-        
-        # Kamera gövdesi
-        draw.rounded_rectangle([8, 16, 56, 48], radius=5, fill=fill_color)
-        
-        # Kamera lensi
-        draw.ellipse([24, 22, 44, 42], fill=(255, 255, 255))
-        draw.ellipse([28, 26, 40, 38], fill=fill_color)
-        
-        # Flaş
-        draw.rectangle([44, 18, 52, 24], fill=(255, 255, 255))
-        
-        return image
+        """Sistem tepsisi simgesi (başlangıçta çizilmiş önbellekten)."""
+        return self.icon_frames.get(color)
+    
+    def show_icon_state(self, color: str):
+        """Tepsi simgesini önbellekteki kareye çevir (flash thread'inden)."""
+        if self.icon:
+            self.icon.icon = self.icon_frames.get(color)
     
     def play_capture_sound(self):
         """Yakalama sesi çal."""
@@ -92,58 +85,99 @@ class BerksScreenshotTool:
             print(f"[Sound] Hata: {e}")
     
     def flash_tray_icon(self):
-        """Tray ikonunu flash efekti ile yanıp söndür."""
-        if not self.icon:
-            return
-        
-        def flash_sequence():
-            import time
-            # Flash 1: Beyaz (parlak)
-            self.icon.icon = self.create_icon_image("white")
-            time.sleep(0.1)
-            # Flash 2: Sarı 
-            self.icon.icon = self.create_icon_image("yellow")
-            time.sleep(0.1)
-            # Normal: Yeşil
-            self.icon.icon = self.create_icon_image("green")
-        
-        # Flash efektini ayrı thread'de çalıştır
-        threading.Thread(target=flash_sequence, daemon=True).start()
+        """Tray ikonunu flash efekti ile yanıp söndür (seri çekimde flash'lar birleştirilir)."""
+        if self.flash_animator is not None:
+            self.flash_animator.flash()
+    
+    def configure_dispatcher(self):
+        """Tuş tekrarı modunu ve cooldown'u ayarlardan uygula."""
+        mode = "burst" if self.config.get("burst_mode", False) else self.config.get("hotkey_mode", "drop")
+        capture_dispatcher.configure(
+            mode,
+            cooldown=self.config.get("hotkey_cooldown_ms", 1000) / 1000,
+            queue_size=self.config.get("hotkey_queue_size", 4)
+        )
     
     def on_screenshot_hotkey(self):
-        """Kısayol tuşuna basıldığında çağrılır."""
-        import time
-        
-        # Cooldown kontrolü - tuş basılı kalsa bile hızlı çekim engellenir
-        current_time = time.time()
-        if current_time - self._last_screenshot_time < self._screenshot_cooldown:
-            return  # Cooldown süresi dolmadı, atlat
+        """Kısayol basışı - dispatcher'ın yakalama thread'inde çağrılır (cooldown orada)."""
+        # Isınma henüz bitmediyse import kilidi yüklemenin bitmesini bekler
+        from capture import take_screenshot
         
-        self._last_screenshot_time = current_time
+        # Seri çekim modu: tuş basılı kaldıkça kare yakala
+        self.config = load_config()
+        if self.config.get("burst_mode", False):
+            self.run_burst()
+            return
         
         # Flash efekti başlat (screenshot öncesi)
         self.flash_tray_icon()
         
-        # Her ekran görüntüsünde ayarları yeniden yükle (ses, format vb. için)
-        self.config = load_config()
         self._screenshot_count += 1
         
-        # Ekran görüntüsü al
-        success, filepath, app_name = take_screenshot()
+        # Ekran görüntüsü al - kodlama arka planda yapılır, kare bellekteyken döner
+        count = self._screenshot_count
+        success, filepath, app_name = take_screenshot(
+            on_saved=lambda saved, path: self.on_screenshot_saved(count, saved, path)
+        )
         
         if success:
-            # Ses çal
+            # Kare yakalandı: ses ve bildirim hemen
             self.play_capture_sound()
             
             # iPhone tarzı bildirim göster
             if self.config.get("show_notification", True):
                 dark_mode = self.config.get("dark_mode", True)
                 show_notification(filepath.name, duration=2.0, dark_mode=dark_mode, title=t("notification_screenshot_taken"))
-            
-            print(f"✓ [{self._screenshot_count}] {t('saved')}: {filepath}")
         else:
             print(f"✗ {t('screenshot_failed')}")
     
+    def run_burst(self):
+        """Seri çekim - tuş bırakılana kadar burst_fps hızında yakala."""
+        # Seri sürerken gelen tuş tekrarlarını dispatcher birleştirir (burst modu)
+        from capture import take_burst
+        from hotkeys import hotkey_manager
+        
+        try:
+            self.flash_tray_icon()
+            self.play_capture_sound()
+            self._screenshot_count += 1
+            count = self._screenshot_count
+            
+            frames, app_name = take_burst(
+                hotkey_manager.is_pressed,
+                on_saved=lambda saved, path: self.on_screenshot_saved(count, saved, path)
+            )
+            
+            if frames and self.config.get("show_notification", True):
+                dark_mode = self.config.get("dark_mode", True)
+                show_notification(f"{app_name} ×{frames}", duration=2.0, dark_mode=dark_mode, title=t("notification_screenshot_taken"))
+            print(f"[Burst] {frames} kare yakalandı")
+        except Exception as e:
+            print(f"[Burst] Hata: {e}")
+    
+    def on_screenshot_saved(self, count: int, success: bool, filepath: Path):
+        """
+        Kodlayıcı dosyayı diske yazdığında çağrılır (encoder thread'i).
+        Yakalama bildirimi kare alınınca gösterilmişti; kayıt başarısızsa
+        simge kırmızı kalır (sonraki flash'a kadar) ve ayrı bir hata bildirimi
+        gösterilir - seri çekimde yakalama başına bir kez.
+        """
+        if success:
+            print(f"✓ [{count}] {t('saved')}: {filepath}")
+            return
+        
+        print(f"✗ {t('screenshot_failed')}: {filepath.name}")
+        try:
+            self.show_icon_state("red")
+        except Exception as e:
+            print(f"[Tray] Simge güncellenemedi: {e}")
+        if count == self._failure_notified:
+            return
+        self._failure_notified = count
+        if self.config.get("show_notification", True):
+            dark_mode = self.config.get("dark_mode", True)
+            show_notification(filepath.name, duration=3.0, dark_mode=dark_mode, title=t("notification_save_failed"))
+    
     def open_screenshots_folder(self, icon=None, item=None):
         """Ekran görüntüleri klasörünü aç."""
         save_path = get_save_path()
@@ -153,7 +187,6 @@ class BerksScreenshotTool:
         """Ayarlar penceresini aç - subprocess ile."""
         import subprocess
         import sys
-        import time
         
         print("[Settings] open_settings çağrıldı")
         
@@ -167,10 +200,6 @@ class BerksScreenshotTool:
                 print("[Settings] Eski process temizleniyor")
                 self._settings_proc = None
         
-        # Mevcut config'i kaydet
-        old_hotkey = self.config.get("hotkey", "F12")
-        old_language = self.config.get("language", "tr")
-        
         # Subprocess başlat
         try:
             if getattr(sys, 'frozen', False):
@@ -189,45 +218,53 @@ class BerksScreenshotTool:
             print(f"[Settings] Subprocess hatası: {e}")
             return
         
-        # Config değişikliğini kontrol eden thread
-        def check_config_changes():
-            time.sleep(1)
-            
-            nonlocal old_hotkey, old_language
-            
-            while self._settings_proc is not None and self._settings_proc.poll() is None:
-                time.sleep(0.5)
-                
-                try:
-                    new_config = load_config()
-                    new_hotkey = new_config.get("hotkey", "F12")
-                    new_language = new_config.get("language", "tr")
-                    
-                    if new_hotkey != old_hotkey:
-                        print(f"[Settings] Hotkey: {old_hotkey} -> {new_hotkey}")
-                        hotkey_manager.update_hotkey(new_hotkey)
-                        old_hotkey = new_hotkey
-                        self.config = new_config
-                    
-                    if new_language != old_language:
-                        print(f"[Settings] Language: {old_language} -> {new_language}")
-                        old_language = new_language
-                        self.config = new_config
-                        if self.icon:
-                            self.icon.menu = self.create_menu()
-                            self.icon.update_menu()
-                except:
-                    pass
-            
-            self._settings_proc = None
-            self.config = load_config()
-            print("[Settings] Ayarlar penceresi kapandı.")
-        
-        threading.Thread(target=check_config_changes, daemon=True).start()
+        # Değişiklikler config_watcher olaylarıyla uygulanır (bkz. on_config_changed)
+    
+    def on_config_changed(self, change):
+        """Her ayar değişikliğinde güncel config'i al."""
+        self.config = change.config
+    
+    def on_hotkey_changed(self, change):
+        from hotkeys import hotkey_manager
+        print(f"[Settings] Hotkey: {change.old} -> {change.new}")
+        hotkey_manager.update_hotkey(change.new)
+    
+    def on_language_changed(self, change):
+        print(f"[Settings] Language: {change.old} -> {change.new}")
+        if self.icon:
+            self.icon.menu = self.create_menu()
+            self.icon.update_menu()
+    
+    def on_monitor_changed(self, change):
+        print(f"[Settings] {change.key}: {change.old} -> {change.new}")
+        if change.key == "monitor" and isinstance(change.new, int) and change.new >= 0:
+            from capture import warm_dxcam_cameras
+            warm_dxcam_cameras([change.new])
+        # Anlık tekrar tamponu yeni monitöre taşınır
+        self.restart_replay_buffer()
+    
+    def on_format_changed(self, change):
+        print(f"[Settings] {change.key}: {change.old} -> {change.new}")
+    
+    def on_other_changed(self, change):
+        if change.key.startswith("replay_"):
+            self.restart_replay_buffer()
+        elif change.key.startswith("hotkey_") or change.key == "burst_mode":
+            self.configure_dispatcher()
+        elif change.key == "tracing":
+            tracer.enabled = bool(change.new)
+    
+    def restart_replay_buffer(self):
+        from capture import start_replay_buffer, stop_replay_buffer
+        try:
+            stop_replay_buffer()
+            start_replay_buffer()
+        except Exception as e:
+            print(f"[Replay] Yeniden başlatılamadı: {e}")
     
     def take_screenshot_now(self, icon=None, item=None):
         """Menüden ekran görüntüsü al."""
-        self.on_screenshot_hotkey()
+        capture_dispatcher.press()
     
     def quit_app(self, icon=None, item=None):
         """Uygulamadan çık."""
@@ -247,15 +284,68 @@ class BerksScreenshotTool:
                     pass
             self._settings_proc = None
         
+        # Ayar ve ön plan izleyicilerini durdur
+        try:
+            config_watcher.stop()
+        except:
+            pass
+        try:
+            foreground_tracker.stop()
+        except:
+            pass
+        if self.flash_animator is not None:
+            self.flash_animator.stop()
+        
+        # Bildirim sunucusunu kapat
+        try:
+            shutdown_notification_host()
+        except:
+            pass
+        
         # Keyboard hook'larını temizle
+        hotkeys = sys.modules.get("hotkeys")
         try:
-            stop_hotkey_listener()
+            if hotkeys is not None:
+                hotkeys.stop_hotkey_listener()
         except:
             pass
         
-        # DXcam kaynaklarını temizle
+        # Yakalama modülü hiç yüklenmediyse (ısınmadan önce çıkış) kapatılacak bir şey yok
+        capture = sys.modules.get("capture")
+        
+        # Anlık tekrar tamponunu durdur
         try:
-            cleanup_dxcam()
+            stats = capture.get_replay_stats()
+            if stats:
+                print(f"[Replay] {stats}")
+            capture.stop_replay_buffer()
+        except:
+            pass
+        
+        # Bekleyen kodlamaları bitir (yarım dosya kalmasın)
+        try:
+            capture.shutdown_encoder(wait=True)
+        except:
+            pass
+        
+        # Rezervasyon günlüklerini kapat
+        close_reservation_logs()
+        
+        # Gecikme izlerini yaz (python main.py --stats ile okunur)
+        if tracer.enabled:
+            try:
+                count = tracer.export_jsonl(default_trace_path())
+                print(f"[Trace] {count} span yazıldı: {default_trace_path()}")
+            except Exception as e:
+                print(f"[Trace] Yazılamadı: {e}")
+        
+        # Backend karnesini kaydet ve DXcam kaynaklarını temizle
+        try:
+            capture.save_backend_scores()
+        except:
+            pass
+        try:
+            capture.cleanup_dxcam()
         except:
             pass
         
@@ -276,6 +366,9 @@ class BerksScreenshotTool:
     
     def create_menu(self):
         """Sistem tepsisi menüsü oluştur - dinamik dil desteği ile."""
+        import pystray
+        from pystray import MenuItem as Item
+        
         # Lambda kullanarak her seferinde güncel dil çevirisini al
         return pystray.Menu(
             Item(lambda text: t("menu_take_screenshot"), self.take_screenshot_now, default=True),
@@ -303,10 +396,31 @@ class BerksScreenshotTool:
         print("=" * 50)
         
         self.running = True
+        tracer.enabled = bool(self.config.get("tracing", False))
+        
+        import_tray_modules()
+        import pystray
+        from hotkeys import start_hotkey_listener
+        from tray_icon import IconFrames, FlashAnimator, tray_icon_size
         
-        # Kısayol dinleyiciyi başlat
+        # Simge durumları bir kez çizilir; flash tek thread'de önbellekten oynatılır
+        self.icon_frames = IconFrames(tray_icon_size())
+        self.flash_animator = FlashAnimator(self.show_icon_state)
+        self.flash_animator.start()
+        
+        # Kısayol dinleyiciyi başlat (basışlar tek yakalama thread'inde işlenir)
+        self.configure_dispatcher()
         start_hotkey_listener(self.on_screenshot_hotkey)
         
+        # Ayar dosyası değişikliklerini izle (ayarlar penceresi, elle düzenleme)
+        config_watcher.subscribe("*", self.on_config_changed)
+        config_watcher.subscribe("hotkey", self.on_hotkey_changed)
+        config_watcher.subscribe("language", self.on_language_changed)
+        config_watcher.subscribe("monitor", self.on_monitor_changed)
+        config_watcher.subscribe("format", self.on_format_changed)
+        config_watcher.subscribe("other", self.on_other_changed)
+        config_watcher.start(initial=self.config)
+        
         # Sistem tepsisi simgesi oluştur
         self.icon = pystray.Icon(
             "BerksScreenshotTool",
@@ -315,8 +429,45 @@ class BerksScreenshotTool:
             self.create_menu()
         )
         
-        # Tepsi simgesini çalıştır (bu blocking bir çağrı)
-        self.icon.run()
+        # Tepsi simgesini çalıştır (bu blocking bir çağrı); ısınma simge görününce başlar
+        self.icon.run(setup=self.on_tray_ready)
+    
+    def on_tray_ready(self, icon):
+        """Tepsi simgesi göründükten sonra (pystray'in ayrı thread'inde) ağır modülleri hazırla."""
+        icon.visible = True
+        
+        # Kayıt klasörü (eskiden config import edilirken oluşturuluyordu)
+        get_save_path()
+        
+        try:
+            import_capture_modules()
+            from capture import warm_dxcam_cameras, start_replay_buffer
+        except Exception as e:
+            print(f"[Startup] Yakalama modülleri yüklenemedi: {e}")
+            return
+        
+        # DXcam kamerasını arka planda hazırla
+        warm_dxcam_cameras()
+        
+        # Ön plan uygulamasını arka planda takip et (yakalama anında algılama yapılmaz)
+        foreground_tracker.start()
+        
+        # Önceki çökmelerden kalan geçici dosyaları ve boş rezervasyonları temizle
+        from naming import RESERVATION_LOG_DIR
+        threading.Thread(
+            target=cleanup_orphans, args=(Path(self.config["save_path"]), RESERVATION_LOG_DIR),
+            name="OrphanCleanup", daemon=True
+        ).start()
+        
+        # Anlık tekrar tamponu (ayarlarda açıksa)
+        try:
+            start_replay_buffer()
+        except Exception as e:
+            print(f"[Replay] Başlatılamadı: {e}")
+        
+        # Diğer DPI ölçekleri için simge kareleri (yakalama yolu hazırlandıktan sonra)
+        from tray_icon import ICON_SIZES
+        self.icon_frames.prerender(ICON_SIZES)
 
 
 def main():
@@ -359,15 +510,38 @@ def show_notification_only():
     notification_main()
 
 
+def run_encode_bench():
+    """Kodlayıcı benchmark'ını çalıştır (--bench-encode modu)."""
+    import sys
+    from bench import main as bench_main
+    idx = sys.argv.index("--bench-encode")
+    sys.exit(bench_main(sys.argv[idx + 1:]))
+
+
+def run_trace_stats():
+    """Gecikme istatistiklerini göster (--stats modu)."""
+    import sys
+    from tracing import main as tracing_main
+    idx = sys.argv.index("--stats")
+    sys.exit(tracing_main(sys.argv[idx + 1:]))
+
+
 if __name__ == "__main__":
     import sys
-    import multiprocessing
     
     # PyInstaller için multiprocessing desteği (EXE'de subprocess spawning sorunu çözer)
-    multiprocessing.freeze_support()
+    if getattr(sys, 'frozen', False):
+        import multiprocessing
+        multiprocessing.freeze_support()
     
+    # --bench-encode: kodlayıcı benchmark'ı (tepsi uygulaması başlatılmaz)
+    if "--bench-encode" in sys.argv:
+        run_encode_bench()
+    # --stats: kayıtlı gecikme izlerinden aşama başına p50/p95/p99
+    elif "--stats" in sys.argv:
+        run_trace_stats()
     # --settings argümanı varsa sadece ayarları aç
-    if "--settings" in sys.argv:
+    elif "--settings" in sys.argv:
         open_settings_only()
     # --notification argümanı varsa sadece bildirim göster
     elif "--notification" in sys.argv:
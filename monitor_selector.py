@@ -12,7 +12,6 @@ from PyQt6.QtGui import QFont, QCursor
 from typing import List, Optional
 import sys
 import os
-import mss
 
 # Ana modülü import edebilmek için path ekle
 if getattr(sys, 'frozen', False):
@@ -23,6 +22,7 @@ if _base not in sys.path:
     sys.path.insert(0, _base)
 from config import load_config, save_config
 from i18n import t
+from mss_pool import get_monitor_geometry
 
 
 def get_monitors_info() -> List[dict]:
@@ -32,18 +32,17 @@ def get_monitors_info() -> List[dict]:
     """
     monitors = []
     
-    with mss.mss() as sct:
-        # monitors[0] tüm monitörlerin birleşimi, gerçek monitörler 1'den başlar
-        for i, mon in enumerate(sct.monitors[1:], start=1):
-            monitors.append({
-                "id": i,
-                "name": f"{t('settings_monitor_n')} {i}",
-                "width": mon["width"],
-                "height": mon["height"],
-                "x": mon["left"],
-                "y": mon["top"],
-                "primary": i == 1  # İlk monitör genellikle birincil
-            })
+    # Paylaşılan mss oturumu (capture ile aynı); monitors[0] birleşik alan hariç
+    for i, mon in enumerate(get_monitor_geometry(), start=1):
+        monitors.append({
+            "id": i,
+            "name": f"{t('settings_monitor_n')} {i}",
+            "width": mon["width"],
+            "height": mon["height"],
+            "x": mon["left"],
+            "y": mon["top"],
+            "primary": i == 1  # İlk monitör genellikle birincil
+        })
     
     return monitors
 
@@ -0,0 +1,161 @@
+"""
+GameCapture - Paylaşılan MSS Oturumları
+Her yakalamada mss.mss() açmak monitörleri yeniden listeler ve cihaz
+bağlamlarını yeniden oluşturur. Bu modül thread başına tek bir mss oturumu
+tutar; ekran yapılandırması değişince (çözünürlük, monitör ekleme/çıkarma)
+tüm oturumlar geçersiz sayılır ve ilk kullanımda yeniden açılır.
+mss nesneleri Windows'ta oluşturuldukları thread'e bağlıdır, bu yüzden
+oturumlar thread'ler arasında paylaşılmaz.
+"""
+
+import sys
+import threading
+from typing import Callable, List, Optional
+
+import mss
+
+_local = threading.local()
+_generation = 0
+_generation_lock = threading.Lock()
+_display_signature: Optional[tuple] = None
+
+# Testlerde sahte oturum üretmek için değiştirilebilir
+_session_factory: Callable = mss.mss
+
+
+def _read_display_signature() -> Optional[tuple]:
+    """Sanal ekran geometrisi + monitör sayısı (Windows'ta birkaç µs)."""
+    if sys.platform != "win32":
+        return None
+    try:
+        import ctypes
+        metrics = ctypes.windll.user32.GetSystemMetrics
+        # SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN, SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN, SM_CMONITORS
+        return tuple(metrics(i) for i in (76, 77, 78, 79, 80))
+    except Exception:
+        return None
+
+
+def invalidate_mss_sessions():
+    """Tüm thread'lerdeki oturumları geçersiz kıl (ekran yapılandırması değişti)."""
+    global _generation
+    with _generation_lock:
+        _generation += 1
+
+
+def _check_display_change():
+    """Ekran yapılandırması değiştiyse oturumları geçersiz kıl."""
+    global _display_signature
+    signature = _read_display_signature()
+    if signature is None:
+        return
+    if _display_signature is not None and signature != _display_signature:
+        print("[MSS] Ekran yapılandırması değişti, oturumlar yenileniyor")
+        invalidate_mss_sessions()
+    _display_signature = signature
+
+
+def get_mss():
+    """Bu thread'in mss oturumunu al (gerekirse oluştur)."""
+    _check_display_change()
+
+    sct = getattr(_local, "sct", None)
+    if sct is not None and _local.generation == _generation:
+        return sct
+
+    close_thread_session()
+    sct = _session_factory()
+    _local.sct = sct
+    _local.generation = _generation
+    return sct
+
+
+def close_thread_session():
+    """Bu thread'in oturumunu kapat (thread sonlanmadan önce çağrılabilir)."""
+    sct = getattr(_local, "sct", None)
+    _local.sct = None
+    if sct is not None:
+        try:
+            sct.close()
+        except Exception:
+            pass
+
+
+def get_monitor_geometry() -> List[dict]:
+    """
+    Fiziksel monitörlerin geometrisi (mss sırası, monitors[0] hariç).
+    Returns: [{"left", "top", "width", "height"}, ...]
+    """
+    return [dict(mon) for mon in get_mss().monitors[1:]]
+
+
+if __name__ == "__main__":
+    # Benchmark - yakalama başına gecikme, oturum tekrar kullanımı ile ve olmadan.
+    # Gerçek ölçüm için ekran gerekir; Linux'ta sanal X ekranı ile:
+    #   xvfb-run -s "-screen 0 3840x2160x24" python mss_pool.py
+    # Ekran yoksa --stub ile sahte oturumlarla yalnızca havuz mantığı çalıştırılır.
+    import os
+    import time
+
+    RESOLUTIONS = [("1080p", 1920, 1080), ("1440p", 2560, 1440), ("4K", 3840, 2160)]
+    RUNS = 30
+
+    if "--stub" in sys.argv or (sys.platform.startswith("linux") and not os.environ.get("DISPLAY")):
+        class _StubSession:
+            """Sahte mss: açılış maliyeti monitör listeleme gecikmesiyle taklit edilir."""
+
+            created = 0
+
+            def __init__(self):
+                _StubSession.created += 1
+                time.sleep(0.002)
+                self.monitors = [
+                    {"left": 0, "top": 0, "width": 3840, "height": 2160},
+                    {"left": 0, "top": 0, "width": 3840, "height": 2160},
+                ]
+
+            def grab(self, region):
+                return bytearray(region["width"] * region["height"] * 4)
+
+            def close(self):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                self.close()
+
+        _session_factory = _StubSession
+        print("[stub] Ekran yok - sahte oturumlar kullanılıyor, süreler gerçek değil")
+
+    def bench(region: dict, reuse: bool) -> float:
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            if reuse:
+                get_mss().grab(region)
+            else:
+                with _session_factory() as sct:
+                    sct.grab(region)
+        return (time.perf_counter() - start) / RUNS * 1000
+
+    screen = get_mss().monitors[0]
+    print(f"Ekran: {screen['width']}x{screen['height']}")
+    print(f"{'Çözünürlük':<12}{'Her seferinde yeni':>20}{'Oturum tekrar':>16}")
+    for label, width, height in RESOLUTIONS:
+        region = {
+            "left": screen["left"],
+            "top": screen["top"],
+            "width": min(width, screen["width"]),
+            "height": min(height, screen["height"]),
+        }
+        fresh_ms = bench(region, reuse=False)
+        reused_ms = bench(region, reuse=True)
+        print(f"{label:<12}{fresh_ms:>17.2f} ms{reused_ms:>13.2f} ms")
+
+    # Geçersiz kılma: yeni nesil ilk kullanımda yeni oturum açmalı
+    first = get_mss()
+    assert get_mss() is first
+    invalidate_mss_sessions()
+    assert get_mss() is not first
+    print("✓ Geçersiz kılma sonrası oturum yenilendi")
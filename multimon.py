@@ -0,0 +1,197 @@
+"""
+GameCapture - Çoklu Monitör Yakalama
+"Tüm monitörler" modunda her monitör kendi backend'i ile (mümkünse DXcam)
+paralel yakalanır ve monitör geometrisine göre tek bir tuvale yerleştirilir.
+Yerleştirme de yakalayan thread'de yapılır; numpy kopyaları GIL'i bıraktığı
+için monitörler birbirini beklemez.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from frame import Frame
+
+# Kalıcı yakalama thread'leri (thread başına mss oturumları tekrar kullanılır)
+MAX_WORKERS = 4
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="MultiMon")
+        return _executor
+
+
+def shutdown_executor():
+    """Yakalama thread'lerini kapat (uygulama kapanırken)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+
+def canvas_bounds(geometry: Sequence[dict]) -> Tuple[int, int, int, int]:
+    """Monitörleri kapsayan dikdörtgen: (sol, üst, genişlik, yükseklik)."""
+    left = min(mon["left"] for mon in geometry)
+    top = min(mon["top"] for mon in geometry)
+    right = max(mon["left"] + mon["width"] for mon in geometry)
+    bottom = max(mon["top"] + mon["height"] for mon in geometry)
+    return left, top, right - left, bottom - top
+
+
+def _pixels(image) -> Tuple[np.ndarray, str]:
+    """Frame, numpy dizisi veya PIL Image'ın piksel dizisi ve kanal sırası."""
+    if isinstance(image, Frame):
+        return image.array, image.order
+    if isinstance(image, np.ndarray):
+        return image, "RGB"
+    return np.asarray(image.convert("RGB")), "RGB"
+
+
+def place(canvas: np.ndarray, image, x: int, y: int, width: int, height: int):
+    """Kareyi tuvalde (x, y) konumuna kopyala; kanal dönüşümü kopya sırasında yapılır."""
+    array, order = _pixels(image)
+    h = min(array.shape[0], height, canvas.shape[0] - y)
+    w = min(array.shape[1], width, canvas.shape[1] - x)
+    if h <= 0 or w <= 0:
+        return
+    src = array[:h, :w, :3] if order == "RGB" else array[:h, :w, 2::-1]
+    np.copyto(canvas[y:y + h, x:x + w], src)
+
+
+def capture_monitors(grab: Callable[[int], object], monitors: Sequence[int]) -> List[Optional[object]]:
+    """
+    Monitörleri paralel yakala.
+
+    Args:
+        grab: grab(monitör_indeksi) -> kare (hata fırlatabilir)
+        monitors: Monitör indeksleri (0 = birincil)
+
+    Returns:
+        Monitör sırasında kareler; başarısız olanlar None
+    """
+    futures = [_get_executor().submit(grab, monitor) for monitor in monitors]
+    frames = []
+    for monitor, future in zip(monitors, futures):
+        try:
+            frames.append(future.result())
+        except Exception as e:
+            print(f"[MultiMon] Monitör {monitor + 1} yakalanamadı: {e}")
+            frames.append(None)
+    return frames
+
+
+def capture_stitched(grab: Callable[[int], object], geometry: Sequence[dict]) -> Optional[np.ndarray]:
+    """
+    Tüm monitörleri paralel yakala ve tek RGB tuvale yerleştir.
+    Monitörlerin kapsamadığı alanlar ve yakalanamayan monitörler siyah kalır.
+
+    Args:
+        grab: grab(monitör_indeksi) -> kare
+        geometry: [{"left", "top", "width", "height"}, ...] (monitör sırasında)
+
+    Returns:
+        RGB tuval veya hiçbir monitör yakalanamadıysa None
+    """
+    left, top, width, height = canvas_bounds(geometry)
+    canvas = np.zeros((height, width, 3), dtype=np.uint8)
+
+    def grab_and_place(index: int) -> bool:
+        image = grab(index)
+        if image is None:
+            return False
+        mon = geometry[index]
+        place(canvas, image, mon["left"] - left, mon["top"] - top, mon["width"], mon["height"])
+        return True
+
+    results = capture_monitors(grab_and_place, range(len(geometry)))
+    if not any(results):
+        return None
+    return canvas
+
+
+if __name__ == "__main__":
+    # Benchmark - sentetik 3x4K düzenler: tek büyük blit vs paralel monitör başına yakalama
+    import time
+
+    # Yakalama gecikmesi taklidi (GPU/BitBlt beklemesi GIL'i bırakır)
+    GRAB_LATENCY = 0.012
+    RUNS = 10
+    W, H = 3840, 2160
+
+    layouts = {
+        "yan yana": [
+            {"left": 0, "top": 0, "width": W, "height": H},
+            {"left": W, "top": 0, "width": W, "height": H},
+            {"left": 2 * W, "top": 0, "width": W, "height": H},
+        ],
+        "ortada birincil": [
+            {"left": 0, "top": 0, "width": W, "height": H},
+            {"left": -W, "top": 300, "width": W, "height": H},
+            {"left": W, "top": -400, "width": W, "height": H},
+        ],
+        "dikey + yatay": [
+            {"left": 0, "top": 0, "width": W, "height": H},
+            {"left": W, "top": -840, "width": H, "height": W},
+            {"left": 0, "top": H, "width": W, "height": H},
+        ],
+    }
+
+    rng = np.random.default_rng(0)
+    sources = {}
+
+    def source_for(mon: dict) -> np.ndarray:
+        key = (mon["width"], mon["height"])
+        if key not in sources:
+            sources[key] = rng.integers(0, 256, (mon["height"], mon["width"], 4), dtype=np.uint8)
+        return sources[key]
+
+    def make_grab(geometry):
+        def grab(index: int) -> Frame:
+            time.sleep(GRAB_LATENCY)
+            return Frame(source_for(geometry[index]), "BGRA")
+        return grab
+
+    def giant_blit(geometry) -> np.ndarray:
+        """Eski yol: sanal ekranın tamamı tek BitBlt, ardından BGRA -> RGB."""
+        left, top, width, height = canvas_bounds(geometry)
+        time.sleep(GRAB_LATENCY * len(geometry))  # tek blit tüm alanı kopyalar
+        bgra = np.zeros((height, width, 4), dtype=np.uint8)
+        for mon in geometry:
+            x, y = mon["left"] - left, mon["top"] - top
+            bgra[y:y + mon["height"], x:x + mon["width"]] = source_for(mon)
+        return np.ascontiguousarray(bgra[:, :, 2::-1])
+
+    def timed(func) -> Tuple[float, object]:
+        func()  # ısınma
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            result = func()
+        return (time.perf_counter() - start) / RUNS * 1000, result
+
+    print(f"{'Düzen':<18}{'Tuval':>12}{'Tek blit':>12}{'Paralel':>12}")
+    for name, geometry in layouts.items():
+        grab = make_grab(geometry)
+        old_ms, old = timed(lambda: giant_blit(geometry))
+        new_ms, new = timed(lambda: capture_stitched(grab, geometry))
+        assert np.array_equal(old, new), f"{name}: tuval uyuşmazlığı"
+        _, _, width, height = canvas_bounds(geometry)
+        print(f"{name:<18}{width:>6}x{height:<5}{old_ms:>9.1f} ms{new_ms:>9.1f} ms")
+    print("✓ Paralel tuval tek blit ile piksel piksel aynı")
+
+    # Yakalanamayan monitör siyah kalır, diğerleri yerleştirilir
+    geometry = layouts["yan yana"]
+    grab = make_grab(geometry)
+    canvas = capture_stitched(lambda i: None if i == 1 else grab(i), geometry)
+    assert not canvas[:, W:2 * W].any() and canvas[:, :W].any()
+    assert capture_stitched(lambda i: None, geometry) is None
+    print("✓ Başarısız monitör siyah bırakıldı, hepsi başarısızsa None")
+    shutdown_executor()
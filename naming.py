@@ -3,23 +3,38 @@ GameCapture - Akıllı Dosya İsimlendirme
 Shadowplay benzeri dosya isimlendirme sistemi.
 """
 
+import os
+import re
+import threading
 from datetime import datetime
 from pathlib import Path
-from config import load_config
+from typing import Dict, Optional
+from atomic_write import note_reservation
+from config import load_config, get_app_dir
+from tracing import tracer
 
+# Rezervasyon günlükleri (kayıt klasörü başına bir dosya, bkz. atomic_write)
+RESERVATION_LOG_DIR = get_app_dir() / "reservations"
 
-def generate_filename(app_name: str, format: str = None) -> str:
+# "ad_12.png" -> ("ad", "12", ".png")
+_SUFFIX_RE = re.compile(r"^(.*)_(\d+)(\.[^.]*)$")
+
+
+def generate_filename(app_name: str, format: str = None, when: Optional[datetime] = None) -> str:
     """
     Akıllı dosya adı oluştur.
     Örnek: Cyberpunk 2077_2026-01-24_17-45-30.png
+    
+    Args:
+        when: Yakalama anı (varsayılan: şimdi; seri çekimde her karenin kendi anı)
     """
     config = load_config()
     
     if format is None:
         format = config.get("format", "png")
     
-    # Şu anki tarih ve saat
-    now = datetime.now()
+    # Yakalama anının tarih ve saati
+    now = when or datetime.now()
     date_str = now.strftime("%Y-%m-%d")
     time_str = now.strftime("%H-%M-%S")
     
@@ -39,54 +54,235 @@ def generate_filename(app_name: str, format: str = None) -> str:
     return filename
 
 
-def get_unique_filepath(save_dir: Path, filename: str) -> Path:
+class _DirectoryIndex:
     """
-    Benzersiz dosya yolu oluştur.
-    Dosya zaten varsa sayaç ekle: dosya_1.png, dosya_2.png, vb.
+    Kayıt klasöründeki dosya adlarının bellek içi indeksi.
+    
+    Klasör bir kez scandir ile taranır; sonra yazdığımız dosyalar indekse
+    eklenir. Klasörün mtime'ı dışarıdan değişirse yeniden taranır. Her
+    (kök ad, uzantı) için görülen en büyük sayaç tutulur, böylece sıradaki
+    boş sayaç tek adımda bulunur.
     """
-    filepath = save_dir / filename
     
-    if not filepath.exists():
-        return filepath
+    def __init__(self, path: Path):
+        self.path = path
+        self.names = set()
+        self.max_suffix: Dict[tuple, int] = {}
+        self.mtime: Optional[int] = None
+        self.scans = 0
     
-    # Dosya varsa, sayaç ekle
-    stem = filepath.stem
-    suffix = filepath.suffix
-    counter = 1
+    def _dir_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
     
-    while filepath.exists():
-        new_filename = f"{stem}_{counter}{suffix}"
-        filepath = save_dir / new_filename
-        counter += 1
+    def _note(self, name: str):
+        key_name = os.path.normcase(name)
+        self.names.add(key_name)
+        match = _SUFFIX_RE.match(key_name)
+        if match:
+            key = (match.group(1), match.group(3))
+            counter = int(match.group(2))
+            if counter > self.max_suffix.get(key, 0):
+                self.max_suffix[key] = counter
     
-    return filepath
+    def refresh_if_stale(self):
+        """Klasör dışarıdan değiştiyse yeniden tara (tek stat ile kontrol)."""
+        mtime = self._dir_mtime()
+        if mtime is not None and mtime == self.mtime:
+            return
+        
+        self.names = set()
+        self.max_suffix = {}
+        try:
+            with os.scandir(self.path) as entries:
+                for entry in entries:
+                    self._note(entry.name)
+        except OSError:
+            pass
+        self.mtime = mtime
+        self.scans += 1
+    
+    def contains(self, name: str) -> bool:
+        return os.path.normcase(name) in self.names
+    
+    def next_counter(self, stem: str, suffix: str) -> int:
+        key = (os.path.normcase(stem), os.path.normcase(suffix))
+        return self.max_suffix.get(key, 0) + 1
+    
+    def add(self, name: str):
+        """Kendi oluşturduğumuz dosyayı indekse ekle."""
+        self._note(name)
+        self.mtime = self._dir_mtime()
+    
+    def discard(self, name: str):
+        self.names.discard(os.path.normcase(name))
+        self.mtime = self._dir_mtime()
 
 
-def get_screenshot_path(app_name: str, format: str = None, save_dir: Path = None) -> Path:
-    """
-    Ekran görüntüsü için tam dosya yolunu al.
+_indexes: Dict[str, _DirectoryIndex] = {}
+_index_lock = threading.Lock()
+
+
+def _get_index(save_dir: Path) -> _DirectoryIndex:
+    key = os.path.normcase(os.path.abspath(save_dir))
+    index = _indexes.get(key)
+    if index is None:
+        index = _DirectoryIndex(save_dir)
+        _indexes[key] = index
+    return index
+
+
+def _try_reserve(filepath: Path) -> bool:
+    """Dosyayı atomik olarak (O_EXCL) oluşturarak adı rezerve et."""
+    try:
+        fd = os.open(filepath, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    os.close(fd)
+    # Çökmeden kalırsa başlangıç temizliği yalnızca günlükteki adları siler
+    note_reservation(filepath, RESERVATION_LOG_DIR)
+    return True
+
+
+def get_unique_filepath(save_dir: Path, filename: str) -> Path:
     """
-    config = load_config()
-    
-    if save_dir is None:
-        save_dir = Path(config.get("save_path", Path.home() / "Pictures" / "GameCapture"))
-    
-    # Klasörün var olduğundan emin ol
-    save_dir.mkdir(parents=True, exist_ok=True)
+    Benzersiz dosya yolu oluştur ve rezerve et.
+    Dosya zaten varsa sayaç ekle: dosya_1.png, dosya_2.png, vb.
     
-    # Dosya adı oluştur
-    filename = generate_filename(app_name, format)
+    Ad, boş bir dosya atomik olarak (O_CREAT | O_EXCL) oluşturularak
+    rezerve edilir; aynı anda çalışan iki yakalama asla aynı adı alamaz.
+    Kayıt başarısız olursa release_filepath() ile bırakılmalıdır.
+    """
+    stem, suffix = os.path.splitext(filename)
     
-    # Benzersiz yol al
-    filepath = get_unique_filepath(save_dir, filename)
+    with _index_lock:
+        index = _get_index(save_dir)
+        index.refresh_if_stale()
+        
+        candidate = filename
+        if index.contains(candidate):
+            candidate = f"{stem}_{index.next_counter(stem, suffix)}{suffix}"
+        
+        # İndeks bayatsa (dış yazıcı) O_EXCL çakışmayı yakalar
+        while not _try_reserve(save_dir / candidate):
+            index.add(candidate)
+            candidate = f"{stem}_{index.next_counter(stem, suffix)}{suffix}"
+        
+        index.add(candidate)
+        return save_dir / candidate
+
+
+def release_filepath(filepath: Path):
+    """Rezerve edilmiş ama yazılamamış (boş) dosyayı sil."""
+    with _index_lock:
+        try:
+            if filepath.stat().st_size == 0:
+                filepath.unlink()
+        except OSError:
+            return
+        _get_index(filepath.parent).discard(filepath.name)
+
+
+def note_replaced(filepath: Path):
+    """
+    Rezerve edilmiş ad yerine kendi geçici dosyamız taşındı (atomik yazım):
+    ad kümesi değişmedi, yalnızca klasör mtime'ı güncellenir ki indeks
+    gereksiz yere yeniden taranmasın. Aradaki dış değişiklikler O_EXCL ile
+    yine yakalanır.
+    """
+    with _index_lock:
+        index = _indexes.get(os.path.normcase(os.path.abspath(filepath.parent)))
+        if index is not None and index.mtime is not None:
+            index.mtime = index._dir_mtime()
+
+
+def get_screenshot_path(
+    app_name: str,
+    format: str = None,
+    save_dir: Path = None,
+    when: Optional[datetime] = None
+) -> Path:
+    """
+    Ekran görüntüsü için tam dosya yolunu al.
+    when verilirse ad bu andan üretilir (bkz. generate_filename).
+    """
+    with tracer.span("filename"):
+        config = load_config()
+        
+        if save_dir is None:
+            save_dir = Path(config.get("save_path", Path.home() / "Pictures" / "GameCapture"))
+        
+        # Klasörün var olduğundan emin ol
+        save_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Dosya adı oluştur
+        filename = generate_filename(app_name, format, when)
+        
+        # Benzersiz yol al
+        filepath = get_unique_filepath(save_dir, filename)
     
     return filepath
 
 
 if __name__ == "__main__":
-    # Test
-    test_path = get_screenshot_path("Cyberpunk 2077", "png")
-    print(f"Örnek dosya yolu: {test_path}")
+    import sys
     
-    test_path2 = get_screenshot_path("Masaustu", "jpg")
-    print(f"Örnek dosya yolu 2: {test_path2}")
+    if "--bench" in sys.argv:
+        # Benchmark - N çakışmalı sentetik klasörde stat döngüsü vs indeks
+        import shutil
+        import tempfile
+        import time
+        
+        def probe_unique_filepath(save_dir: Path, filename: str) -> Path:
+            """Eski yöntem: her aday için bir exists() çağrısı."""
+            filepath = save_dir / filename
+            stem, suffix = filepath.stem, filepath.suffix
+            counter = 1
+            while filepath.exists():
+                filepath = save_dir / f"{stem}_{counter}{suffix}"
+                counter += 1
+            return filepath
+        
+        idx = sys.argv.index("--bench")
+        count = int(sys.argv[idx + 1]) if len(sys.argv) > idx + 1 else 100_000
+        base = "App_2026-01-24_17-45-30"
+        bench_dir = Path(tempfile.mkdtemp(prefix="bst_naming_"))
+        try:
+            print(f"{count:,} dosya oluşturuluyor: {bench_dir}")
+            open(bench_dir / f"{base}.png", "wb").close()
+            for i in range(1, count):
+                open(bench_dir / f"{base}_{i}.png", "wb").close()
+            
+            start = time.perf_counter()
+            old_path = probe_unique_filepath(bench_dir, f"{base}.png")
+            old_ms = (time.perf_counter() - start) * 1000
+            
+            start = time.perf_counter()
+            first = get_unique_filepath(bench_dir, f"{base}.png")
+            scan_ms = (time.perf_counter() - start) * 1000
+            
+            runs = 1000
+            start = time.perf_counter()
+            for _ in range(runs):
+                get_unique_filepath(bench_dir, f"{base}.png")
+            steady_us = (time.perf_counter() - start) / runs * 1_000_000
+            
+            assert first.name == old_path.name, (first.name, old_path.name)
+            print(f"  Eski stat döngüsü:        {old_ms:10.1f} ms / dosya")
+            print(f"  İndeks (ilk tarama):      {scan_ms:10.1f} ms")
+            print(f"  İndeks (kararlı durum):   {steady_us:10.1f} µs / dosya")
+        finally:
+            shutil.rmtree(bench_dir, ignore_errors=True)
+    else:
+        # Test
+        test_path = get_screenshot_path("Cyberpunk 2077", "png")
+        print(f"Örnek dosya yolu: {test_path}")
+        
+        test_path2 = get_screenshot_path("Masaustu", "jpg")
+        print(f"Örnek dosya yolu 2: {test_path2}")
+        
+        # Rezerve edilen boş dosyaları temizle
+        release_filepath(test_path)
+        release_filepath(test_path2)
@@ -1,47 +1,220 @@
 """
 GameCapture - Özel Bildirim Sistemi
-Windows Toast tarzı bildirim - subprocess ile güvenilir.
+Windows Toast tarzı bildirim - kalıcı bildirim sunucusu (stdin IPC) ile.
+Sunucu çalışmazsa her bildirim için ayrı process başlatılır (eski yöntem).
 """
 
+import json
 import subprocess
 import sys
 import os
+import threading
+from typing import Optional
+
+from tracing import tracer
+
+# Windows dışında bu sabit yok (headless testler için)
+_CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+# Sunucuya toplamda bu kadar kez ulaşılamazsa kalıcı olarak eski yönteme geç
+MAX_HOST_FAILURES = 3
+
+_host_proc: Optional[subprocess.Popen] = None
+_host_lock = threading.Lock()
+_host_failures = 0
+
+
+def encode_message(message: str, duration: float, dark_mode: bool, title: str) -> bytes:
+    """Bildirimi sunucu protokolüne (tek satır JSON) çevir."""
+    payload = {
+        "message": message,
+        "duration": duration,
+        "dark_mode": dark_mode,
+        "title": title,
+    }
+    return (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def decode_message(line: bytes) -> Optional[dict]:
+    """Protokol satırını çöz, geçersizse None döndür."""
+    try:
+        payload = json.loads(line.decode("utf-8"))
+        return {
+            "message": str(payload["message"]),
+            "duration": float(payload.get("duration", 2.0)),
+            "dark_mode": bool(payload.get("dark_mode", True)),
+            "title": str(payload.get("title", "Screenshot Taken")),
+        }
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _process_command(*args: str) -> list:
+    """Bildirim process'i için komut satırını oluştur."""
+    if getattr(sys, 'frozen', False):
+        # Frozen EXE - notification modunu ayrı process olarak başlat
+        return [sys.executable, "--notification", *args]
+    # Python script - doğrudan _notification_process.py'yi çalıştır
+    script_path = os.path.join(os.path.dirname(__file__), "_notification_process.py")
+    return [sys.executable, script_path, *args]
+
+
+def _get_host() -> Optional[subprocess.Popen]:
+    """Bildirim sunucusunu al, gerekirse başlat (_host_lock altında çağrılmalı)."""
+    global _host_proc
+
+    if _host_proc is not None and _host_proc.poll() is None:
+        return _host_proc
+
+    if _host_failures >= MAX_HOST_FAILURES:
+        return None
+
+    _host_proc = subprocess.Popen(
+        _process_command("--server"),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        creationflags=_CREATE_NO_WINDOW
+    )
+    return _host_proc
+
+
+def _send_to_host(payload: bytes) -> bool:
+    """Mesajı sunucuya gönder. Başarısız olursa sunucuyu bırak ve False döndür."""
+    global _host_proc, _host_failures
+
+    with _host_lock:
+        proc = _host_proc
+        if proc is not None and proc.poll() is not None:
+            # Sunucu önceki başarılı yazmadan sonra çökmüş: çökme sayılır, bu
+            # bildirim eski yöntemle gösterilir (sürekli çöken sunucu sonsuza
+            # kadar yeniden başlatılmaz)
+            _host_failures += 1
+            print(f"[Notification] Sunucu kapanmış (kod {proc.returncode}) "
+                  f"({_host_failures}/{MAX_HOST_FAILURES})")
+            _host_proc = None
+            return False
+
+        proc = None
+        try:
+            proc = _get_host()
+            if proc is None:
+                return False
+            proc.stdin.write(payload)
+            proc.stdin.flush()
+            return True
+        except (OSError, ValueError) as e:
+            _host_failures += 1
+            print(f"[Notification] Sunucuya ulaşılamadı ({_host_failures}/{MAX_HOST_FAILURES}): {e}")
+            if proc is not None:
+                try:
+                    proc.kill()
+                except OSError:
+                    pass
+            _host_proc = None
+            return False
+
+
+def _spawn_notification(message: str, duration: float, dark_mode: bool, title: str):
+    """Eski yöntem: bildirim için yeni bir process başlat."""
+    subprocess.Popen(
+        _process_command(message, str(duration), str(dark_mode), title),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        creationflags=_CREATE_NO_WINDOW
+    )
 
 
 def show_notification(message: str = "", duration: float = 2.0, dark_mode: bool = True, title: str = "Screenshot Taken"):
     """
-    Bildirim göster - ayrı bir Python process'inde çalışır.
-    Bu yaklaşım Tkinter thread sorunlarını tamamen önler.
+    Bildirim göster - kalıcı bildirim sunucusu üzerinden.
+    Sunucu ilk bildirimde başlatılır; ölürse bu bildirim eski yöntemle
+    (ayrı process) gösterilir ve sonraki bildirimde sunucu yeniden denenir.
+    MAX_HOST_FAILURES çökmeden sonra kalıcı olarak eski yönteme geçilir.
     """
     try:
-        # EXE mi yoksa Python script mi kontrol et
-        if getattr(sys, 'frozen', False):
-            # Frozen EXE - notification modunu ayrı process olarak başlat
-            subprocess.Popen(
-                [sys.executable, "--notification", message, str(duration), str(dark_mode), title],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-        else:
-            # Python script - doğrudan _notification_process.py'yi çalıştır
-            script_path = os.path.join(os.path.dirname(__file__), "_notification_process.py")
-            subprocess.Popen(
-                [sys.executable, script_path, message, str(duration), str(dark_mode), title],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
+        with tracer.span("notify"):
+            if not _send_to_host(encode_message(message, duration, dark_mode, title)):
+                _spawn_notification(message, duration, dark_mode, title)
     except Exception as e:
         print(f"Bildirim baslatilamadi: {e}")
 
 
+def shutdown_notification_host(timeout: float = 1.0):
+    """Bildirim sunucusunu kapat (stdin kapanınca sunucu kendiliğinden çıkar)."""
+    global _host_proc
+
+    with _host_lock:
+        proc = _host_proc
+        _host_proc = None
+
+    if proc is None:
+        return
+
+    try:
+        proc.stdin.close()
+        proc.wait(timeout=timeout)
+    except Exception:
+        try:
+            proc.kill()
+        except OSError:
+            pass
+
+
 if __name__ == "__main__":
-    # Test
-    import time
-    print("Bildirim testi başlıyor...")
-    show_notification("Test_Screenshot_2026-01-24.webp", duration=2.0, dark_mode=True)
-    time.sleep(5)
-    show_notification("Light mode test", duration=2.0, dark_mode=False)
-    time.sleep(5)
-    print("Test tamamlandı.")
+    if "--host-test" in sys.argv:
+        # Headless protokol testi: QT_QPA_PLATFORM=offscreen ile Linux'ta çalışır
+        import time
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+        line = encode_message("Test_2026-01-24.png", 0.2, True, "Screenshot Taken")
+        assert decode_message(line)["message"] == "Test_2026-01-24.png"
+        assert decode_message(b"not json\n") is None
+        assert decode_message(b'{"duration": 1}\n') is None
+        print("✓ Protokol kodlama/çözme")
+
+        for i in range(20):
+            show_notification(f"burst_{i}.png", duration=0.2, dark_mode=i % 2 == 0)
+        host = _host_proc
+        assert host is not None, "Sunucu başlatılamadı"
+        time.sleep(1.5)
+        assert host.poll() is None, "Sunucu beklenmedik şekilde kapandı"
+        print(f"✓ Tek sunucu ile 20 bildirim (PID={host.pid})")
+
+        # Sunucu ölürse: o anki bildirim eski yöntemle gider (çökme sayılır),
+        # sonraki bildirimde sunucu yeniden başlatılır
+        host.kill()
+        host.wait()
+        show_notification("after_crash.png", duration=0.2)
+        assert _host_proc is None and _host_failures == 1
+        show_notification("after_restart.png", duration=0.2)
+        assert _host_proc is not None and _host_proc.pid != host.pid
+        print(f"✓ Çöken sunucu sayıldı ve yeniden başlatıldı (PID={_host_proc.pid})")
+
+        restarted = _host_proc
+        shutdown_notification_host(timeout=5.0)
+        assert restarted.poll() == 0, restarted.poll()
+        print("✓ stdin kapanınca sunucu temiz çıktı")
+
+        # Sürekli çöken sunucu: MAX_HOST_FAILURES'tan sonra yeniden başlatılmaz
+        while _host_failures < MAX_HOST_FAILURES:
+            assert _send_to_host(line)
+            _host_proc.kill()
+            _host_proc.wait()
+            assert not _send_to_host(line)
+        assert not _send_to_host(line) and _host_proc is None
+        print(f"✓ {MAX_HOST_FAILURES} çökmeden sonra sunucu bırakıldı")
+
+        # Sunucu kullanılamıyorsa eski yöntem (ayrı process) devreye girmeli
+        show_notification("fallback.png", duration=0.2)
+        print("✓ Sunucu yokken eski yönteme geçildi")
+    else:
+        # Test
+        import time
+        print("Bildirim testi başlıyor...")
+        show_notification("Test_Screenshot_2026-01-24.webp", duration=2.0, dark_mode=True)
+        time.sleep(5)
+        show_notification("Light mode test", duration=2.0, dark_mode=False)
+        time.sleep(5)
+        shutdown_notification_host()
+        print("Test tamamlandı.")
@@ -0,0 +1,418 @@
+"""
+GameCapture - Çok Çekirdekli PNG Yazıcı
+Görüntü yatay şeritlere bölünür; her şerit ayrı bir thread'de filtrelenir
+(numpy) ve ham deflate akışı olarak sıkıştırılır. Şeritler Z_FULL_FLUSH ile
+bayt sınırında biter, böylece art arda eklenince tek geçerli zlib akışı
+oluşur. Adler-32 sağlamaları şerit başına hesaplanıp birleştirilir.
+Sıkıştırma oranı kaybını azaltmak için her şerit önceki 32 KB filtrelenmiş
+veriyi sözlük (zdict) olarak kullanır.
+Şeritler kare tamponundan doğrudan okunur ve bitenler sırayla dosyaya
+yazılır; aynı anda yalnızca sınırlı sayıda şerit bellekte tutulur, yani
+kayıt başına bellek tam görüntüye değil şerit boyutuna bağlıdır.
+"""
+
+import os
+import struct
+import sys
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from frame import Frame
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Deflate penceresi (sözlük en fazla bu kadar bayt olabilir)
+WINDOW_SIZE = 32768
+
+# Paeth filtresi bu kadar satırlık bloklarla hesaplanır
+_PAETH_BLOCK_ROWS = 8
+
+# PNG filtre türleri
+FILTER_NONE, FILTER_SUB, FILTER_UP, FILTER_AVG, FILTER_PAETH = range(5)
+
+# Hazır ayarlar: zlib seviyesi, filtre ("up" veya "adaptive"), şerit yüksekliği, sözlük
+PRESETS = {
+    "fast": {"level": 1, "filter": "up", "strip_rows": 64, "zdict": False},
+    "balanced": {"level": 6, "filter": "adaptive", "strip_rows": 64, "zdict": True},
+    "smallest": {"level": 9, "filter": "adaptive", "strip_rows": 128, "zdict": True},
+}
+DEFAULT_PRESET = "balanced"
+
+# Sıkıştırma thread'leri ve yazılmayı bekleyebilecek en fazla şerit
+WORKERS = max(1, min(8, os.cpu_count() or 1))
+MAX_IN_FLIGHT = 2 * WORKERS
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Paylaşılan sıkıştırma havuzu (zlib ve numpy GIL'i bırakır)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="PNGWriter")
+        return _executor
+
+
+def adler32_combine(adler1: int, adler2: int, len2: int) -> int:
+    """İki ardışık bloğun Adler-32 değerini birleştir (zlib'in adler32_combine'ı)."""
+    base = 65521
+    rem = len2 % base
+    sum1 = adler1 & 0xFFFF
+    sum2 = (rem * sum1) % base
+    sum1 += (adler2 & 0xFFFF) + base - 1
+    sum2 += ((adler1 >> 16) & 0xFFFF) + ((adler2 >> 16) & 0xFFFF) + base - rem
+    if sum1 >= base:
+        sum1 -= base
+    if sum1 >= base:
+        sum1 -= base
+    if sum2 >= (base << 1):
+        sum2 -= (base << 1)
+    if sum2 >= base:
+        sum2 -= base
+    return sum1 | (sum2 << 16)
+
+
+def _pixel_source(image) -> Tuple[np.ndarray, str]:
+    """Frame, numpy dizisi veya PIL Image'ın piksel dizisi ve kanal sırası."""
+    if isinstance(image, Frame):
+        return image.array, image.order
+    if isinstance(image, np.ndarray):
+        return image, "RGB"
+    return np.asarray(image.convert("RGB")), "RGB"
+
+
+def _rgb_rows(array: np.ndarray, order: str, y0: int, y1: int) -> np.ndarray:
+    """[y0, y1) satırları (satır, genişlik*3) RGB baytları olarak - yalnızca şerit kopyalanır."""
+    rows = array[y0:y1]
+    if order == "RGB":
+        rows = rows[:, :, :3]
+    else:
+        rows = rows[:, :, 2::-1]
+    rows = np.ascontiguousarray(rows)
+    return rows.reshape(rows.shape[0], -1)
+
+
+def filter_rows(rows: np.ndarray, prior: np.ndarray, mode: str = "adaptive", bpp: int = 3) -> np.ndarray:
+    """
+    Satırlara PNG filtresi uygula (vektörel).
+
+    Args:
+        rows: (n, satır_baytı) uint8 ham satırlar
+        prior: İlk satırın üstündeki satır (görüntünün başıysa sıfırlar)
+        mode: "none", "sub", "up", "avg", "paeth" veya "adaptive"
+
+    Returns:
+        (n, satır_baytı + 1) uint8 - her satırın başında filtre türü baytı
+    """
+    n, length = rows.shape
+    up = np.empty_like(rows)
+    up[0] = prior
+    up[1:] = rows[:-1]
+
+    def sub() -> np.ndarray:
+        out = rows.copy()
+        out[:, bpp:] -= rows[:, :-bpp]
+        return out
+
+    def up_filter() -> np.ndarray:
+        return rows - up
+
+    def left_of(a: np.ndarray) -> np.ndarray:
+        left = np.zeros_like(a)
+        left[:, bpp:] = a[:, :-bpp]
+        return left
+
+    def avg() -> np.ndarray:
+        # floor((a + b) / 2) taşmadan, uint8 içinde: (a & b) + ((a ^ b) >> 1)
+        left = left_of(rows)
+        mean = left & up
+        left ^= up
+        left >>= 1
+        mean += left
+        return rows - mean
+
+    def paeth() -> np.ndarray:
+        # int16 ara dizileri büyük; bellek tepe değeri için satır blokları halinde
+        result = np.empty_like(rows)
+        for r in range(0, n, _PAETH_BLOCK_ROWS):
+            block = slice(r, r + _PAETH_BLOCK_ROWS)
+            a = left_of(rows[block]).astype(np.int16)
+            b = up[block].astype(np.int16)
+            c = left_of(up[block]).astype(np.int16)
+            pa = np.abs(b - c)
+            pb = np.abs(a - c)
+            pc = np.abs(a + b - 2 * c)
+            pred = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+            np.subtract(rows[block], pred.astype(np.uint8), out=result[block])
+        return result
+
+    out = np.empty((n, length + 1), dtype=np.uint8)
+    single = {"none": (FILTER_NONE, lambda: rows), "sub": (FILTER_SUB, sub), "up": (FILTER_UP, up_filter),
+              "avg": (FILTER_AVG, avg), "paeth": (FILTER_PAETH, paeth)}
+    if mode in single:
+        ftype, func = single[mode]
+        out[:, 0] = ftype
+        out[:, 1:] = func()
+        return out
+
+    # Uyarlamalı: her satır için işaretli bayt mutlak toplamı en küçük filtre (libpng sezgiseli).
+    # Filtreler tek tek denenir, yalnızca şimdiye kadarki en iyi satırlar tutulur.
+    out[:, 0] = FILTER_NONE
+    out[:, 1:] = rows
+    best = _row_costs(rows)
+    for ftype, func in ((FILTER_SUB, sub), (FILTER_UP, up_filter), (FILTER_AVG, avg), (FILTER_PAETH, paeth)):
+        candidate = func()
+        costs = _row_costs(candidate)
+        better = costs < best
+        if better.any():
+            out[better, 0] = ftype
+            out[better, 1:] = candidate[better]
+            best[better] = costs[better]
+    return out
+
+
+def _row_costs(filtered: np.ndarray) -> np.ndarray:
+    """Satır başına işaretli bayt mutlak toplamı (int8 abs(-128) uint8 olarak 128 okunur)."""
+    return np.abs(filtered.view(np.int8)).view(np.uint8).sum(axis=1, dtype=np.uint32)
+
+
+def _encode_strip(array: np.ndarray, order: str, y0: int, y1: int, params: dict,
+                  is_last: bool) -> Tuple[bytes, int, int]:
+    """
+    Bir şeridi filtrele ve ham deflate ile sıkıştır.
+
+    Returns:
+        (sıkıştırılmış_bayt, adler32, filtrelenmiş_uzunluk)
+    """
+    width = array.shape[1]
+    row_bytes = width * 3 + 1
+
+    # Sözlük: önceki şeridin son satırları burada yeniden filtrelenir (satırın
+    # filtresi yalnızca kendisine ve üst satıra bağlı, sonuç aynı olur)
+    context = 0
+    if params["zdict"] and y0 > 0:
+        context = min(y0, -(-WINDOW_SIZE // row_bytes))
+    start = y0 - context
+
+    rows = _rgb_rows(array, order, start, y1)
+    if start > 0:
+        prior = _rgb_rows(array, order, start - 1, start)[0]
+    else:
+        prior = np.zeros(rows.shape[1], dtype=np.uint8)
+    filtered = filter_rows(rows, prior, params["filter"]).reshape(-1)
+
+    split = context * row_bytes
+    data = filtered[split:]
+    kwargs = {}
+    if context:
+        kwargs["zdict"] = filtered[max(0, split - WINDOW_SIZE):split].tobytes()
+    compressor = zlib.compressobj(params["level"], zlib.DEFLATED, -15, 9, zlib.Z_DEFAULT_STRATEGY, **kwargs)
+    compressed = compressor.compress(data) + compressor.flush(zlib.Z_FINISH if is_last else zlib.Z_FULL_FLUSH)
+    return compressed, zlib.adler32(data), data.nbytes
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)))
+
+
+def _zlib_header(level: int) -> bytes:
+    """FDICT=0 zlib başlığı; FLEVEL yalnızca bilgi amaçlıdır."""
+    flevel = 0 if level <= 1 else 1 if level <= 5 else 2 if level == 6 else 3
+    cmf = 0x78
+    flg = flevel << 6
+    flg += 31 - ((cmf << 8) + flg) % 31
+    return bytes((cmf, flg))
+
+
+def write_png(image, filepath: Path, preset: str = DEFAULT_PRESET):
+    """
+    Görüntüyü çok çekirdekli PNG olarak yaz.
+
+    Args:
+        image: Frame, RGB numpy dizisi veya PIL Image
+        filepath: Kayıt yolu veya yazılabilir dosya nesnesi
+        preset: "fast", "balanced" veya "smallest"
+    """
+    _write_png(image, filepath, PRESETS.get(preset, PRESETS[DEFAULT_PRESET]))
+
+
+def _write_png(image, filepath: Path, params: dict, max_in_flight: Optional[int] = None):
+    array, order = _pixel_source(image)
+    height, width = array.shape[:2]
+    strip_rows = params["strip_rows"]
+    bounds = [(y, min(y + strip_rows, height)) for y in range(0, height, strip_rows)]
+    executor = _get_executor()
+    window = max_in_flight or MAX_IN_FLIGHT
+
+    def strips():
+        """Şerit sonuçları sırayla; aynı anda en fazla `window` şerit bellekte."""
+        pending = deque()
+        for i, (y0, y1) in enumerate(bounds):
+            pending.append(executor.submit(_encode_strip, array, order, y0, y1, params, i == len(bounds) - 1))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    # Dosya yolu veya yazılabilir dosya nesnesi (ör. BytesIO)
+    if hasattr(filepath, "write"):
+        _write_chunks(filepath, width, height, params, strips())
+    else:
+        with open(filepath, "wb") as f:
+            _write_chunks(f, width, height, params, strips())
+
+
+def _write_chunks(f, width: int, height: int, params: dict, strips):
+    """PNG imzası, IHDR, şerit IDAT'ları (geldikçe), Adler-32 ve IEND."""
+    f.write(PNG_SIGNATURE)
+    f.write(_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+    adler = 1
+    header = _zlib_header(params["level"])
+    for compressed, strip_adler, length in strips:
+        adler = adler32_combine(adler, strip_adler, length)
+        f.write(_chunk(b"IDAT", header + compressed))
+        header = b""
+    f.write(_chunk(b"IDAT", struct.pack(">I", adler)))
+    f.write(_chunk(b"IEND", b""))
+
+
+if __name__ == "__main__":
+    # Benchmark - Pillow optimize=True vs hazır ayarlar (süre, boyut, doğruluk)
+    import tempfile
+    import time
+
+    from PIL import Image
+
+    if "--rss-child" in sys.argv:
+        # Tek yöntem, temiz süreçte: 4K BGRA kare kaydedilirken tepe RSS artışı
+        method = sys.argv[sys.argv.index("--rss-child") + 1]
+
+        def current_rss() -> int:
+            try:
+                import psutil
+                return psutil.Process().memory_info().rss
+            except ImportError:
+                with open("/proc/self/statm") as statm:
+                    return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+        rng = np.random.default_rng(0)
+        bgra = rng.integers(30, 110, (2160, 3840, 4), dtype=np.uint8)
+        bgra[:1080] = np.linspace(40, 200, 1080, dtype=np.uint8)[:, None, None]
+        frame = Frame(bgra, "BGRA")
+        _get_executor()
+        path = Path(tempfile.gettempdir()) / f"bst_rss_{method}.png"
+
+        peak = [0]
+        done = threading.Event()
+
+        def sampler():
+            while not done.is_set():
+                peak[0] = max(peak[0], current_rss())
+                time.sleep(0.002)
+
+        class SlowFile:
+            """Yavaş disk taklidi: her yazım 100 ms sürer."""
+
+            def __init__(self, f):
+                self._f = f
+
+            def write(self, data):
+                time.sleep(0.1)
+                return self._f.write(data)
+
+        baseline = current_rss()
+        thread = threading.Thread(target=sampler)
+        thread.start()
+        start = time.perf_counter()
+        window = 10 ** 6 if method.startswith("unbounded") else None
+        if method == "pillow":
+            frame.to_image().save(path, format="PNG", optimize=True)
+        elif method.endswith("-slow"):
+            with open(path, "wb") as f:
+                _write_png(frame, SlowFile(f), PRESETS[DEFAULT_PRESET], max_in_flight=window)
+        else:
+            _write_png(frame, path, PRESETS[DEFAULT_PRESET], max_in_flight=window)
+        elapsed = (time.perf_counter() - start) * 1000
+        done.set()
+        thread.join()
+        path.unlink()
+        print(f"{(peak[0] - baseline) / (1024 * 1024):.1f} {elapsed:.0f}")
+        sys.exit(0)
+
+    if "--rss" in sys.argv:
+        import subprocess
+
+        strip_mb = PRESETS[DEFAULT_PRESET]["strip_rows"] * 3840 * 3 / (1024 * 1024)
+        print(f"4K BGRA kare, kayıt başına tepe RSS artışı ({WORKERS} thread, şerit {strip_mb:.2f} MB)")
+        for method, label in (("pillow", "Pillow optimize=True"),
+                              ("unbounded", "Şerit sınırı yok"),
+                              ("streaming", f"Akış, en fazla {MAX_IN_FLIGHT} şerit"),
+                              ("unbounded-slow", "Şerit sınırı yok, yavaş disk"),
+                              ("streaming-slow", "Akış, yavaş disk")):
+            output = subprocess.run([sys.executable, __file__, "--rss-child", method],
+                                    capture_output=True, text=True, check=True).stdout.split()
+            print(f"  {label:<30}{float(output[0]):>8.1f} MB{int(output[1]):>8} ms")
+        sys.exit(0)
+
+    # adler32_combine doğrulaması
+    a, b = os.urandom(100000), os.urandom(70001)
+    assert adler32_combine(zlib.adler32(a), zlib.adler32(b), len(b)) == zlib.adler32(a + b)
+
+    # Filtrelerin geri çözülebilirliği: Pillow'un okuduğu pikseller aynı olmalı
+    rng = np.random.default_rng(0)
+
+    def game_like(width: int, height: int) -> np.ndarray:
+        """Gradyan gökyüzü + gürültülü zemin + düz HUD panelleri + metin benzeri çizgiler."""
+        frame = np.empty((height, width, 3), dtype=np.uint8)
+        sky = np.linspace(40, 200, height // 2, dtype=np.uint8)
+        frame[:height // 2] = sky[:, None, None]
+        frame[:height // 2, :, 2] = 230
+        frame[height // 2:] = rng.integers(30, 110, (height - height // 2, width, 3), dtype=np.uint8)
+        frame[height - 200:height - 40, 40:600] = (20, 20, 24)
+        frame[height - 180:height - 60:6, 60:580:3] = 240
+        return frame
+
+    tmp = Path(tempfile.gettempdir())
+    sample = game_like(333, 217)
+    for preset in PRESETS:
+        for frame_in in (sample, Frame(np.dstack([sample[:, :, ::-1], np.full(sample.shape[:2], 255, np.uint8)]), "BGRA")):
+            path = tmp / f"bst_png_{preset}.png"
+            write_png(frame_in, path, preset)
+            with Image.open(path) as img:
+                assert np.array_equal(np.asarray(img.convert("RGB")), sample), preset
+            path.unlink()
+    for mode in ("none", "sub", "up", "avg", "paeth"):
+        path = tmp / f"bst_png_{mode}.png"
+        _write_png(sample, path, dict(PRESETS["balanced"], filter=mode, strip_rows=16))
+        with Image.open(path) as img:
+            assert np.array_equal(np.asarray(img), sample), mode
+        path.unlink()
+    print("✓ Tüm filtreler ve hazır ayarlar Pillow ile piksel piksel doğru okunuyor")
+
+    print(f"\n4K oyun benzeri kare, {os.cpu_count()} çekirdek")
+    frame = game_like(3840, 2160)
+    image = Image.fromarray(frame)
+    print(f"{'Yöntem':<28}{'Süre':>10}{'Boyut':>12}")
+
+    def bench(label: str, func, path: Path):
+        start = time.perf_counter()
+        func(path)
+        elapsed = (time.perf_counter() - start) * 1000
+        size = path.stat().st_size
+        with Image.open(path) as img:
+            assert np.array_equal(np.asarray(img.convert("RGB")), frame), label
+        print(f"{label:<28}{elapsed:>7.0f} ms{size / (1024 * 1024):>9.2f} MB")
+        path.unlink()
+
+    bench("Pillow optimize=True", lambda p: image.save(p, format="PNG", optimize=True), tmp / "bst_pil.png")
+    bench("Pillow compress_level=6", lambda p: image.save(p, format="PNG", compress_level=6), tmp / "bst_pil6.png")
+    for preset in PRESETS:
+        bench(f"png_writer {preset}", lambda p, preset=preset: write_png(frame, p, preset), tmp / f"bst_{preset}.png")
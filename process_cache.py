@@ -0,0 +1,401 @@
+"""
+GameCapture - İşlem Bilgisi Önbelleği
+Ön plan algılamasında her yakalamada yapılan psutil (ad, exe) ve pencere /
+monitör geometrisi sorgularını önbelleğe alır.
+
+- İşlem bilgisi PID ile saklanır. Sağlayıcı destekliyorsa işleme açık bir
+  handle tutulur: handle açıkken Windows PID'yi yeniden kullanmaz, bu yüzden
+  isabet kontrolü yalnızca "işlem bitti mi" sorgusudur (WaitForSingleObject,
+  sistem çağrısı açmaz). Handle yoksa başlama zamanı REVALIDATE_TTL'de bir
+  yeniden okunur; PID yeniden kullanılırsa (farklı başlama zamanı) kayıt
+  geçersiz olur.
+- Erişim reddedilen (korumalı oyun / anti-cheat) işlemler negatif olarak
+  önbelleğe alınır; NEGATIVE_TTL boyunca tekrar sorgulanmaz.
+- Pencere geometrisi kısa bir TTL ile saklanır (tam ekran geçişleri için).
+
+Windows API'lerine bağlı değildir; sorgular bir sağlayıcı (provider)
+üzerinden yapılır. Gerçek sağlayıcı detector.py'dedir.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+# Erişim reddedilen işlem bu süre boyunca tekrar sorgulanmaz (saniye)
+NEGATIVE_TTL = 30.0
+# Handle tutulamayan işlemlerde başlama zamanı en fazla bu sıklıkta doğrulanır (saniye)
+REVALIDATE_TTL = 2.0
+# Pencere geometrisi bu süre boyunca yeniden okunmaz (saniye)
+GEOMETRY_TTL = 1.0
+# Önbellekteki en fazla işlem / pencere sayısı
+MAX_ENTRIES = 256
+
+UNKNOWN_PROCESS = {"pid": 0, "name": "Unknown", "exe": ""}
+
+
+class ProcessGone(Exception):
+    """İşlem artık yok (sağlayıcı fırlatır)."""
+
+
+class ProcessAccessDenied(Exception):
+    """İşlem bilgisine erişim reddedildi (sağlayıcı fırlatır)."""
+
+
+class _ProcessEntry:
+    __slots__ = ("create_time", "info", "expires", "handle", "checked")
+
+    def __init__(self, create_time: Optional[float], info: dict, expires: Optional[float],
+                 handle=None, checked: float = 0.0):
+        self.create_time = create_time
+        self.info = info
+        self.expires = expires  # None = süresiz (handle veya başlama zamanıyla doğrulanır)
+        self.handle = handle    # Açık işlem handle'ı (PID yeniden kullanımını engeller)
+        self.checked = checked  # Başlama zamanının son doğrulandığı an
+
+
+class ProcessCache:
+    """
+    PID anahtarlı işlem bilgisi ve hwnd anahtarlı geometri önbelleği.
+
+    Args:
+        provider: Sorguları yapan nesne:
+            window_pid(hwnd) -> pid
+            create_time(pid) -> float            (ProcessGone / ProcessAccessDenied)
+            process_details(pid) -> (ad, exe)    (ProcessGone / ProcessAccessDenied)
+            window_rect(hwnd) -> (sol, üst, sağ, alt)
+            monitor_info(hwnd) -> {"work_area", "monitor_area"}
+            İsteğe bağlı (handle ile doğrulama):
+            open_process(pid) -> handle veya None
+            process_exited(handle) -> bool
+            close_process(handle)
+    """
+
+    def __init__(
+        self,
+        provider,
+        negative_ttl: float = NEGATIVE_TTL,
+        revalidate_ttl: float = REVALIDATE_TTL,
+        geometry_ttl: float = GEOMETRY_TTL,
+        max_entries: int = MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._provider = provider
+        self._negative_ttl = negative_ttl
+        self._revalidate_ttl = revalidate_ttl
+        self._use_handles = hasattr(provider, "open_process")
+        self._geometry_ttl = geometry_ttl
+        self._max_entries = max_entries
+        self._clock = clock
+        self._processes: Dict[int, _ProcessEntry] = {}
+        self._geometry: Dict[int, Tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+
+        # İstatistikler
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.pid_reuse = 0
+
+    @staticmethod
+    def _put(cache: dict, key, value, limit: int):
+        """Ekle; sınır aşılırsa en eski kayıtları at (dict ekleme sırası)."""
+        cache.pop(key, None)
+        cache[key] = value
+        while len(cache) > limit:
+            del cache[next(iter(cache))]
+
+    def _close(self, entry: Optional[_ProcessEntry]):
+        if entry is not None and entry.handle is not None:
+            try:
+                self._provider.close_process(entry.handle)
+            except Exception:
+                pass
+            entry.handle = None
+
+    def _drop(self, pid: int):
+        """Kaydı at ve handle'ını kapat (_lock altında)."""
+        self._close(self._processes.pop(pid, None))
+
+    def _store(self, pid: int, entry: _ProcessEntry):
+        """Kaydı ekle; sınır aşılırsa en eski kayıtları handle'larıyla at (_lock altında)."""
+        self._drop(pid)
+        self._processes[pid] = entry
+        while len(self._processes) > self._max_entries:
+            self._drop(next(iter(self._processes)))
+
+    def process_info(self, hwnd: int) -> dict:
+        """Penceredeki işlemin bilgisi: {"pid", "name", "exe"}."""
+        try:
+            pid = self._provider.window_pid(hwnd)
+        except Exception:
+            return dict(UNKNOWN_PROCESS)
+        if not pid:
+            return dict(UNKNOWN_PROCESS)
+
+        now = self._clock()
+        with self._lock:
+            entry = self._processes.get(pid)
+            if entry is not None:
+                if entry.expires is not None:
+                    if now < entry.expires:
+                        self.negative_hits += 1
+                        return dict(entry.info)
+                    self._drop(pid)
+                    entry = None
+                elif entry.handle is not None:
+                    # Handle açık: PID başka işleme verilemez, yalnızca çıkış kontrolü
+                    if not self._provider.process_exited(entry.handle):
+                        self.hits += 1
+                        return dict(entry.info)
+                    self._drop(pid)
+                    entry = None
+                elif now < entry.checked + self._revalidate_ttl:
+                    self.hits += 1
+                    return dict(entry.info)
+
+        if entry is not None:
+            # Handle yok ve doğrulama süresi doldu: başlama zamanını yeniden oku
+            try:
+                create_time = self._provider.create_time(pid)
+            except ProcessGone:
+                with self._lock:
+                    self._drop(pid)
+                return dict(UNKNOWN_PROCESS)
+            except Exception:
+                create_time = None
+            with self._lock:
+                if create_time is not None and create_time == entry.create_time:
+                    entry.checked = now
+                    self.hits += 1
+                    return dict(entry.info)
+                if create_time is not None:
+                    self.pid_reuse += 1
+                self._drop(pid)
+
+        return self._load(pid, now)
+
+    def _load(self, pid: int, now: float) -> dict:
+        """Önbellekte olmayan işlemi sağlayıcıdan oku ve sakla."""
+        with self._lock:
+            self.misses += 1
+
+        # Handle önce açılır: açık kaldıkça sonraki sorgular aynı işleme gider
+        handle = None
+        if self._use_handles:
+            try:
+                handle = self._provider.open_process(pid)
+            except Exception:
+                handle = None
+        entry = _ProcessEntry(None, dict(UNKNOWN_PROCESS), None, handle, now)
+
+        if handle is None:
+            # Başlama zamanı PID yeniden kullanımını ayırt eder
+            try:
+                entry.create_time = self._provider.create_time(pid)
+            except ProcessGone:
+                return dict(UNKNOWN_PROCESS)
+            except Exception:
+                pass  # Doğrulanamıyor: yalnızca negatif TTL ile saklanır
+
+        try:
+            name, exe = self._provider.process_details(pid)
+            entry.info = {"pid": pid, "name": name, "exe": exe}
+            if handle is None and entry.create_time is None:
+                entry.expires = now + self._negative_ttl
+        except ProcessGone:
+            self._close(entry)
+            return dict(UNKNOWN_PROCESS)
+        except Exception:
+            # Erişim reddi (veya başka kalıcı hata): negatif önbellek
+            self._close(entry)
+            entry.expires = now + self._negative_ttl
+
+        with self._lock:
+            self._store(pid, entry)
+        return dict(entry.info)
+
+    def geometry(self, hwnd: int) -> Optional[dict]:
+        """Pencere ve monitör dikdörtgenleri (TTL ile); okunamazsa None."""
+        now = self._clock()
+        with self._lock:
+            cached = self._geometry.get(hwnd)
+            if cached is not None and now < cached[0]:
+                return cached[1]
+
+        try:
+            geometry = {"window_rect": tuple(self._provider.window_rect(hwnd))}
+            geometry.update(self._provider.monitor_info(hwnd))
+        except Exception:
+            return None
+
+        with self._lock:
+            self._put(self._geometry, hwnd, (now + self._geometry_ttl, geometry), self._max_entries)
+        return geometry
+
+    def invalidate(self, hwnd: Optional[int] = None):
+        """Geometri önbelleğini temizle (hwnd=None: tümü)."""
+        with self._lock:
+            if hwnd is None:
+                self._geometry.clear()
+            else:
+                self._geometry.pop(hwnd, None)
+
+    def clear(self):
+        with self._lock:
+            for pid in list(self._processes):
+                self._drop(pid)
+            self._geometry.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "processes": len(self._processes),
+                "windows": len(self._geometry),
+                "hits": self.hits,
+                "misses": self.misses,
+                "negative_hits": self.negative_hits,
+                "pid_reuse": self.pid_reuse,
+            }
+
+
+if __name__ == "__main__":
+    # Test - sahte pencere/işlem sağlayıcısı ile (Windows gerektirmez)
+    class FakeProvider:
+        def __init__(self):
+            self.windows = {}     # hwnd -> pid
+            self.processes = {}   # pid -> (create_time, ad, exe, erişim_var)
+            self.rects = {}       # hwnd -> rect
+            self.calls = {"details": 0, "geometry": 0, "create_time": 0}
+
+        def window_pid(self, hwnd):
+            return self.windows[hwnd]
+
+        def create_time(self, pid):
+            self.calls["create_time"] += 1
+            if pid not in self.processes:
+                raise ProcessGone(pid)
+            return self.processes[pid][0]
+
+        def process_details(self, pid):
+            self.calls["details"] += 1
+            time.sleep(0.002)  # Gerçek psutil sorgusu gibi yavaş
+            if pid not in self.processes:
+                raise ProcessGone(pid)
+            _, name, exe, allowed = self.processes[pid]
+            if not allowed:
+                raise ProcessAccessDenied(pid)
+            return name, exe
+
+        def window_rect(self, hwnd):
+            self.calls["geometry"] += 1
+            return self.rects[hwnd]
+
+        def monitor_info(self, hwnd):
+            return {"work_area": (0, 0, 1920, 1040), "monitor_area": (0, 0, 1920, 1080)}
+
+    now = [0.0]
+    provider = FakeProvider()
+    cache = ProcessCache(provider, clock=lambda: now[0])
+
+    provider.windows[100] = 4000
+    provider.processes[4000] = (1000.0, "game.exe", "C:\\Games\\game.exe", True)
+    provider.rects[100] = (0, 0, 1920, 1080)
+
+    # İlk sorgu sağlayıcıya gider, sonrakiler önbellekten
+    assert cache.process_info(100)["name"] == "game.exe"
+    N = 10_000
+    start = time.perf_counter()
+    for _ in range(N):
+        cache.process_info(100)
+        cache.geometry(100)
+    per_call = (time.perf_counter() - start) / N * 1e6
+    assert provider.calls["details"] == 1 and provider.calls["geometry"] == 1
+    assert provider.calls["create_time"] == 1, "İsabetlerde başlama zamanı sorgulandı"
+    print(f"✓ Sıcak önbellek: {per_call:.1f} µs / algılama (ad+exe+geometri)")
+
+    # PID yeniden kullanımı: aynı PID, farklı başlama zamanı (doğrulama süresi sonunda)
+    provider.processes[4000] = (2000.0, "notepad.exe", "C:\\Windows\\notepad.exe", True)
+    now[0] += REVALIDATE_TTL
+    assert cache.process_info(100)["name"] == "notepad.exe"
+    assert cache.pid_reuse == 1 and provider.calls["details"] == 2
+    print("✓ PID yeniden kullanımı algılandı")
+
+    # Erişim reddi negatif önbelleğe alınır, TTL sonunda tekrar denenir
+    provider.windows[200] = 5000
+    provider.processes[5000] = (3000.0, "protected.exe", "", False)
+    for _ in range(100):
+        assert cache.process_info(200)["name"] == "Unknown"
+    assert provider.calls["details"] == 3
+    now[0] += NEGATIVE_TTL + 1
+    cache.process_info(200)
+    assert provider.calls["details"] == 4
+    print(f"✓ Erişim reddi önbelleklendi ({cache.negative_hits} negatif isabet)")
+
+    # Geometri TTL sonunda yeniden okunur (ör. tam ekrana geçiş)
+    assert cache.geometry(100)["window_rect"] == (0, 0, 1920, 1080)
+    provider.rects[100] = (0, 0, 1280, 720)
+    assert cache.geometry(100)["window_rect"] == (0, 0, 1920, 1080)
+    now[0] += GEOMETRY_TTL + 0.1
+    assert cache.geometry(100)["window_rect"] == (0, 0, 1280, 720)
+    print("✓ Geometri TTL sonunda yenilendi")
+
+    # Kapanan işlem önbellekten düşer
+    del provider.processes[4000]
+    assert cache.process_info(100) == UNKNOWN_PROCESS
+    assert 4000 not in cache._processes
+
+    # Sınır: en eski kayıtlar atılır
+    for pid in range(10000, 10000 + MAX_ENTRIES + 50):
+        provider.windows[pid] = pid
+        provider.processes[pid] = (1.0, f"p{pid}.exe", "", True)
+        cache.process_info(pid)
+    assert len(cache._processes) == MAX_ENTRIES
+    print(f"✓ Önbellek sınırlı: {cache.stats()}")
+
+    # Handle'lı sağlayıcı: isabette yalnızca çıkış kontrolü, başlama zamanı hiç okunmaz
+    class HandleProvider(FakeProvider):
+        def __init__(self):
+            super().__init__()
+            self.open_handles = {}  # handle -> pid
+            self.exited = set()     # Çıkmış işlemlerin handle'ları
+            self._next = 1
+
+        def open_process(self, pid):
+            if pid not in self.processes:
+                raise ProcessGone(pid)
+            handle, self._next = self._next, self._next + 1
+            self.open_handles[handle] = pid
+            return handle
+
+        def process_exited(self, handle):
+            return handle in self.exited
+
+        def close_process(self, handle):
+            del self.open_handles[handle]
+
+    provider = HandleProvider()
+    cache = ProcessCache(provider, max_entries=4, clock=lambda: now[0])
+    provider.windows[100] = 4000
+    provider.processes[4000] = (1000.0, "game.exe", "C:\\Games\\game.exe", True)
+    assert cache.process_info(100)["name"] == "game.exe"
+    for _ in range(N):
+        now[0] += 0.01  # Doğrulama süresi defalarca geçer
+        cache.process_info(100)
+    assert provider.calls["create_time"] == 0 and provider.calls["details"] == 1
+    assert len(provider.open_handles) == 1
+
+    # İşlem çıktı: handle kapatılır, aynı PID'deki yeni işlem yeniden okunur
+    provider.exited.update(provider.open_handles)
+    provider.processes[4000] = (2000.0, "notepad.exe", "", True)
+    assert cache.process_info(100)["name"] == "notepad.exe"
+    assert list(provider.open_handles) == [2]
+
+    # Sınırdan atılan ve clear() ile silinen kayıtların handle'ları kapatılır
+    for pid in range(20000, 20010):
+        provider.windows[pid] = pid
+        provider.processes[pid] = (1.0, f"p{pid}.exe", "", True)
+        cache.process_info(pid)
+    assert len(provider.open_handles) == 4
+    cache.clear()
+    assert not provider.open_handles
+    print("✓ Handle ile doğrulama: isabette başlama zamanı okunmadı, handle'lar sızmadı")
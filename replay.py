@@ -0,0 +1,285 @@
+"""
+GameCapture - Anlık Tekrar (Instant Replay) Tamponu
+Arka planda son birkaç saniyenin karelerini sabit boyutlu bir halkada tutar.
+Kısayol tuşuna basıldığında "300 ms önceki kare" veya "son saniyenin en net
+karesi" kaydedilebilir. CPU (hedef FPS + görev oranı) ve bellek (bayt
+bütçesi) sınırlıdır; ön plandaki uygulama tam ekran değilse duraklar.
+"""
+
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+# Duraklatma koşulunun kontrol aralığı (saniye)
+PAUSE_CHECK_INTERVAL = 0.5
+
+
+class ReplayBuffer:
+    """
+    Sürekli kare yakalayan sabit boyutlu halka tampon.
+
+    Args:
+        grab_into: grab_into(tampon) tam çözünürlüklü RGB kareyi tampona yazar.
+            True = yeni kare, None = ekran değişmedi, False = hata
+        shape: Tam çözünürlüklü kare boyutu (yükseklik, genişlik, 3)
+        fps: Hedef yakalama hızı
+        seconds: Tutulacak geçmiş süresi
+        max_bytes: Halkanın bellek bütçesi (slot sayısını sınırlar)
+        downscale: 1 = ham kare, 2 = yarı çözünürlük, ...
+        max_duty: Yakalama thread'inin zamanın en fazla bu kadarını kullanması
+        should_run: False dönerse yakalama duraklar (ör. tam ekran değil)
+    """
+
+    def __init__(
+        self,
+        grab_into: Callable[[np.ndarray], Optional[bool]],
+        shape: Tuple[int, int, int],
+        fps: float = 30,
+        seconds: float = 2.0,
+        max_bytes: int = 256 * 1024 * 1024,
+        downscale: int = 1,
+        max_duty: float = 0.25,
+        should_run: Optional[Callable[[], bool]] = None,
+        clock: Callable[[], float] = time.perf_counter
+    ):
+        self._grab_into = grab_into
+        self._downscale = max(1, int(downscale))
+        self._interval = 1.0 / max(1.0, fps)
+        self._max_duty = min(1.0, max(0.01, max_duty))
+        self._should_run = should_run
+        self._clock = clock
+
+        height, width = shape[0], shape[1]
+        self.full_shape = (height, width, 3)
+        self.shape = ((height + self._downscale - 1) // self._downscale,
+                      (width + self._downscale - 1) // self._downscale, 3)
+        frame_bytes = self.shape[0] * self.shape[1] * 3
+        wanted = max(1, int(round(fps * seconds)))
+        count = max(1, min(wanted, max_bytes // frame_bytes))
+
+        self._buffers = [np.empty(self.shape, dtype=np.uint8) for _ in range(count)]
+        self._timestamps = [-1.0] * count
+        # Küçültme varsa tam kare önce bu tampona yazılır
+        self._scratch = np.empty(self.full_shape, dtype=np.uint8) if self._downscale > 1 else None
+        self._write_index = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # İstatistikler
+        self.captured = 0
+        self.unchanged = 0
+        self.dropped = 0
+        self.paused = False
+        self.paused_seconds = 0.0
+        self.grab_seconds = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buffers)
+
+    @property
+    def nbytes(self) -> int:
+        total = sum(buf.nbytes for buf in self._buffers)
+        if self._scratch is not None:
+            total += self._scratch.nbytes
+        return total
+
+    def start(self):
+        """Yakalama thread'ini başlat."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ReplayBuffer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """Yakalama thread'ini durdur."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        next_check = 0.0
+        active = True
+        next_tick = self._clock()
+
+        while not self._stop.is_set():
+            now = self._clock()
+
+            # Duraklatma koşulunu seyrek kontrol et
+            if self._should_run is not None and now >= next_check:
+                try:
+                    active = bool(self._should_run())
+                except Exception:
+                    active = True
+                next_check = now + PAUSE_CHECK_INTERVAL
+                self.paused = not active
+
+            if not active:
+                self._stop.wait(PAUSE_CHECK_INTERVAL)
+                self.paused_seconds += self._clock() - now
+                next_tick = self._clock()
+                continue
+
+            self._grab_once()
+
+            # Kare hızı + görev oranı sınırı: yavaş grab aralığı uzatır
+            elapsed = self._clock() - now
+            interval = max(self._interval, elapsed / self._max_duty)
+            next_tick += interval
+            delay = next_tick - self._clock()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                # Geride kalındı - kaçırılan tick'ler düşürülmüş sayılır
+                self.dropped += int(-delay / self._interval)
+                next_tick = self._clock()
+
+    def _grab_once(self):
+        slot = self._write_index
+        target = self._scratch if self._scratch is not None else self._buffers[slot]
+
+        with self._lock:
+            # Yazılan slot okuyuculara görünmesin
+            previous_ts = self._timestamps[slot]
+            self._timestamps[slot] = -1.0
+
+        start = self._clock()
+        try:
+            result = self._grab_into(target)
+        except Exception:
+            result = False
+        if result and self._scratch is not None:
+            np.copyto(self._buffers[slot], self._scratch[::self._downscale, ::self._downscale])
+        self.grab_seconds += self._clock() - start
+
+        with self._lock:
+            if result:
+                self._timestamps[slot] = self._clock()
+                self._write_index = (slot + 1) % len(self._buffers)
+                self.captured += 1
+            else:
+                # Ekran değişmediyse slota yazılmadı, eski kare geçerli kalır;
+                # hata durumunda slot yarım yazılmış olabilir
+                self._timestamps[slot] = previous_ts if result is None else -1.0
+                if result is None:
+                    self.unchanged += 1
+                else:
+                    self.dropped += 1
+
+    def _valid_slots(self, since: float):
+        return [i for i, ts in enumerate(self._timestamps) if ts >= 0 and ts >= since]
+
+    def frame_at(self, ms_ago: float = 300) -> Optional[Tuple[np.ndarray, float]]:
+        """
+        İstenen andan (şimdi - ms_ago) en yakın karenin kopyasını döndür.
+
+        Returns:
+            (kare, yaş_ms) veya tampon boşsa None
+        """
+        now = self._clock()
+        target = now - ms_ago / 1000.0
+        with self._lock:
+            slots = self._valid_slots(0.0)
+            if not slots:
+                return None
+            best = min(slots, key=lambda i: abs(self._timestamps[i] - target))
+            return self._buffers[best].copy(), (now - self._timestamps[best]) * 1000.0
+
+    def best_of(self, window_ms: float = 1000) -> Optional[Tuple[np.ndarray, float]]:
+        """
+        Son window_ms içindeki en net (en yüksek kenar enerjili) karenin kopyası.
+        Netlik, seyrek bir piksel ızgarasında komşu farklarından ölçülür.
+        """
+        now = self._clock()
+        with self._lock:
+            slots = self._valid_slots(now - window_ms / 1000.0)
+            if not slots:
+                return None
+            best = max(slots, key=lambda i: sharpness(self._buffers[i]))
+            return self._buffers[best].copy(), (now - self._timestamps[best]) * 1000.0
+
+    def stats(self) -> dict:
+        """Tampon istatistikleri."""
+        with self._lock:
+            filled = len(self._valid_slots(0.0))
+        return {
+            "capacity": self.capacity,
+            "filled": filled,
+            "bytes": self.nbytes,
+            "captured": self.captured,
+            "unchanged": self.unchanged,
+            "dropped": self.dropped,
+            "paused": self.paused,
+            "paused_seconds": round(self.paused_seconds, 2),
+            "avg_grab_ms": round(self.grab_seconds / self.captured * 1000, 2) if self.captured else 0.0,
+        }
+
+
+def sharpness(frame: np.ndarray, step: int = 8) -> float:
+    """Seyrek ızgarada yatay/dikey komşu farklarının ortalaması (bulanıklık ölçüsü)."""
+    grid = frame[::step, ::step, 1].astype(np.int16)
+    return float(np.abs(np.diff(grid, axis=0)).mean() + np.abs(np.diff(grid, axis=1)).mean())
+
+
+if __name__ == "__main__":
+    # Test - sentetik kaynak ile halka, zaman seçimi, duraklatma ve bütçe
+    shape = (1080, 1920, 3)
+    counter = [0]
+    fullscreen = [True]
+
+    def synthetic_grab(dst: np.ndarray) -> bool:
+        counter[0] += 1
+        dst[...] = counter[0] & 0xFF
+        # Her 5. kare keskin (desenli), diğerleri düz
+        if counter[0] % 5 == 0:
+            dst[::7, :, 1] = 255
+        return True
+
+    buf = ReplayBuffer(synthetic_grab, shape, fps=60, seconds=1.0,
+                       max_bytes=128 * 1024 * 1024, downscale=2,
+                       should_run=lambda: fullscreen[0])
+    print(f"Halka: {buf.capacity} slot, {buf.nbytes / (1024 * 1024):.1f} MB, kare {buf.shape}")
+    assert buf.nbytes <= 128 * 1024 * 1024 + shape[0] * shape[1] * 3
+
+    buf.start()
+    time.sleep(1.2)
+    stats = buf.stats()
+    assert stats["captured"] > 20 and stats["filled"] == min(stats["captured"], buf.capacity), stats
+    print(f"✓ Yakalama: {stats}")
+
+    frame, age_ms = buf.frame_at(300)
+    assert frame.shape == buf.shape and 200 < age_ms < 400, age_ms
+    print(f"✓ 300 ms önceki kare: yaşı {age_ms:.0f} ms")
+
+    best, best_age = buf.best_of(1000)
+    assert sharpness(best) > 0, "En net kare seçilmedi"
+    print(f"✓ Son saniyenin en net karesi: yaşı {best_age:.0f} ms")
+
+    # Tam ekran değilse yakalama durmalı
+    fullscreen[0] = False
+    time.sleep(PAUSE_CHECK_INTERVAL * 2)
+    before = buf.captured
+    time.sleep(0.5)
+    assert buf.captured == before and buf.stats()["paused"], buf.stats()
+    print("✓ Tam ekran değilken duraklatıldı")
+    buf.stop()
+
+    # Yavaş kaynak: görev oranı sınırı kare hızını düşürmeli
+    def slow_grab(dst: np.ndarray) -> bool:
+        time.sleep(0.02)
+        return True
+
+    slow = ReplayBuffer(slow_grab, (64, 64, 3), fps=60, seconds=1.0, max_duty=0.25)
+    slow.start()
+    time.sleep(1.0)
+    slow.stop()
+    assert slow.captured <= 15, slow.captured
+    print(f"✓ Görev oranı sınırı: 60 FPS hedef, yavaş kaynakla {slow.captured} kare/sn")
@@ -0,0 +1,231 @@
+"""
+GameCapture - Dosya Boyutu ve Kayıt Süresi Tahmini
+Son ekran görüntüsünden (yoksa oyun benzeri sentetik kareden) alınan tam
+çözünürlüklü karolar gerçek kayıt parametreleriyle kodlanır; boyut ve süre
+piksel sayısına göre hedef çözünürlüğe ölçeklenir. Sonuçlar
+(format, kalite, çözünürlük, PNG ayarı) başına önbelleğe alınır.
+Qt'ye bağlı değildir; ayarlar penceresi bunu bir işçi thread'inde çağırır.
+numpy, Pillow ve png_writer ilk tahminde (işçi thread'inde) yüklenir; ayarlar
+penceresi bunlar yüklenmeden açılır.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from encoder import pil_save_args
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# png_writer.DEFAULT_PRESET ile aynı (png_writer numpy yüklediği için burada import edilmez)
+DEFAULT_PRESET = "balanced"
+
+# Örnek karo boyutu ve ızgarası (3x3 karo = 768x768 mozaik)
+TILE_SIZE = 256
+TILE_GRID = 3
+
+_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp")
+
+
+def format_size(size_bytes: float) -> str:
+    """Boyutu okunabilir metne çevir."""
+    if size_bytes >= 1024 * 1024:
+        return f"{size_bytes / (1024 * 1024):.1f} MB"
+    return f"{size_bytes / 1024:.0f} KB"
+
+
+def format_duration(ms: float) -> str:
+    """Süreyi okunabilir metne çevir."""
+    if ms >= 1000:
+        return f"{ms / 1000:.1f} s"
+    return f"{ms:.0f} ms"
+
+
+def find_latest_capture(folder: Path) -> Optional[Path]:
+    """Klasördeki en yeni ekran görüntüsü (boş rezervasyon dosyaları hariç)."""
+    latest = None
+    latest_mtime = 0.0
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith(_IMAGE_EXTENSIONS):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if stat.st_size > 0 and stat.st_mtime > latest_mtime:
+                    latest, latest_mtime = Path(entry.path), stat.st_mtime
+    except OSError:
+        return None
+    return latest
+
+
+def sample_tiles(frame: np.ndarray, tile: int = TILE_SIZE, grid: int = TILE_GRID) -> np.ndarray:
+    """
+    Kareye eşit aralıklı grid x grid karo yerleştir ve mozaik olarak birleştir.
+    Karolar küçültülmez: piksel başına ayrıntı gerçek karedeki gibi kalır.
+    """
+    import numpy as np
+
+    height, width = frame.shape[:2]
+    tile = min(tile, height // grid, width // grid)
+    ys = np.linspace(0, height - tile, grid).astype(int)
+    xs = np.linspace(0, width - tile, grid).astype(int)
+    rows = [np.concatenate([frame[y:y + tile, x:x + tile, :3] for x in xs], axis=1) for y in ys]
+    return np.ascontiguousarray(np.concatenate(rows, axis=0))
+
+
+class SizeEstimator:
+    """
+    Örnek karolarla boyut/süre tahmincisi.
+
+    Args:
+        sample_dir: En yeni ekran görüntüsünün aranacağı klasör (None = sentetik kare)
+    """
+
+    def __init__(self, sample_dir: Optional[Path] = None):
+        self._sample_dir = sample_dir
+        self._mosaic: Optional[np.ndarray] = None
+        self.source = None  # Örnek kaynağı: dosya adı veya "synthetic"
+        self._cache: Dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def _get_mosaic(self) -> np.ndarray:
+        if self._mosaic is not None:
+            return self._mosaic
+
+        import numpy as np
+        from PIL import Image
+
+        frame = None
+        path = find_latest_capture(self._sample_dir) if self._sample_dir else None
+        if path is not None:
+            try:
+                with Image.open(path) as img:
+                    frame = np.asarray(img.convert("RGB"))
+                self.source = path.name
+            except Exception as e:
+                print(f"[Estimator] Örnek okunamadı ({path.name}): {e}")
+
+        if frame is None:
+            from bench import make_frame
+            frame = make_frame("game", 1920, 1080)
+            self.source = "synthetic"
+
+        self._mosaic = sample_tiles(frame)
+        return self._mosaic
+
+    @staticmethod
+    def _key(format: str, quality: int, resolution: Tuple[int, int], png_preset: str) -> tuple:
+        format = format.lower()
+        if format == "jpg":
+            format = "jpeg"
+        # Kayıpsız formatlarda kalite sonucu etkilemez
+        if format in ("png", "bmp"):
+            quality = 0
+        return (format, quality, tuple(resolution), png_preset if format == "png" else "")
+
+    def cached(self, format: str, quality: int, resolution: Tuple[int, int],
+               png_preset: str = DEFAULT_PRESET) -> Optional[dict]:
+        """Önbellekteki tahmin (yoksa None) - UI thread'inden çağrılabilir."""
+        with self._lock:
+            return self._cache.get(self._key(format, quality, resolution, png_preset))
+
+    def estimate(self, format: str, quality: int, resolution: Tuple[int, int],
+                 png_preset: str = DEFAULT_PRESET) -> dict:
+        """
+        Tahmin et (gerekirse örnek karoları kodlar - işçi thread'inde çağır).
+
+        Returns:
+            {"size_bytes", "time_ms", "source"}
+        """
+        key = self._key(format, quality, resolution, png_preset)
+        with self._lock:
+            hit = self._cache.get(key)
+        if hit is not None:
+            return hit
+
+        width, height = resolution
+        format = key[0]
+        mosaic = self._get_mosaic()
+        size, elapsed = self._encode(mosaic, format, quality, png_preset)
+        scale = (width * height) / (mosaic.shape[0] * mosaic.shape[1])
+        result = {"size_bytes": size * scale, "time_ms": elapsed * scale, "source": self.source}
+        if format == "bmp":
+            # BMP boyutu kesin: başlık + 4 bayta hizalı satırlar
+            result["size_bytes"] = 54 + ((width * 3 + 3) & ~3) * height
+
+        with self._lock:
+            self._cache[key] = result
+        return result
+
+    @staticmethod
+    def _encode(mosaic: np.ndarray, format: str, quality: int, png_preset: str) -> Tuple[int, float]:
+        """Mozaiği kaydetme yolunun parametreleriyle kodla: (boyut, en iyi süre ms)."""
+        from PIL import Image
+        from png_writer import write_png
+
+        best = float("inf")
+        size = 0
+        for _ in range(2):  # İlk tur ısınma etkisini azaltır
+            buffer = io.BytesIO()
+            start = time.perf_counter()
+            if format == "png":
+                write_png(mosaic, buffer, png_preset)
+            else:
+                pil_format, kwargs = pil_save_args(format, quality)
+                Image.fromarray(mosaic).save(buffer, format=pil_format, **kwargs)
+            best = min(best, (time.perf_counter() - start) * 1000)
+            size = buffer.tell()
+        return size, best
+
+
+if __name__ == "__main__":
+    # Doğruluk - sentetik 1080p kare: tahmin vs gerçek tam kayıt
+    from bench import make_frame
+    from PIL import Image
+    from png_writer import write_png
+    import tempfile
+
+    resolution = (1920, 1080)
+    tmp = Path(tempfile.mkdtemp(prefix="bst_estimate_"))
+    frame = make_frame("game", *resolution)
+    Image.fromarray(frame).save(tmp / "sample.png")
+
+    estimator = SizeEstimator(tmp)
+    print(f"{'Format':<14}{'Tahmin':>10}{'Gerçek':>10}{'Hata':>8}{'T. süre':>10}{'G. süre':>10}")
+    for format, quality in (("png", 100), ("jpg", 95), ("jpg", 75), ("webp", 90), ("webp", 60), ("bmp", 100)):
+        estimate = estimator.estimate(format, quality, resolution)
+        buffer = io.BytesIO()
+        start = time.perf_counter()
+        if format == "png":
+            write_png(frame, buffer)
+        else:
+            pil_format, kwargs = pil_save_args(format, quality)
+            Image.fromarray(frame).save(buffer, format=pil_format, **kwargs)
+        actual_ms = (time.perf_counter() - start) * 1000
+        actual = buffer.tell()
+        error = (estimate["size_bytes"] - actual) / actual * 100
+        print(f"{format + ' q=' + str(quality):<14}{format_size(estimate['size_bytes']):>10}"
+              f"{format_size(actual):>10}{error:>7.0f}%{format_duration(estimate['time_ms']):>10}"
+              f"{format_duration(actual_ms):>10}")
+        if format == "bmp":
+            assert estimate["size_bytes"] == actual
+    print(f"Örnek kaynağı: {estimator.source}")
+
+    # Önbellek: aynı anahtar tekrar kodlanmamalı
+    start = time.perf_counter()
+    for _ in range(1000):
+        estimator.estimate("jpg", 95, resolution)
+    assert estimator.cached("jpeg", 95, resolution) is not None
+    print(f"✓ Önbellekten 1000 tahmin: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    (tmp / "sample.png").unlink()
+    tmp.rmdir()
@@ -0,0 +1,109 @@
+"""
+GameCapture - Başlangıç Süresi Benchmark'ı
+Her giriş modunun ilk pencere/simge görünmeden önce yüklediği modülleri
+`python -X importtime` ile ölçer ve mod başına bütçeyle karşılaştırır.
+Ayrıca her modda yüklenmemesi gereken ağır modülleri (numpy, mss, dxcam,
+pywin32, psutil, ...) kontrol eder.
+
+Süre = yorumlayıcının kendi başlangıç modülleri dışında kalan modüllerin
+"self" sürelerinin toplamı (medyan). Eksik bağımlılığı olan modlar atlanır.
+
+Kullanım:
+    python startup_bench.py [--repeat 5] [--modes tray,notification]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+ROOT = Path(__file__).parent
+
+# Tüm modlarda (tepsi ısınması dışında) yüklenmemesi gereken modüller
+HEAVY = ["numpy", "mss", "dxcam", "comtypes", "psutil", "win32gui", "win32api"]
+
+# mod: (ölçülen kod, bütçe ms, yasak modüller)
+MODES: Dict[str, Tuple[str, Optional[float], List[str]]] = {
+    # Her modun ortak tabanı: main.py'nin kendisi
+    "main": ("import main", 80.0, HEAVY + ["PIL", "pystray", "keyboard", "PyQt6"]),
+    # --notification: bildirim süreci (eski yöntem / sunucu)
+    "notification": ("import main; import _notification_process", 180.0, HEAVY + ["PIL", "pystray", "keyboard"]),
+    # --settings: ayarlar penceresi (tahminci numpy'ı işçi thread'inde yükler)
+    "settings": ("import main; sys.path.insert(0, 'ui'); import settings_dialog", 250.0, HEAVY + ["pystray"]),
+    # Tepsi simgesi görünene kadar
+    "tray": ("import main; main.import_tray_modules()", 200.0, HEAVY),
+    # --stats
+    "stats": ("import main; import tracing", 80.0, HEAVY + ["PIL", "pystray", "keyboard", "PyQt6"]),
+    # Bilgi amaçlı: simge göründükten sonra arka planda yüklenen yakalama yolu
+    "capture-warmup": ("import main; import capture", None, []),
+}
+
+# Isınma çalıştırması .pyc yazabilmeli (paketlenmiş EXE'de bytecode hazırdır)
+_ENV = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+
+
+def _run_importtime(code: str) -> Tuple[Dict[str, int], str]:
+    """Kodu -X importtime ile çalıştır: ({modül: self_us}, hata_metni)."""
+    snippet = f"import sys; {code}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", snippet],
+        cwd=ROOT, capture_output=True, text=True, env=_ENV,
+    )
+    modules = {}
+    errors = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            errors.append(line)
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Başlık satırı
+        modules[parts[2].strip()] = int(parts[0])
+    return modules, "\n".join(errors) if proc.returncode else ""
+
+
+def measure(code: str, baseline: Set[str], repeat: int) -> Tuple[Optional[float], Set[str], str]:
+    """(medyan ms, yüklenen modüller, hata) - hata varsa süre None."""
+    totals = []
+    loaded: Set[str] = set()
+    # İlk çalıştırma ölçülmez: .pyc dosyaları derlenir
+    _run_importtime(code)
+    for _ in range(repeat):
+        modules, error = _run_importtime(code)
+        if error:
+            return None, set(), error.strip().splitlines()[-1]
+        loaded = set(modules)
+        totals.append(sum(us for name, us in modules.items() if name not in baseline) / 1000)
+    return statistics.median(totals), loaded, ""
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Başlangıç import süresi benchmark'ı")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--modes", default=",".join(MODES))
+    args = parser.parse_args(argv)
+
+    baseline, _ = _run_importtime("pass")
+    failed = False
+    print(f"{'Mod':<16}{'Süre ms':>10}{'Bütçe ms':>10}  Durum")
+    for mode in args.modes.split(","):
+        code, budget, forbidden = MODES[mode]
+        elapsed, loaded, error = measure(code, set(baseline), max(1, args.repeat))
+        if elapsed is None:
+            print(f"{mode:<16}{'-':>10}{budget or '-':>10}  atlandı ({error})")
+            continue
+        heavy = sorted(name for name in forbidden if name in loaded)
+        over = budget is not None and elapsed > budget
+        status = "bilgi" if budget is None else ("BÜTÇE AŞILDI" if over else "ok")
+        if heavy:
+            status = f"YASAK MODÜL: {', '.join(heavy)}"
+        failed |= over or bool(heavy)
+        print(f"{mode:<16}{elapsed:>10.1f}{budget or '-':>10}  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
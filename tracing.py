@@ -0,0 +1,336 @@
+"""
+GameCapture - Gecikme İzleme (Span Tracing)
+Tuşa basıştan dosyanın diske yazılmasına kadar her aşamanın (bekleme,
+algılama, yakalama, siyah kare kontrolü, dosya adı, kodlama, yazma,
+bildirim) süresini sabit boyutlu bir bellek halkasına kaydeder.
+
+Aynı yakalamaya ait span'lar bir iz kimliği (trace) paylaşır; kimlik
+thread'e bağlıdır ve kodlayıcı kuyruğuna işle birlikte taşınır.
+İzleme kapalıyken span() paylaşılan boş bir nesne döndürür.
+
+Kullanım:
+    with tracer.span("grab"):
+        ...
+    python main.py --stats [trace.jsonl]                 # aşama başına p50/p95/p99
+    python main.py --stats --export chrome --out t.json  # chrome://tracing / Perfetto
+"""
+
+import itertools
+import json
+import os
+import threading
+from pathlib import Path
+from threading import get_ident
+from time import perf_counter_ns
+from typing import Dict, Iterable, List, Optional
+
+# Halkada tutulan en fazla span
+TRACE_CAPACITY = 4096
+TRACE_FILE_NAME = "trace.jsonl"
+
+
+class _NullSpan:
+    """İzleme kapalıyken kullanılan boş span."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _TraceLocal(threading.local):
+    trace = 0  # Sınıf varsayılanı: eksik özellik araması (AttributeError) yavaş
+
+
+class _Span:
+    __slots__ = ("_tracer", "name", "trace", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, trace: int):
+        self._tracer = tracer
+        self.name = name
+        self.trace = trace
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = perf_counter_ns()
+        tracer = self._tracer
+        tracer._ring[next(tracer._slots) % tracer._capacity] = (
+            self.trace, self.name, self.start, end, get_ident()
+        )
+        return False
+
+
+class Tracer:
+    """
+    Halka tamponlu span kaydedici.
+
+    Kayıt (trace, ad, başlangıç_ns, bitiş_ns, thread) biçimindedir ve kilitsiz
+    yazılır: yuva numarası itertools.count'tan alınır (GIL altında atomik).
+    """
+
+    def __init__(self, capacity: int = TRACE_CAPACITY, enabled: bool = False):
+        self.enabled = enabled
+        self._capacity = capacity
+        self._ring: List[Optional[tuple]] = [None] * capacity
+        self._slots = itertools.count()
+        self._trace_ids = itertools.count(1)
+        self._local = _TraceLocal()
+
+    # --- İz kimliği ---
+
+    def begin_trace(self) -> int:
+        """Bu thread için yeni bir iz başlat ve kimliğini döndür."""
+        trace = next(self._trace_ids)
+        self._local.trace = trace
+        return trace
+
+    def current_trace(self) -> int:
+        return self._local.trace
+
+    def set_trace(self, trace: int):
+        """Başka thread'den gelen işin izini devral (ör. kodlayıcı işçisi)."""
+        self._local.trace = trace
+
+    # --- Kayıt ---
+
+    def span(self, name: str):
+        """Bağlam yöneticisi: bloğun süresini kaydet."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, self._local.trace)
+
+    def record(self, name: str, start_ns: int, end_ns: int, trace: Optional[int] = None):
+        """Ölçülmüş bir aralığı doğrudan kaydet."""
+        if not self.enabled:
+            return
+        if trace is None:
+            trace = self._local.trace
+        self._ring[next(self._slots) % self._capacity] = (trace, name, start_ns, end_ns, get_ident())
+
+    def clear(self):
+        self._ring = [None] * self._capacity
+        self._slots = itertools.count()
+
+    def spans(self) -> List[dict]:
+        """Halkadaki span'lar (başlangıç zamanına göre sıralı)."""
+        records = sorted((r for r in list(self._ring) if r is not None), key=lambda r: r[2])
+        return [
+            {"trace": trace, "name": name, "start_ns": start, "end_ns": end, "thread": thread}
+            for trace, name, start, end, thread in records
+        ]
+
+    # --- Dışa aktarma ---
+
+    def export_jsonl(self, path: Path) -> int:
+        """Span'ları JSON satırları olarak yaz; yazılan span sayısını döndür."""
+        spans = self.spans()
+        with open(path, "w", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span) + "\n")
+        return len(spans)
+
+    def export_chrome(self, path: Path) -> int:
+        """Chrome trace formatında yaz (chrome://tracing, ui.perfetto.dev)."""
+        spans = self.spans()
+        write_chrome_trace(spans, path)
+        return len(spans)
+
+
+def write_chrome_trace(spans: Iterable[dict], path: Path):
+    events = [
+        {
+            "name": span["name"], "cat": "capture", "ph": "X",
+            "ts": span["start_ns"] / 1000, "dur": (span["end_ns"] - span["start_ns"]) / 1000,
+            "pid": os.getpid(), "tid": span["thread"], "args": {"trace": span["trace"]},
+        }
+        for span in spans
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def read_jsonl(path: Path) -> List[dict]:
+    spans = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                spans.append(json.loads(line))
+    return spans
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """En yakın sıra yöntemiyle yüzdelik."""
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def stage_stats(spans: Iterable[dict]) -> Dict[str, dict]:
+    """
+    Aşama başına süre dağılımı (ms). "total" = iz başına ilk başlangıçtan
+    son bitişe (tuşa basış -> dosya diskte).
+    """
+    durations: Dict[str, List[float]] = {}
+    traces: Dict[int, list] = {}
+    for span in spans:
+        duration = (span["end_ns"] - span["start_ns"]) / 1e6
+        durations.setdefault(span["name"], []).append(duration)
+        if span["trace"]:
+            bounds = traces.setdefault(span["trace"], [span["start_ns"], span["end_ns"]])
+            bounds[0] = min(bounds[0], span["start_ns"])
+            bounds[1] = max(bounds[1], span["end_ns"])
+    if traces:
+        durations["total"] = [(end - start) / 1e6 for start, end in traces.values()]
+
+    stats = {}
+    for name, values in durations.items():
+        values.sort()
+        stats[name] = {
+            "count": len(values),
+            "p50": _percentile(values, 50),
+            "p95": _percentile(values, 95),
+            "p99": _percentile(values, 99),
+            "max": values[-1],
+        }
+    return stats
+
+
+def format_stats(stats: Dict[str, dict]) -> str:
+    lines = [f"{'Aşama':<22}{'Adet':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+    for name in sorted(stats, key=lambda n: (n == "total", n)):
+        s = stats[name]
+        lines.append(f"{name:<22}{s['count']:>7}{s['p50']:>10.2f}{s['p95']:>10.2f}{s['p99']:>10.2f}{s['max']:>10.2f}")
+    return "\n".join(lines)
+
+
+def default_trace_path() -> Path:
+    from config import get_app_dir
+    return Path(get_app_dir()) / TRACE_FILE_NAME
+
+
+def main(argv: List[str] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Yakalama gecikmesi istatistikleri")
+    parser.add_argument("input", nargs="?", help=f"Span dosyası (varsayılan: {TRACE_FILE_NAME})")
+    parser.add_argument("--export", choices=("chrome", "jsonl"), help="Span'ları bu formata dönüştür")
+    parser.add_argument("--out", help="Dışa aktarma yolu")
+    args, _ = parser.parse_known_args(argv)
+
+    path = Path(args.input) if args.input else default_trace_path()
+    if not path.exists():
+        print(f"Span dosyası bulunamadı: {path}")
+        print('Ayarlarda "tracing": true yapın; dosya uygulama kapanırken yazılır.')
+        return 1
+    spans = read_jsonl(path)
+    print(f"{len(spans)} span: {path}\n")
+    print(format_stats(stage_stats(spans)))
+
+    if args.export:
+        out = Path(args.out or path.with_suffix(".chrome.json" if args.export == "chrome" else ".out.jsonl"))
+        if args.export == "chrome":
+            write_chrome_trace(spans, out)
+        else:
+            with open(out, "w", encoding="utf-8") as f:
+                for span in spans:
+                    f.write(json.dumps(span) + "\n")
+        print(f"\n✓ Dışa aktarıldı: {out}")
+    return 0
+
+
+# Global instance
+tracer = Tracer()
+
+
+if __name__ == "__main__":
+    # Test - ek yük ölçümü ve sentetik yakalama izleri
+    import random
+    import tempfile
+    import time
+
+    N = 200_000
+
+    def overhead(t: Tracer) -> float:
+        best = float("inf")
+        for _ in range(5):
+            start = perf_counter_ns()
+            for _ in range(N):
+                with t.span("stage"):
+                    pass
+            best = min(best, (perf_counter_ns() - start) / N / 1000)
+        return best
+
+    def baseline() -> float:
+        best = float("inf")
+        for _ in range(5):
+            start = perf_counter_ns()
+            for _ in range(N):
+                pass
+            best = min(best, (perf_counter_ns() - start) / N / 1000)
+        return best
+
+    empty = baseline()
+    off = overhead(Tracer(enabled=False)) - empty
+    on = overhead(Tracer(enabled=True)) - empty
+    print(f"Span başına ek yük: kapalı {off * 1000:.0f} ns, açık {on * 1000:.0f} ns")
+    assert on < 5, f"Span ek yükü çok yüksek: {on:.2f} µs"
+
+    # Halka sınırı
+    small = Tracer(capacity=100, enabled=True)
+    for i in range(250):
+        small.record(f"s{i}", i, i + 1)
+    names = [s["name"] for s in small.spans()]
+    assert len(names) == 100 and names[0] == "s150" and names[-1] == "s249"
+    print("✓ Halka en yeni 100 span'ı tuttu")
+
+    # Sentetik yakalamalar: tuş -> kuyruk -> algılama -> yakalama -> kodlama (başka thread)
+    t = Tracer(enabled=True)
+    rng = random.Random(0)
+
+    def fake_stage(name: str, ms: float):
+        with t.span(name):
+            time.sleep(ms / 1000)
+
+    for _ in range(40):
+        pressed = perf_counter_ns()
+        trace = t.begin_trace()
+        t.record("dispatch.wait", pressed, perf_counter_ns())
+        fake_stage("detect", 0.05)
+        fake_stage("filename", 0.05)
+        fake_stage("grab", rng.uniform(2, 8))
+        fake_stage("black_check", 0.1)
+
+        def encode():
+            t.set_trace(trace)
+            fake_stage("save", rng.uniform(5, 15))
+
+        worker = threading.Thread(target=encode)
+        worker.start()
+        fake_stage("notify", 0.2)
+        worker.join()
+
+    stats = stage_stats(t.spans())
+    print(format_stats(stats))
+    assert stats["total"]["count"] == 40
+    assert stats["total"]["p50"] >= stats["save"]["p50"]
+
+    folder = Path(tempfile.mkdtemp(prefix="bst_trace_"))
+    jsonl, chrome = folder / "trace.jsonl", folder / "trace.json"
+    assert t.export_jsonl(jsonl) == len(t.spans())
+    t.export_chrome(chrome)
+    events = json.loads(chrome.read_text())["traceEvents"]
+    assert len(events) == len(t.spans()) and events[0]["ph"] == "X"
+    assert stage_stats(read_jsonl(jsonl)) == stats
+    print(f"\n✓ JSONL ve Chrome trace yazıldı ({len(events)} olay)")
+    jsonl.unlink()
+    chrome.unlink()
+    folder.rmdir()
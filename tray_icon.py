@@ -0,0 +1,312 @@
+"""
+GameCapture - Tepsi Simgesi Kareleri ve Flash Animasyonu
+Tüm simge durumları (aktif, pasif, yakalama, flash kareleri) başlangıçta
+HiDPI boyutları dahil bir kez çizilip önbelleğe alınır. Yakalama yolu simge
+görüntüsü oluşturmaz; flash tek bir uzun ömürlü thread'de oynatılır ve seri
+çekimde üst üste gelen flash istekleri birleştirilir.
+
+pystray (Windows) her simge atamasında görüntüyü ICO'ya dönüştürür; tepsinin
+gerçek boyutundaki kare verildiğinde dönüşüm küçük ve keskin olur.
+"""
+
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from PIL import Image, ImageDraw
+
+# Simge durumları - Mavi tema renkleri
+ICON_COLORS = {
+    "green": (33, 150, 243),    # Mavi - aktif (#2196F3)
+    "red": (244, 67, 54),       # Kırmızı - yakalama anı
+    "white": (255, 255, 255),   # Beyaz - flash parlak
+    "yellow": (100, 181, 246),  # Açık mavi - flash geçiş (#64B5F6)
+    "dark": (25, 118, 210),     # Koyu mavi - pasif (#1976D2)
+}
+
+# Tepsi simgesi boyutları: %100-%300 ölçek (16-48) ve pystray'in eski varsayılanı (64)
+ICON_SIZES = (16, 20, 24, 32, 40, 48, 64)
+DEFAULT_ICON_SIZE = 64
+
+# Çizim 64 px koordinatlarında, 4 kat büyük yapılır; küçültme kenarları yumuşatır
+_BASE_SIZE = 64
+_SUPERSAMPLE = 4
+
+# Flash sırası: (durum, ekranda kalma süresi saniye); son kare normal simgedir
+FLASH_SEQUENCE = (("white", 0.1), ("yellow", 0.1), ("green", 0.0))
+
+
+def _master_scale(size: int) -> int:
+    """size için çizim ölçeği (ana kare en az 4 kat büyük)."""
+    return _SUPERSAMPLE * max(1, -(-size // _BASE_SIZE))
+
+
+def _draw_icon(color: str, scale: int) -> Image.Image:
+    """Kamera simgesini 64 * scale boyutunda çiz (bilinmeyen renk -> pasif)."""
+    fill_color = ICON_COLORS.get(color, ICON_COLORS["dark"])
+
+    def box(*coords):
+        return [c * scale for c in coords]
+
+    image = Image.new('RGBA', (_BASE_SIZE * scale, _BASE_SIZE * scale), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+
+    # Kamera gövdesi
+    draw.rounded_rectangle(box(8, 16, 56, 48), radius=5 * scale, fill=fill_color)
+
+    # Kamera lensi
+    draw.ellipse(box(24, 22, 44, 42), fill=(255, 255, 255))
+    draw.ellipse(box(28, 26, 40, 38), fill=fill_color)
+
+    # Flaş
+    draw.rectangle(box(44, 18, 52, 24), fill=(255, 255, 255))
+
+    return image
+
+
+def render_icon(color: str, size: int = DEFAULT_ICON_SIZE) -> Image.Image:
+    """Simgeyi verilen boyutta çiz (büyük çizilip küçültülür)."""
+    return _draw_icon(color, _master_scale(size)).resize((size, size), Image.LANCZOS)
+
+
+def tray_icon_size() -> int:
+    """Tepsinin simge boyutu (Windows: SM_CXSMICON, DPI'ya göre), en yakın önbellek boyutuna yuvarlanır."""
+    if sys.platform != "win32":
+        return DEFAULT_ICON_SIZE
+    try:
+        import ctypes
+        metric = ctypes.windll.user32.GetSystemMetrics(49)  # SM_CXSMICON
+    except Exception:
+        return DEFAULT_ICON_SIZE
+    if metric <= 0:
+        return DEFAULT_ICON_SIZE
+    return min((s for s in ICON_SIZES if s >= metric), default=ICON_SIZES[-1])
+
+
+class IconFrames:
+    """
+    Durum x boyut simge önbelleği. Her durum bir kez büyük ana kare olarak
+    çizilir, boyutlar bundan küçültülür. get() yalnızca sözlük okur ve her
+    çağrıda aynı Image nesnesini döndürür.
+
+    Args:
+        size: Tepsiye verilen varsayılan boyut
+        sizes: Hemen hazırlanacak diğer boyutlar (size her zaman eklenir)
+    """
+
+    def __init__(self, size: int = DEFAULT_ICON_SIZE, sizes: Iterable[int] = ()):
+        self.size = size
+        self._frames: Dict[Tuple[str, int], Image.Image] = {}
+        scale = _master_scale(max(ICON_SIZES + (size,)))
+        self._masters = {color: _draw_icon(color, scale) for color in ICON_COLORS}
+        self.prerender((size,) + tuple(sizes))
+
+    def prerender(self, sizes: Iterable[int] = ICON_SIZES):
+        """Eksik boyutları hazırla (tepsi göründükten sonra arka planda çağrılabilir)."""
+        for size in sizes:
+            if ("green", size) in self._frames:
+                continue
+            for color, master in self._masters.items():
+                self._frames[(color, size)] = master.resize((size, size), Image.LANCZOS)
+
+    def get(self, color: str = "green", size: Optional[int] = None) -> Image.Image:
+        if color not in ICON_COLORS:
+            color = "dark"
+        return self._frames[(color, size or self.size)]
+
+    def set_size(self, size: int):
+        """Tepsi boyutu değişti (DPI); önbellekte yoksa ana karelerden bir kez küçültülür."""
+        self.prerender((size,))
+        self.size = size
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
+class FlashAnimator:
+    """
+    Tek thread'li flash animasyonu.
+
+    flash() hiç beklemez ve görüntü oluşturmaz. Animasyon sürerken gelen
+    istekler birleştirilir: sıra baştan başlar, simge parlak kalır ve yalnızca
+    değişen kare gösterilir.
+
+    Args:
+        show: show(durum) - tepsi simgesini bu duruma çevir (ör. önbellekten ata)
+        sequence: (durum, süre) kareleri; son kare animasyon sonundaki simgedir
+    """
+
+    def __init__(
+        self,
+        show: Callable[[str], None],
+        sequence: Sequence[Tuple[str, float]] = FLASH_SEQUENCE
+    ):
+        self._show = show
+        self._sequence = tuple(sequence)
+        self._cond = threading.Condition()
+        self._requests = 0
+        self._stopping = False
+        self._thread = None
+        self._current: Optional[str] = None
+
+        # Sayaçlar
+        self.requested = 0
+        self.played = 0
+        self.coalesced = 0
+        self.frames_shown = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="TrayFlash", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+            self._cond.notify()
+        thread.join(timeout=timeout)
+        self._thread = None
+
+    def flash(self):
+        """Flash iste (yakalama thread'inden)."""
+        with self._cond:
+            self.requested += 1
+            self._requests += 1
+            self._cond.notify()
+
+    def _display(self, state: str):
+        if state == self._current:
+            return
+        try:
+            self._show(state)
+        except Exception as e:
+            print(f"[Tray] Simge güncellenemedi: {e}")
+            return
+        self._current = state
+        self.frames_shown += 1
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._requests and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                self._requests = 0
+
+            self.played += 1
+            step = 0
+            while step < len(self._sequence):
+                state, duration = self._sequence[step]
+                self._display(state)
+                step += 1
+                if duration <= 0:
+                    continue
+                deadline = time.monotonic() + duration
+                with self._cond:
+                    while not self._requests and not self._stopping:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    if self._stopping:
+                        return
+                    if self._requests:
+                        # Animasyon sürerken yeni flash: baştan başla
+                        self.coalesced += self._requests
+                        self._requests = 0
+                        step = 0
+
+    def wait_idle(self, timeout: float = 2.0) -> bool:
+        """Animasyon bitene kadar bekle (test için)."""
+        final = self._sequence[-1][0]
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._cond:
+                if not self._requests and self.requested == self.played + self.coalesced \
+                        and self._current == final:
+                    return True
+            time.sleep(0.005)
+        return False
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "requested": self.requested,
+                "played": self.played,
+                "coalesced": self.coalesced,
+                "frames_shown": self.frames_shown,
+            }
+
+
+if __name__ == "__main__":
+    # Test - önbellek maliyeti ve seri çekimde flash birleştirme (tepsi gerektirmez)
+    start = time.perf_counter()
+    frames = IconFrames(size=32)
+    build_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    frames.prerender()
+    hidpi_ms = (time.perf_counter() - start) * 1000
+    print(f"✓ Tepsi boyutu: {build_ms:.1f} ms, tüm HiDPI boyutları (+arka plan): {hidpi_ms:.1f} ms, "
+          f"{len(frames)} kare")
+    assert frames.get("white") is frames.get("white")
+    assert frames.get("green", 32).size == (32, 32)
+    assert frames.get("bilinmeyen") is frames.get("dark")
+
+    N = 200
+    start = time.perf_counter()
+    for _ in range(N):
+        for color in ("white", "yellow", "green"):
+            frames.get(color)
+    per_flash = (time.perf_counter() - start) / N * 1e6
+    print(f"  Flash başına simge araması: {per_flash:.2f} µs (eskiden her flash'ta 3 çizim)")
+
+    shown = []
+    animator = FlashAnimator(shown.append)
+    animator.start()
+    baseline = threading.active_count()
+
+    # Tek flash: üç kare sırayla
+    animator.flash()
+    assert animator.wait_idle()
+    assert shown == ["white", "yellow", "green"], shown
+
+    # Seri çekim: 30 fps'de 60 flash -> tek animasyon, ek thread yok
+    shown.clear()
+    peak = baseline
+    for _ in range(60):
+        animator.flash()
+        peak = max(peak, threading.active_count())
+        time.sleep(1 / 30)
+    assert animator.wait_idle()
+    stats = animator.stats()
+    assert peak == baseline, f"thread sayısı arttı ({peak - baseline})"
+    # Basışlar flash süresinden sık: simge parlak kalır, sonunda bir kez söner
+    assert shown == ["white", "yellow", "green"], shown
+    assert stats["requested"] == stats["played"] + stats["coalesced"]
+    print(f"✓ 60 flash / 2 s: {len(shown)} kare gösterildi, ek thread yok ({stats})")
+
+    # Gösterme hatası işçiyi durdurmaz
+    def broken(state):
+        raise RuntimeError("test")
+
+    animator._show = broken
+    animator.flash()
+    time.sleep(0.1)
+    animator._show = shown.append
+    animator.flash()
+    assert animator.wait_idle()
+    animator.stop()
+    assert not animator.running
+    print("✓ Simge hatası sonrası animasyon devam etti")
@@ -4,12 +4,12 @@ Dark/Light mod destekli, özel kısayol tuşu seçici ve çoklu dil desteği.
 """
 
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve, pyqtProperty
-from PyQt6.QtGui import QFont, QCursor, QTransform, QColor
+from PyQt6.QtGui import QFont, QCursor, QColor
 from PyQt6.QtWidgets import (
     QApplication, QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
     QPushButton, QFrame, QWidget, QLineEdit, QComboBox, QSlider,
     QCheckBox, QRadioButton, QFileDialog, QMessageBox, QButtonGroup,
-    QGraphicsOpacityEffect, QGraphicsDropShadowEffect
+    QGraphicsDropShadowEffect
 )
 import sys
 import os
@@ -25,7 +25,8 @@ else:
 if _base not in _sys.path:
     _sys.path.insert(0, _base)
 from config import load_config, save_config, get_resource_dir
-from i18n import t, get_available_languages, set_language, get_language
+from i18n import t, get_available_languages, get_language
+from size_estimator import SizeEstimator, format_size, format_duration
 from pathlib import Path
 
 
@@ -126,6 +127,51 @@ class KeyListenerThread(QThread):
             print(f"Key read error: {e}")
 
 
+class SizeEstimateThread(QThread):
+    """
+    Boyut tahmini işçisi. Slider hareket ederken yalnızca en son istek
+    işlenir; aradaki değerler atlanır.
+    """
+    estimated = pyqtSignal(str, int, object)
+    
+    def __init__(self, estimator: SizeEstimator, parent=None):
+        super().__init__(parent)
+        self.estimator = estimator
+        self._request = None
+        self._stopping = False
+        self._cond = threading.Condition()
+    
+    def request(self, format_type: str, quality: int, resolution: tuple, png_preset: str):
+        """Tahmin iste (önceki bekleyen isteğin yerine geçer)."""
+        with self._cond:
+            self._request = (format_type, quality, resolution, png_preset)
+            self._cond.notify()
+        if not self.isRunning():
+            self.start()
+    
+    def stop(self):
+        """İşçiyi durdur ve bitmesini bekle."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self.wait()
+    
+    def run(self):
+        while True:
+            with self._cond:
+                while self._request is None and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                request, self._request = self._request, None
+            try:
+                result = self.estimator.estimate(*request)
+            except Exception as e:
+                print(f"[Estimator] Tahmin hatası: {e}")
+                continue
+            self.estimated.emit(request[0], request[1], result)
+
+
 class SettingsDialog(QDialog):
     """Ayarlar penceresi - Dark/Light mod ve çoklu dil destekli."""
     
@@ -143,6 +189,12 @@ class SettingsDialog(QDialog):
         self._listening_for_key = False
         self.key_listener_thread = None
         
+        # Boyut/süre tahmini son ekran görüntüsünden, işçi thread'inde
+        save_path = self.config.get("save_path")
+        self.size_estimator = SizeEstimator(Path(save_path) if save_path else None)
+        self.size_estimate_thread = SizeEstimateThread(self.size_estimator)
+        self.size_estimate_thread.estimated.connect(self._on_size_estimated)
+        
         self._setup_window()
         self._apply_theme()
         self._create_widgets()
@@ -440,14 +492,14 @@ class SettingsDialog(QDialog):
         self.quality_slider = QSlider(Qt.Orientation.Horizontal)
         self.quality_slider.setRange(10, 100)
         self.quality_slider.setValue(95)
-        self.quality_slider.setFixedWidth(180)
+        self.quality_slider.setFixedWidth(160)
         self.quality_slider.valueChanged.connect(self._update_quality_label)
         quality_layout.addWidget(self.quality_slider)
         
         self.quality_label = QLabel("95%")
         self.quality_label.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
         self.quality_label.setStyleSheet(f"color: {self.accent_color};")
-        self.quality_label.setFixedWidth(120)
+        self.quality_label.setFixedWidth(190)
         quality_layout.addWidget(self.quality_label)
         
         quality_layout.addStretch()
@@ -762,29 +814,6 @@ class SettingsDialog(QDialog):
         except:
             return 1920, 1080
     
-    def _estimate_file_size(self, format_type: str, quality: int) -> str:
-        """Tahmini dosya boyutunu hesapla."""
-        width, height = self._get_screen_resolution()
-        raw_size = width * height * 3
-        
-        if format_type == "bmp":
-            size_bytes = raw_size
-        elif format_type == "png":
-            size_bytes = raw_size * 0.40
-        elif format_type in ["jpg", "jpeg"]:
-            compression_ratio = 0.05 + (quality / 100) * 0.55
-            size_bytes = raw_size * compression_ratio
-        elif format_type == "webp":
-            compression_ratio = 0.03 + (quality / 100) * 0.40
-            size_bytes = raw_size * compression_ratio
-        else:
-            size_bytes = raw_size * 0.30
-        
-        if size_bytes >= 1024 * 1024:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-        else:
-            return f"{size_bytes / 1024:.0f} KB"
-    
     def _on_format_change(self):
         """Format değiştiğinde kalite slider'ını güncelle."""
         format_type = self._get_selected_format()
@@ -809,11 +838,34 @@ class SettingsDialog(QDialog):
         return "png"
     
     def _update_quality_label(self):
-        """Kalite etiketini güncelle."""
+        """Kalite etiketini güncelle (tahmin önbellekte yoksa işçiye sor)."""
         quality = self.quality_slider.value()
         format_type = self._get_selected_format()
-        size_estimate = self._estimate_file_size(format_type, quality)
-        self.quality_label.setText(f"{quality}% (~{size_estimate})")
+        resolution = self._get_screen_resolution()
+        png_preset = self.config.get("png_preset", "balanced")
+        
+        estimate = self.size_estimator.cached(format_type, quality, resolution, png_preset)
+        if estimate is not None:
+            self._show_estimate(quality, estimate)
+        else:
+            self.quality_label.setText(f"{quality}% (~…)")
+            self.size_estimate_thread.request(format_type, quality, resolution, png_preset)
+    
+    def _on_size_estimated(self, format_type: str, quality: int, estimate: dict):
+        """İşçiden gelen tahmin - hâlâ seçili ayara aitse göster."""
+        if format_type == self._get_selected_format() and quality == self.quality_slider.value():
+            self._show_estimate(quality, estimate)
+    
+    def _show_estimate(self, quality: int, estimate: dict):
+        size = format_size(estimate["size_bytes"])
+        duration = format_duration(estimate["time_ms"])
+        self.quality_label.setText(f"{quality}% (~{size}, ~{duration})")
+        self.quality_label.setToolTip(t("settings_estimate_tooltip"))
+    
+    def done(self, result):
+        """Pencere kapanırken tahmin işçisini durdur."""
+        self.size_estimate_thread.stop()
+        super().done(result)
     
     def _browse_folder(self):
         """Klasör seçme dialogu."""
@@ -975,7 +1027,9 @@ class SettingsDialog(QDialog):
         lang_idx = self.lang_combo.currentIndex()
         language = self.available_languages[lang_idx]["code"] if lang_idx < len(self.available_languages) else "tr"
         
-        new_config = {
+        # Dialogda olmayan ayarlar (seri çekim, anlık tekrar, ...) korunur
+        new_config = dict(self.config)
+        new_config.update({
             "hotkey": self.hotkey_display.text(),
             "format": self._get_selected_format(),
             "quality": self.quality_slider.value(),
@@ -987,7 +1041,7 @@ class SettingsDialog(QDialog):
             "dark_mode": self.is_dark_mode,
             "monitor": self.config.get("monitor", 0),
             "language": language
-        }
+        })
         
         if save_config(new_config):
             if self.on_save_callback: